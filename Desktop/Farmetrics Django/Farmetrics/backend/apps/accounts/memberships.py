@@ -0,0 +1,86 @@
+"""
+Primary organization and role of a user without per-access queries.
+
+User.primary_organization and User.primary_role are read for every
+serialized user (profile, login response, user lists). Querysets that
+serialize many users prefetch active memberships once with
+prefetch_active_memberships(), which the properties use when present.
+Single users fall back to a small cached summary, invalidated when the
+user's memberships or an organization's name change (see signals.py).
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+# Attribute holding prefetched active memberships (newest first)
+ACTIVE_MEMBERSHIPS_ATTR = 'active_memberships'
+
+
+def _cache_key(user_id):
+    return f'user_membership_summary:{user_id}'
+
+
+def prefetch_active_memberships(queryset):
+    """Prefetch active memberships with their organizations onto each user."""
+    from apps.organizations.models import OrganizationMembership
+
+    return queryset.prefetch_related(Prefetch(
+        'organization_memberships',
+        queryset=OrganizationMembership.objects.filter(is_active=True).select_related('organization'),
+        to_attr=ACTIVE_MEMBERSHIPS_ATTR,
+    ))
+
+
+def _summarize(membership):
+    if membership is None:
+        return {'organization': None, 'role': None}
+    organization = membership.organization
+    return {
+        'organization': {'id': str(organization.id), 'name': organization.name, 'slug': organization.slug},
+        'role': membership.role,
+    }
+
+
+def primary_membership(user):
+    """Prefetched primary (first active) membership, or None if not prefetched."""
+    memberships = getattr(user, ACTIVE_MEMBERSHIPS_ATTR, None)
+    if memberships is None:
+        return None
+    return memberships[0] if memberships else None
+
+
+def get_membership_summary(user):
+    """
+    Primary organization and role of a user.
+
+    Args:
+        user: User instance (prefetched memberships are used when present)
+
+    Returns:
+        Dictionary with "organization" ({"id", "name", "slug"} or None) and
+        "role" (membership role or None)
+    """
+    if hasattr(user, ACTIVE_MEMBERSHIPS_ATTR):
+        return _summarize(primary_membership(user))
+
+    summary = user.__dict__.get('_membership_summary')
+    if summary is not None:
+        return summary
+
+    key = _cache_key(user.pk)
+    summary = cache.get(key)
+    if summary is None:
+        membership = user.organization_memberships.filter(
+            is_active=True
+        ).select_related('organization').first()
+        summary = _summarize(membership)
+        cache.set(key, summary, timeout=settings.USER_MEMBERSHIP_CACHE_TIMEOUT)
+
+    user.__dict__['_membership_summary'] = summary
+    return summary
+
+
+def invalidate_membership_summaries(user_ids):
+    """Drop cached membership summaries for users."""
+    cache.delete_many([_cache_key(user_id) for user_id in user_ids])
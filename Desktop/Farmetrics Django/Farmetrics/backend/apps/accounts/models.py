@@ -103,45 +103,33 @@ class User(AbstractUser):
     @property
     def primary_organization(self):
         """Get user's primary organization (first active membership)."""
-        membership = self.organization_memberships.filter(
-            is_active=True
-        ).select_related('organization').first()
+        from .memberships import ACTIVE_MEMBERSHIPS_ATTR, primary_membership
+        
+        if hasattr(self, ACTIVE_MEMBERSHIPS_ATTR):
+            membership = primary_membership(self)
+        else:
+            membership = self.organization_memberships.filter(
+                is_active=True
+            ).select_related('organization').first()
         return membership.organization if membership else None
     
     @property
     def primary_role(self):
         """Get user's primary role (in first active organization)."""
-        membership = self.organization_memberships.filter(
-            is_active=True
-        ).first()
-        return membership.role if membership else None
+        from .memberships import get_membership_summary
+        
+        return get_membership_summary(self)['role']
     
     def has_organization_permission(self, organization, permission):
         """Check if user has a specific permission in an organization."""
+        from .permissions import get_organization_permissions, permission_granted
+        
         # Super admins have all permissions
         if self.is_superuser:
             return True
         
-        # Check if user is member of the organization
-        membership = self.organization_memberships.filter(
-            organization=organization,
-            is_active=True
-        ).first()
-        
-        if not membership:
-            return False
-        
-        # Check user's roles for the permission
-        user_roles = self.user_roles.filter(
-            role__organization=organization,
-            is_active=True
-        ).select_related('role')
-        
-        for user_role in user_roles:
-            if permission in user_role.role.permissions:
-                return True
-        
-        return False
+        # Effective permissions of active memberships and unexpired roles (cached)
+        return permission_granted(get_organization_permissions(self, organization), permission)
 
 
 class Role(TimeStampedModel):
@@ -0,0 +1,190 @@
+"""
+Cached organization permission resolution.
+
+A user's effective permissions in an organization are the union of the
+permission strings of their active, unexpired role assignments (UserRole)
+on active roles, provided they are an active member of the organization.
+The set is computed with one query, stored as a frozenset in the shared
+cache and memoized on the user instance, so every check after the first
+in a request is a set lookup. Cached sets expire no later than the next
+role assignment expiry and are invalidated when roles, role assignments
+or memberships change (see signals.py): each user's key embeds an
+organization version and a per-user version, both read before the
+database, so a set loaded while an invalidation runs is stored under a key
+that is never read again.
+
+Permission strings may use wildcards: "farmer.*" grants every farmer
+permission and "*" grants everything.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from rest_framework import permissions
+
+
+def _version_key(organization_id):
+    return f'org_permissions_version:{organization_id}'
+
+
+def _user_version_key(organization_id, user_id):
+    return f'org_permissions_version:{organization_id}:{user_id}'
+
+
+def _current_versions(*keys):
+    """Current value of each version key, starting missing ones."""
+    versions = cache.get_many(keys)
+    for key in keys:
+        if versions.get(key) is None:
+            # Time-based start so an evicted version never reuses an old key
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def _cache_key(organization_id, user_id):
+    organization_version, user_version = _current_versions(
+        _version_key(organization_id), _user_version_key(organization_id, user_id)
+    )
+    return f'org_permissions:{organization_id}:{organization_version}:{user_id}:{user_version}'
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # No version yet; the next read starts one
+        pass
+
+
+def _load_permissions(user_id, organization_id):
+    """(permissions, next expiry) from the database."""
+    from apps.organizations.models import OrganizationMembership
+    from .models import UserRole
+
+    now = timezone.now()
+    rows = UserRole.objects.filter(
+        Q(expires_at__isnull=True) | Q(expires_at__gt=now),
+        Exists(OrganizationMembership.objects.filter(
+            user_id=OuterRef('user_id'),
+            organization_id=organization_id,
+            is_active=True,
+        )),
+        user_id=user_id,
+        is_active=True,
+        role__organization_id=organization_id,
+        role__is_active=True,
+    ).values_list('role__permissions', 'expires_at')
+
+    granted = set()
+    next_expiry = None
+    for role_permissions, expires_at in rows:
+        granted.update(role_permissions or [])
+        if expires_at and (next_expiry is None or expires_at < next_expiry):
+            next_expiry = expires_at
+    return frozenset(granted), next_expiry
+
+
+def get_organization_permissions(user, organization):
+    """
+    Effective permission set of a user in an organization.
+
+    Args:
+        user: User instance (results are memoized on it for the request)
+        organization: Organization instance or ID
+
+    Returns:
+        frozenset of permission strings (empty without an active membership)
+    """
+    organization_id = getattr(organization, 'pk', organization)
+    memo = user.__dict__.setdefault('_organization_permissions', {})
+    if organization_id in memo:
+        return memo[organization_id]
+
+    # Versions are read before loading, so an invalidation that lands while
+    # the set is built moves readers to a new key instead of this stale one
+    key = _cache_key(organization_id, user.pk)
+    granted = cache.get(key)
+    if granted is None:
+        granted, next_expiry = _load_permissions(user.pk, organization_id)
+        timeout = settings.ORGANIZATION_PERMISSION_CACHE_TIMEOUT
+        if next_expiry:
+            # Never serve a role assignment past its expiry
+            seconds = (next_expiry - timezone.now()).total_seconds()
+            timeout = max(1, min(timeout, int(seconds)))
+        cache.add(key, granted, timeout=timeout)
+
+    memo[organization_id] = granted
+    return granted
+
+
+def permission_granted(granted, permission):
+    """Whether a permission set grants a permission, honouring wildcards."""
+    if permission in granted or '*' in granted:
+        return True
+    resource = permission.split('.', 1)[0]
+    return f'{resource}.*' in granted
+
+
+def invalidate_organization_permissions(organization_id, user_id=None):
+    """
+    Drop cached permission sets.
+
+    Args:
+        organization_id: Organization ID
+        user_id: Only this user's set; all users of the organization if None
+    """
+    if user_id is None:
+        # Role definitions changed: every user's key misses
+        _bump_version(_version_key(organization_id))
+    else:
+        _bump_version(_user_version_key(organization_id, user_id))
+
+
+class HasOrganizationPermission(permissions.BasePermission):
+    """
+    Require organization permissions for a view.
+
+    Set ``required_permissions`` on the view to a list of permission
+    strings, or to a dictionary mapping HTTP methods to lists
+    (e.g. {"GET": ["farmer.view"], "POST": ["farmer.create"]}). All listed
+    permissions are required in the request's organization, or in the
+    organization named by the URL keyword argument given as the view's
+    ``organization_url_kwarg``. Views or methods without required
+    permissions are allowed.
+    """
+
+    message = 'You do not have permission to perform this action in this organization.'
+
+    def get_required_permissions(self, request, view):
+        required = getattr(view, 'required_permissions', None) or []
+        if isinstance(required, dict):
+            required = required.get(request.method, [])
+        return required
+
+    def get_organization(self, request, view):
+        url_kwarg = getattr(view, 'organization_url_kwarg', None)
+        if url_kwarg:
+            return view.kwargs.get(url_kwarg)
+        return getattr(request, 'organization', None)
+
+    def has_permission(self, request, view):
+        required = self.get_required_permissions(request, view)
+        if not required:
+            return True
+
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        if user.is_superuser:
+            return True
+
+        organization = self.get_organization(request, view)
+        if not organization:
+            return False
+
+        granted = get_organization_permissions(user, organization)
+        return all(permission_granted(granted, permission) for permission in required)
@@ -0,0 +1,262 @@
+"""
+Bulk user and membership provisioning.
+
+Onboarding a team of field officers one request at a time hashes each
+password on the request thread and writes users, memberships and role
+assignments row by row. provision_users() validates every row up front,
+resolves existing users, memberships and roles with a handful of
+queries, hashes passwords in a long-lived process pool (password hashing
+is CPU bound and holds the GIL) and writes everything with bulk_create in
+one transaction. Each input row gets its own result, so one bad row does not
+reject the whole upload.
+"""
+
+import atexit
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .memberships import invalidate_membership_summaries
+from .models import Role, User, UserRole
+from .permissions import invalidate_organization_permissions
+from .serializers import ProvisionUserSerializer
+
+logger = logging.getLogger(__name__)
+
+# Per-process password hashing pool, started on first use and reused by
+# later uploads so requests do not pay for spawning worker processes
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+
+def _init_hash_worker():
+    # Spawned workers (non-fork platforms) start without configured settings
+    import django
+    django.setup()
+
+
+def _hash_chunk(passwords):
+    return [make_password(password) for password in passwords]
+
+
+def _get_hash_pool():
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=settings.USER_PROVISIONING_HASH_WORKERS,
+                initializer=_init_hash_worker
+            )
+            atexit.register(_hash_pool.shutdown, wait=False)
+        return _hash_pool
+
+
+def _discard_hash_pool(pool):
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is pool:
+            _hash_pool = None
+    pool.shutdown(wait=False)
+
+
+def hash_passwords(passwords):
+    """
+    Hash passwords, using a process pool for larger batches.
+
+    Args:
+        passwords: List of raw passwords (None gives an unusable password)
+
+    Returns:
+        List of encoded password hashes in input order
+    """
+    workers = settings.USER_PROVISIONING_HASH_WORKERS
+    if len(passwords) < settings.USER_PROVISIONING_POOL_THRESHOLD or workers < 2:
+        return _hash_chunk(passwords)
+
+    chunk_size = -(-len(passwords) // workers)
+    chunks = [passwords[start:start + chunk_size] for start in range(0, len(passwords), chunk_size)]
+    pool = None
+    try:
+        pool = _get_hash_pool()
+        return [hashed for chunk in pool.map(_hash_chunk, chunks) for hashed in chunk]
+    except (OSError, RuntimeError, BrokenProcessPool) as e:
+        # e.g. process creation not permitted, or a worker died; the next
+        # upload starts a fresh pool
+        if pool is not None:
+            _discard_hash_pool(pool)
+        logger.warning(f"Password hashing pool unavailable, hashing in process: {e}")
+        return _hash_chunk(passwords)
+
+
+def _invalidate(organization_id, user_ids):
+    invalidate_membership_summaries(user_ids)
+    for user_id in user_ids:
+        invalidate_organization_permissions(organization_id, user_id)
+
+
+def _result(index, email, status, user_id=None, errors=None):
+    result = {'index': index, 'email': email, 'status': status}
+    if user_id:
+        result['user_id'] = str(user_id)
+    if errors:
+        result['errors'] = errors
+    return result
+
+
+def provision_users(organization, rows, invited_by=None):
+    """
+    Create users, memberships and role assignments for an organization.
+
+    Rows for emails that already have an account (matched
+    case-insensitively) add that user to the organization instead of
+    creating a new account; inactive memberships are reactivated with the
+    row's role. Role assignments the user already holds are kept, and
+    inactive or expired ones are renewed.
+
+    Args:
+        organization: Organization to add the users to
+        rows: List of user dicts (see ProvisionUserSerializer)
+        invited_by: User performing the provisioning
+
+    Returns:
+        List of per-row result dicts with "index", "email", "status"
+        ("created", "added", "reactivated", "skipped" or "error"), "user_id"
+        and "errors"
+    """
+    from apps.organizations.models import OrganizationMembership
+
+    results = [None] * len(rows)
+    valid = []
+    seen_emails = set()
+    for index, row in enumerate(rows):
+        serializer = ProvisionUserSerializer(data=row)
+        email = row.get('email') if isinstance(row, dict) else None
+        if not serializer.is_valid():
+            results[index] = _result(index, email, 'error', errors=serializer.errors)
+            continue
+        data = serializer.validated_data
+        email = User.objects.normalize_email(data['email'])
+        if email.lower() in seen_emails:
+            results[index] = _result(index, email, 'error', errors={'email': ['Duplicate email in this upload.']})
+            continue
+        seen_emails.add(email.lower())
+        valid.append((index, email, data))
+
+    # Existing accounts, memberships, roles and role assignments in four queries
+    existing_users = {
+        user.email_lower: user
+        for user in User.objects.annotate(email_lower=Lower('email')).filter(
+            email_lower__in=list(seen_emails)
+        )
+    }
+    existing_memberships = {
+        membership.user_id: membership
+        for membership in OrganizationMembership.objects.filter(
+            organization=organization,
+            user_id__in=[user.pk for user in existing_users.values()],
+        )
+    }
+    role_slugs = {slug for _, _, data in valid for slug in data.get('roles', [])}
+    roles = {
+        role.slug: role
+        for role in Role.objects.filter(organization=organization, slug__in=role_slugs, is_active=True)
+    }
+    existing_user_roles = {
+        (user_role.user_id, user_role.role_id): user_role
+        for user_role in UserRole.objects.filter(
+            user_id__in=[user.pk for user in existing_users.values()],
+            role__in=list(roles.values()),
+        )
+    }
+
+    new_users = []
+    passwords = []
+    memberships = []
+    reactivated = []
+    user_roles = []
+    renewed_user_roles = []
+    now = timezone.now()
+    added_user_ids = []
+    for index, email, data in valid:
+        unknown = sorted(set(data.get('roles', [])) - set(roles))
+        if unknown:
+            results[index] = _result(index, email, 'error', errors={'roles': [f"Unknown roles: {', '.join(unknown)}"]})
+            continue
+
+        user = existing_users.get(email.lower())
+        membership = existing_memberships.get(user.pk) if user is not None else None
+        if membership is not None:
+            if membership.is_active:
+                results[index] = _result(index, email, 'skipped', user.pk, errors={'email': ['User is already a member of this organization.']})
+                continue
+            membership.is_active = True
+            membership.role = data['role']
+            membership.invited_by = invited_by
+            membership.updated_at = timezone.now()
+            reactivated.append(membership)
+            added_user_ids.append(user.pk)
+            results[index] = _result(index, email, 'reactivated', user.pk)
+        elif user is not None:
+            added_user_ids.append(user.pk)
+            results[index] = _result(index, email, 'added', user.pk)
+        else:
+            user = User(
+                email=email,
+                first_name=data.get('first_name', ''),
+                last_name=data.get('last_name', ''),
+                phone_number=data.get('phone_number'),
+                employee_id=data.get('employee_id', ''),
+            )
+            new_users.append(user)
+            passwords.append(data.get('password'))
+            results[index] = _result(index, email, 'created', user.pk)
+
+        if membership is None:
+            memberships.append(OrganizationMembership(
+                organization=organization,
+                user=user,
+                role=data['role'],
+                invited_by=invited_by,
+            ))
+        for slug in data.get('roles', []):
+            user_role = existing_user_roles.get((user.pk, roles[slug].pk))
+            if user_role is None:
+                user_roles.append(UserRole(user=user, role=roles[slug], assigned_by=invited_by))
+            elif not user_role.is_active or (user_role.expires_at and user_role.expires_at <= now):
+                user_role.is_active = True
+                user_role.expires_at = None
+                user_role.assigned_by = invited_by
+                user_role.assigned_at = now
+                user_role.updated_at = now
+                renewed_user_roles.append(user_role)
+
+    for user, hashed in zip(new_users, hash_passwords(passwords)):
+        user.password = hashed
+
+    batch_size = settings.USER_PROVISIONING_BATCH_SIZE
+    with transaction.atomic():
+        User.objects.bulk_create(new_users, batch_size=batch_size)
+        OrganizationMembership.objects.bulk_create(memberships, batch_size=batch_size)
+        OrganizationMembership.objects.bulk_update(
+            reactivated, ['is_active', 'role', 'invited_by', 'updated_at'], batch_size=batch_size
+        )
+        # Conflicts only arise from a concurrent assignment of the same role
+        UserRole.objects.bulk_create(user_roles, batch_size=batch_size, ignore_conflicts=True)
+        UserRole.objects.bulk_update(
+            renewed_user_roles,
+            ['is_active', 'expires_at', 'assigned_by', 'assigned_at', 'updated_at'],
+            batch_size=batch_size
+        )
+
+        # Bulk writes send no signals; only existing users can have cached state
+        if added_user_ids:
+            transaction.on_commit(lambda: _invalidate(organization.pk, added_user_ids))
+
+    return results
@@ -7,7 +7,11 @@ from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 from django.utils import timezone
 from datetime import timedelta
+from django.conf import settings
+from phonenumber_field.serializerfields import PhoneNumberField
+from apps.organizations.models import OrganizationMembership
 from .models import User, Role, UserRole, PasswordResetToken
+from .memberships import get_membership_summary
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -29,10 +33,8 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'last_login', 'email_verified', 'phone_verified']
     
     def get_primary_organization(self, obj):
-        org = obj.primary_organization
-        if org:
-            return {'id': str(org.id), 'name': org.name, 'slug': org.slug}
-        return None
+        # Prefetched memberships or the cached summary (no query per user)
+        return get_membership_summary(obj)['organization']
 
 
 class UserCreateSerializer(serializers.ModelSerializer):
@@ -59,6 +61,35 @@ class UserCreateSerializer(serializers.ModelSerializer):
         return user
 
 
+class ProvisionUserSerializer(serializers.Serializer):
+    """One row of a bulk user provisioning upload (see provisioning.py)."""
+    
+    email = serializers.EmailField(required=True)
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+    phone_number = PhoneNumberField(required=False, allow_null=True, default=None)
+    employee_id = serializers.CharField(max_length=50, required=False, allow_blank=True, default='')
+    # Without a password the account is created unusable (set via password reset)
+    password = serializers.CharField(
+        write_only=True, required=False, allow_null=True, default=None, validators=[validate_password]
+    )
+    role = serializers.ChoiceField(choices=OrganizationMembership.ROLE_CHOICES, default='field_officer')
+    roles = serializers.ListField(
+        child=serializers.SlugField(), required=False, default=list,
+        help_text="Slugs of custom roles to assign in the organization"
+    )
+
+
+class BulkProvisionSerializer(serializers.Serializer):
+    """Serializer for bulk user provisioning."""
+    
+    users = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=settings.USER_PROVISIONING_MAX_ROWS
+    )
+
+
 class LoginSerializer(serializers.Serializer):
     """Serializer for user login."""
     
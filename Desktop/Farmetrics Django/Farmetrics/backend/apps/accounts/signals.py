@@ -0,0 +1,60 @@
+"""
+Signal handlers for accounts app.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.organizations.models import Organization, OrganizationMembership
+
+from .models import Role, UserRole
+from .memberships import invalidate_membership_summaries
+from .permissions import invalidate_organization_permissions
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def invalidate_permissions_on_role_change(sender, instance, **kwargs):
+    """Role permission lists changed: drop every cached set in the organization."""
+    organization_id = instance.organization_id
+    transaction.on_commit(lambda: invalidate_organization_permissions(organization_id))
+
+
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+def invalidate_permissions_on_assignment(sender, instance, **kwargs):
+    """Drop the assigned user's cached permission set."""
+    user_id = instance.user_id
+    organization_id = Role.objects.filter(pk=instance.role_id).values_list(
+        'organization_id', flat=True
+    ).first()
+    if organization_id:
+        transaction.on_commit(lambda: invalidate_organization_permissions(organization_id, user_id))
+
+
+@receiver(post_save, sender=OrganizationMembership)
+@receiver(post_delete, sender=OrganizationMembership)
+def invalidate_permissions_on_membership(sender, instance, **kwargs):
+    """Permissions only apply to active members."""
+    organization_id = instance.organization_id
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_organization_permissions(organization_id, user_id))
+
+
+@receiver(post_save, sender=OrganizationMembership)
+@receiver(post_delete, sender=OrganizationMembership)
+def invalidate_membership_summary_on_membership(sender, instance, **kwargs):
+    """Primary organization and role may have changed."""
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_membership_summaries([user_id]))
+
+
+@receiver(post_save, sender=Organization)
+def invalidate_membership_summaries_on_organization(sender, instance, update_fields=None, **kwargs):
+    """Cached summaries include the organization's name and slug."""
+    if update_fields is not None and not {'name', 'slug'} & set(update_fields):
+        return
+    user_ids = list(instance.memberships.values_list('user_id', flat=True))
+    if user_ids:
+        transaction.on_commit(lambda: invalidate_membership_summaries(user_ids))
@@ -0,0 +1,205 @@
+"""
+Tests for accounts app.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.hashers import check_password
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.organizations.models import Organization, OrganizationMembership
+
+from . import permissions, provisioning
+from .models import Role, User, UserRole
+from .permissions import get_organization_permissions, invalidate_organization_permissions
+from .provisioning import hash_passwords, provision_users
+
+
+@override_settings(USER_PROVISIONING_POOL_THRESHOLD=1000)
+class ProvisionUsersTests(TestCase):
+    """Bulk provisioning matches existing accounts and memberships."""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Provisioning Org')
+        self.admin = User.objects.create_user(email='admin@example.com', password='x')
+
+    def test_existing_account_is_matched_case_insensitively(self):
+        existing = User.objects.create_user(email='Kofi.Mensah@example.com', password='x')
+
+        results = provision_users(
+            self.organization, [{'email': 'kofi.mensah@example.com'}], invited_by=self.admin
+        )
+
+        self.assertEqual(results[0]['status'], 'added')
+        self.assertEqual(results[0]['user_id'], str(existing.pk))
+        self.assertEqual(User.objects.filter(email__iexact='kofi.mensah@example.com').count(), 1)
+        self.assertTrue(OrganizationMembership.objects.filter(
+            organization=self.organization, user=existing, is_active=True
+        ).exists())
+
+    def test_inactive_membership_is_reactivated(self):
+        user = User.objects.create_user(email='ama@example.com', password='x')
+        membership = OrganizationMembership.objects.create(
+            organization=self.organization, user=user, role='field_officer', is_active=False
+        )
+
+        results = provision_users(
+            self.organization,
+            [{'email': 'AMA@example.com', 'role': 'supervisor'}],
+            invited_by=self.admin
+        )
+
+        self.assertEqual(results[0]['status'], 'reactivated')
+        membership.refresh_from_db()
+        self.assertTrue(membership.is_active)
+        self.assertEqual(membership.role, 'supervisor')
+        self.assertEqual(membership.invited_by, self.admin)
+
+    def test_active_membership_is_skipped(self):
+        user = User.objects.create_user(email='yaw@example.com', password='x')
+        OrganizationMembership.objects.create(organization=self.organization, user=user)
+
+        results = provision_users(self.organization, [{'email': 'Yaw@Example.com'}])
+
+        self.assertEqual(results[0]['status'], 'skipped')
+
+    def test_inactive_and_expired_roles_are_renewed(self):
+        user = User.objects.create_user(email='kojo@example.com', password='x')
+        inspector = Role.objects.create(organization=self.organization, name='Inspector', slug='inspector')
+        trainer = Role.objects.create(organization=self.organization, name='Trainer', slug='trainer')
+        inactive = UserRole.objects.create(user=user, role=inspector, is_active=False)
+        expired = UserRole.objects.create(
+            user=user, role=trainer, expires_at=timezone.now() - timedelta(days=1)
+        )
+
+        provision_users(
+            self.organization,
+            [{'email': 'kojo@example.com', 'roles': ['inspector', 'trainer']}],
+            invited_by=self.admin
+        )
+
+        self.assertEqual(UserRole.objects.filter(user=user).count(), 2)
+        for user_role in (inactive, expired):
+            user_role.refresh_from_db()
+            self.assertTrue(user_role.is_active)
+            self.assertIsNone(user_role.expires_at)
+            self.assertEqual(user_role.assigned_by, self.admin)
+
+    def test_active_role_is_left_unchanged(self):
+        user = User.objects.create_user(email='efua@example.com', password='x')
+        role = Role.objects.create(organization=self.organization, name='Inspector', slug='inspector')
+        user_role = UserRole.objects.create(user=user, role=role)
+
+        provision_users(
+            self.organization,
+            [{'email': 'efua@example.com', 'roles': ['inspector']}],
+            invited_by=self.admin
+        )
+
+        user_role.refresh_from_db()
+        self.assertIsNone(user_role.assigned_by)
+        self.assertEqual(UserRole.objects.filter(user=user).count(), 1)
+
+
+@override_settings(USER_PROVISIONING_POOL_THRESHOLD=2, USER_PROVISIONING_HASH_WORKERS=2)
+class HashPasswordsTests(TestCase):
+    """Large batches are hashed in a pool that is reused across uploads."""
+
+    def tearDown(self):
+        if provisioning._hash_pool is not None:
+            provisioning._discard_hash_pool(provisioning._hash_pool)
+
+    def test_pool_is_reused_between_batches(self):
+        passwords = ['alpha-1', 'bravo-2', 'charlie-3']
+
+        hashed = hash_passwords(passwords)
+        pool = provisioning._hash_pool
+        hash_passwords(passwords)
+
+        self.assertIs(provisioning._hash_pool, pool)
+        for password, encoded in zip(passwords, hashed):
+            self.assertTrue(check_password(password, encoded))
+
+
+class OrganizationPermissionTests(TestCase):
+    """Effective permissions are cached safely and enforced on member and role views."""
+
+    def setUp(self):
+        cache.clear()
+        self.organization = Organization.objects.create(name='Permissions Org')
+        self.user = User.objects.create_user(email='manager@example.com', password='x')
+        OrganizationMembership.objects.create(
+            organization=self.organization, user=self.user, role='supervisor'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.client.credentials(HTTP_X_ORGANIZATION_SLUG=self.organization.slug)
+
+    def assign(self, user, permission_strings, slug='managers'):
+        role = Role.objects.create(
+            organization=self.organization, name=slug.title(), slug=slug,
+            permissions=permission_strings
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            user_role = UserRole.objects.create(user=user, role=role)
+        # Permissions are memoized on the user instance, as they are per request
+        self.client.force_authenticate(User.objects.get(pk=user.pk))
+        return user_role
+
+    def test_wildcards_grant_matching_permissions(self):
+        self.assign(self.user, ['farmer.*'])
+
+        self.assertTrue(self.user.has_organization_permission(self.organization, 'farmer.edit'))
+        self.assertFalse(self.user.has_organization_permission(self.organization, 'visit.view'))
+
+        self.assign(User.objects.get(pk=self.user.pk), ['*'], slug='owners')
+        user = User.objects.get(pk=self.user.pk)
+        self.assertTrue(user.has_organization_permission(self.organization, 'visit.view'))
+
+    def test_set_loaded_during_invalidation_is_not_cached(self):
+        user_role = self.assign(self.user, ['farmer.view'])
+        load_permissions = permissions._load_permissions
+
+        def load_then_revoke(user_id, organization_id):
+            loaded = load_permissions(user_id, organization_id)
+            # The assignment is revoked after the read but before the set is stored
+            UserRole.objects.filter(pk=user_role.pk).update(is_active=False)
+            invalidate_organization_permissions(organization_id, user_id)
+            return loaded
+
+        with mock.patch.object(permissions, '_load_permissions', side_effect=load_then_revoke):
+            self.assertEqual(
+                get_organization_permissions(self.user, self.organization),
+                frozenset({'farmer.view'})
+            )
+
+        fresh = User.objects.get(pk=self.user.pk)
+        self.assertEqual(get_organization_permissions(fresh, self.organization), frozenset())
+
+    def test_add_member_requires_user_assign(self):
+        new_member = User.objects.create_user(email='kwame@example.com', password='x')
+        url = reverse('organizations:add_member', args=[self.organization.pk])
+
+        response = self.client.post(url, {'user_id': str(new_member.pk)}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+        self.assign(self.user, ['user.assign'])
+        response = self.client.post(url, {'user_id': str(new_member.pk)}, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def test_role_changes_require_role_manage(self):
+        self.assign(self.user, ['role.view', 'role.assign'])
+        role = Role.objects.create(organization=self.organization, name='Inspector', slug='inspector')
+        url = reverse('accounts:role_detail', args=[role.pk])
+
+        response = self.client.patch(url, {'description': 'Checks farms'}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+        self.assign(self.user, ['role.*'], slug='role-admins')
+        response = self.client.patch(url, {'description': 'Checks farms'}, format='json')
+        self.assertEqual(response.status_code, 200)
@@ -11,6 +11,8 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
 from .models import Role, UserRole
+from .permissions import HasOrganizationPermission
+from .memberships import prefetch_active_memberships
 from .serializers import (
     UserSerializer,
     UserCreateSerializer,
@@ -260,7 +262,8 @@ class UserListView(generics.ListAPIView):
                 last_name__icontains=search
             )
         
-        return queryset
+        # Primary organization and role for each user in one extra query
+        return prefetch_active_memberships(queryset)
 
 
 class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -299,10 +302,12 @@ class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
 class RoleListCreateView(generics.ListCreateAPIView):
     """
     List all roles or create a new role.
+    Creating roles requires the role.manage permission in the organization.
     """
     queryset = Role.objects.all()
     serializer_class = RoleSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, HasOrganizationPermission]
+    required_permissions = {'POST': ['role.manage']}
     
     @extend_schema(
         summary="List roles",
@@ -314,12 +319,19 @@ class RoleListCreateView(generics.ListCreateAPIView):
     
     @extend_schema(
         summary="Create role",
-        description="Create a new role (admin only)",
+        description="Create a new role in the current organization (requires role.manage)",
         tags=["Roles"]
     )
     def post(self, request, *args, **kwargs):
         return super().post(request, *args, **kwargs)
     
+    def perform_create(self, serializer):
+        # Permission was checked in the request's organization, so create it there
+        if hasattr(self.request, 'organization') and self.request.organization:
+            serializer.save(organization=self.request.organization)
+        else:
+            serializer.save()
+    
     def get_queryset(self):
         queryset = super().get_queryset()
         
@@ -337,10 +349,16 @@ class RoleListCreateView(generics.ListCreateAPIView):
 class RoleDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Get, update, or delete a specific role.
+    Changes require the role.manage permission in the organization.
     """
     queryset = Role.objects.all()
     serializer_class = RoleSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, HasOrganizationPermission]
+    required_permissions = {
+        'PUT': ['role.manage'],
+        'PATCH': ['role.manage'],
+        'DELETE': ['role.manage'],
+    }
     
     @extend_schema(
         summary="Get role detail",
@@ -352,7 +370,7 @@ class RoleDetailView(generics.RetrieveUpdateDestroyAPIView):
     
     @extend_schema(
         summary="Update role",
-        description="Update a specific role (admin only)",
+        description="Update a specific role (requires role.manage)",
         tags=["Roles"]
     )
     def put(self, request, *args, **kwargs):
@@ -360,7 +378,7 @@ class RoleDetailView(generics.RetrieveUpdateDestroyAPIView):
     
     @extend_schema(
         summary="Delete role",
-        description="Delete a specific role (admin only)",
+        description="Delete a specific role (requires role.manage)",
         tags=["Roles"]
     )
     def delete(self, request, *args, **kwargs):
@@ -372,4 +390,13 @@ class RoleDetailView(generics.RetrieveUpdateDestroyAPIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         return super().delete(request, *args, **kwargs)
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        
+        # Only roles of the organization the permission was checked in
+        if hasattr(self.request, 'organization') and self.request.organization:
+            queryset = queryset.filter(organization=self.request.organization)
+        
+        return queryset
 
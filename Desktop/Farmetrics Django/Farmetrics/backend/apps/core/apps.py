@@ -5,4 +5,9 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
     verbose_name = 'Core'
-
+    
+    def ready(self):
+        from django.utils.module_loading import autodiscover_modules
+        
+        # Register domain event subscribers (see apps/core/events.py)
+        autodiscover_modules('handlers')
@@ -121,7 +121,8 @@ def log_audit_event(
     organization=None,
     request=None,
     description='',
-    metadata=None
+    metadata=None,
+    request_context=None
 ):
     """
     Create an audit log entry.
@@ -137,6 +138,8 @@ def log_audit_event(
         request: HTTP request object (for IP, path, etc.)
         description: Description of the action
         metadata: Additional metadata
+        request_context: Request details captured earlier (see
+            apps.core.events.request_context), used when the request is gone
     
     Returns:
         AuditLog instance
@@ -162,6 +165,11 @@ def log_audit_event(
         user_agent = request.META.get('HTTP_USER_AGENT', '')[:500]
         request_path = request.path[:500]
         request_method = request.method
+    elif request_context:
+        ip_address = request_context.get('ip_address')
+        user_agent = request_context.get('user_agent', '')
+        request_path = request_context.get('request_path', '')
+        request_method = request_context.get('request_method', '')
     
     if not user and request and hasattr(request, 'user'):
         user = request.user if request.user.is_authenticated else None
@@ -0,0 +1,133 @@
+"""
+Human-readable record codes (farmer IDs, farm/visit/request codes).
+
+Codes use the PREFIX-YEAR-XXXXXXX format, where XXXXXXX is a zero-padded
+base36 counter backed by a PostgreSQL sequence per (prefix, year). Each
+sequence value reserves a block of CODE_BLOCK_SIZE counters that is handed
+out from an in-process cache, so most inserts need no extra query and bulk
+inserts reserve all their codes with a single query. Sequences never return
+a value twice, and legacy random codes have six characters after the year
+while sequence codes have at least seven, so codes are unique without
+exists() checks; unused counters in a cached block are skipped when the
+process exits. Sequences are created on first use and remembered per
+process once the creating transaction has committed.
+"""
+
+import os
+import re
+import string
+import threading
+
+from django.db import IntegrityError, ProgrammingError, connection, transaction
+from django.utils import timezone
+
+CODE_ALPHABET = string.digits + string.ascii_uppercase
+# One character wider than legacy random codes (PREFIX-YEAR-XXXXXX), so a
+# sequence code can never equal an existing random code
+CODE_WIDTH = 7
+# Counter values per sequence value (hi/lo allocation). Changing this maps
+# existing sequence positions to different counters, so it must stay fixed.
+CODE_BLOCK_SIZE = 20
+
+_lock = threading.Lock()
+# sequence name -> [next value, end (exclusive)]
+_blocks = {}
+# Sequences known to exist (created or found by a committed transaction)
+_ensured_sequences = set()
+
+if hasattr(os, 'register_at_fork'):
+    # Forked workers (Celery prefork, gunicorn) must not reuse the parent's block
+    os.register_at_fork(after_in_child=_blocks.clear)
+
+
+def encode_counter(value, width=CODE_WIDTH):
+    """Base36 encode a counter value, zero-padded to width."""
+    digits = []
+    while value:
+        value, remainder = divmod(value, 36)
+        digits.append(CODE_ALPHABET[remainder])
+    return ''.join(reversed(digits)).rjust(width, '0')
+
+
+def sequence_name(prefix, year):
+    """PostgreSQL sequence name for a code prefix and year."""
+    # Prefixes that sanitize to the same name share a sequence, which is harmless
+    safe_prefix = re.sub(r'[^a-z0-9]', '_', prefix.lower())
+    return f'code_seq_{safe_prefix}_{year}'
+
+
+def _ensure_sequence(cursor, name):
+    if name in _ensured_sequences:
+        return
+    try:
+        with transaction.atomic():
+            cursor.execute(f'CREATE SEQUENCE IF NOT EXISTS "{name}"')
+    except (IntegrityError, ProgrammingError):
+        # Created concurrently by another process
+        pass
+    # A sequence created in a transaction that rolls back does not exist,
+    # so only remember it once committed (immediately in autocommit)
+    transaction.on_commit(lambda: _ensured_sequences.add(name))
+
+
+def _reserve_blocks(name, count):
+    """Reserve count blocks from a sequence with one query."""
+    with connection.cursor() as cursor:
+        _ensure_sequence(cursor, name)
+        cursor.execute(
+            'SELECT nextval(%s::regclass) FROM generate_series(1, %s)',
+            [f'"{name}"', count]
+        )
+        return sorted(row[0] for row in cursor.fetchall())
+
+
+def _take(name, count):
+    """Take count counter values, using the cached block first."""
+    values = []
+    with _lock:
+        block = _blocks.get(name)
+        if block:
+            taken = min(count, block[1] - block[0])
+            values.extend(range(block[0], block[0] + taken))
+            block[0] += taken
+
+    needed = count - len(values)
+    if needed:
+        blocks = _reserve_blocks(name, -(-needed // CODE_BLOCK_SIZE))
+        reserved = [
+            value
+            for high in blocks
+            for value in range(high * CODE_BLOCK_SIZE, (high + 1) * CODE_BLOCK_SIZE)
+        ]
+        values.extend(reserved[:needed])
+        leftover = reserved[needed:]
+        if leftover:
+            # Only the last block is partially used, so the leftover is contiguous
+            with _lock:
+                _blocks[name] = [leftover[0], leftover[-1] + 1]
+
+    return values
+
+
+def allocate_codes(prefix, count, year=None):
+    """
+    Allocate count unique codes for a prefix.
+
+    Args:
+        prefix: Code prefix, e.g. "FARM" or an organization code
+        count: Number of codes to allocate
+        year: Year embedded in the codes (defaults to the current year)
+
+    Returns:
+        List of codes like "FARM-2025-000001A"
+    """
+    if count <= 0:
+        return []
+    year = year or timezone.now().year
+    values = _take(sequence_name(prefix, year), count)
+    return [f'{prefix}-{year}-{encode_counter(value)}' for value in values]
+
+
+def next_code(prefix, year=None):
+    """Allocate a single unique code for a prefix."""
+    return allocate_codes(prefix, 1, year=year)[0]
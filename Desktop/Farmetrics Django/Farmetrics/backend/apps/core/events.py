@@ -0,0 +1,105 @@
+"""
+Domain event bus.
+
+Views publish what happened (``visit.approved``, ``request.created``, ...)
+and subscribers in the apps react to it (notifications, audit logging).
+Publishing only schedules one Celery message once the transaction
+commits, so request latency does not depend on the number of subscribers,
+and events are never delivered for rolled-back changes. The worker then
+runs every subscriber as its own task, so a failing subscriber is retried
+without affecting the others. Each subscriber runs at most once per event
+ID (see run_event_handler), inside a transaction; subscribers with side
+effects outside the database must defer them with transaction.on_commit.
+
+Subscribers live in ``handlers.py`` modules of the installed apps (loaded
+by CoreConfig.ready) and receive the event envelope:
+
+    @subscribe('visit.approved')
+    def notify_field_officer(event):
+        visit_id = event['payload']['visit_id']
+"""
+
+import json
+import logging
+import uuid
+from collections import defaultdict
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Event name -> list of handler paths ("module.function")
+_subscribers = defaultdict(list)
+# Handler path -> function
+_handlers = {}
+
+
+def subscribe(*event_names):
+    """Register the decorated function as a subscriber of one or more events."""
+    def decorator(func):
+        handler_path = f'{func.__module__}.{func.__qualname__}'
+        _handlers[handler_path] = func
+        for event_name in event_names:
+            if handler_path not in _subscribers[event_name]:
+                _subscribers[event_name].append(handler_path)
+        return func
+    return decorator
+
+
+def subscribers(event_name):
+    """Handler paths subscribed to an event."""
+    return list(_subscribers.get(event_name, []))
+
+
+def get_handler(handler_path):
+    """Subscriber function for a handler path, or None if not registered."""
+    return _handlers.get(handler_path)
+
+
+def request_context(request):
+    """Request details kept with an event for audit logging."""
+    from .audit import get_client_ip
+
+    return {
+        'ip_address': get_client_ip(request),
+        'user_agent': request.META.get('HTTP_USER_AGENT', '')[:500],
+        'request_path': request.path[:500],
+        'request_method': request.method,
+    }
+
+
+def publish(event_name, payload, actor=None, organization_id=None, request=None):
+    """
+    Publish a domain event after the current transaction commits.
+
+    Args:
+        event_name: Event name, e.g. "visit.approved"
+        payload: JSON-serializable dict (model instances should be passed as IDs)
+        actor: User who caused the event
+        organization_id: ID of the organization the event belongs to
+        request: Current request (IP, path, ... recorded for audit logs)
+
+    Returns:
+        Event envelope dict
+    """
+    from .tasks import dispatch_event
+
+    event = {
+        'id': str(uuid.uuid4()),
+        'name': event_name,
+        'occurred_at': timezone.now().isoformat(),
+        'actor_id': str(actor.pk) if actor and actor.is_authenticated else None,
+        'organization_id': str(organization_id) if organization_id else None,
+        'context': request_context(request) if request else {},
+        # Round trip so UUIDs, dates and decimals become plain JSON values
+        'payload': json.loads(json.dumps(payload, cls=DjangoJSONEncoder)),
+    }
+
+    if not subscribers(event_name):
+        logger.debug(f"No subscribers for event {event_name}")
+        return event
+
+    transaction.on_commit(lambda: dispatch_event.delay(event))
+    return event
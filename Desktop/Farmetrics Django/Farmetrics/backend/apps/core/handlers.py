@@ -0,0 +1,50 @@
+"""
+Domain event subscribers for core app (audit logging).
+"""
+
+from django.apps import apps
+
+from .audit import log_audit_event
+from .events import subscribe
+
+# Event -> (audit action, model label, payload key of the object ID)
+AUDITED_EVENTS = {
+    'visit.submitted': ('submit', 'visits.Visit', 'visit_id'),
+    'visit.approved': ('approve', 'visits.Visit', 'visit_id'),
+    'visit.rejected': ('reject', 'visits.Visit', 'visit_id'),
+    'visit.needs_revision': ('reject', 'visits.Visit', 'visit_id'),
+    'request.created': ('create', 'requests.Request', 'request_id'),
+    'request.approved': ('approve', 'requests.Request', 'request_id'),
+    'request.rejected': ('reject', 'requests.Request', 'request_id'),
+    'request.cancelled': ('update', 'requests.Request', 'request_id'),
+    'farmer.verified': ('verify', 'farmers.Farmer', 'farmer_id'),
+    'farm.verified': ('verify', 'farms.Farm', 'farm_id'),
+}
+
+
+@subscribe(*AUDITED_EVENTS)
+def audit_event(event):
+    """Record workflow events in the audit log."""
+    from apps.accounts.models import User
+    from apps.organizations.models import Organization
+    
+    action, model_label, key = AUDITED_EVENTS[event['name']]
+    model = apps.get_model(model_label)
+    obj = model._base_manager.filter(pk=event['payload'][key]).first()
+    
+    user = None
+    if event['actor_id']:
+        user = User.objects.filter(pk=event['actor_id']).first()
+    organization = None
+    if event['organization_id']:
+        organization = Organization.objects.filter(pk=event['organization_id']).first()
+    
+    log_audit_event(
+        action=action,
+        user=user,
+        obj=obj,
+        organization=organization,
+        description=f"Event {event['name']}",
+        metadata={'event_id': event['id'], 'event': event['name'], **event['payload']},
+        request_context=event['context']
+    )
@@ -42,16 +42,18 @@ class SoftDeleteQuerySet(models.QuerySet):
 
 
 class SoftDeleteManager(models.Manager):
-    """Manager that uses SoftDeleteQuerySet."""
+    """Manager that uses SoftDeleteQuerySet (or a subclass set in queryset_class)."""
+    
+    queryset_class = SoftDeleteQuerySet
     
     def get_queryset(self):
-        return SoftDeleteQuerySet(self.model, using=self._db).alive()
+        return self.queryset_class(self.model, using=self._db).alive()
     
     def all_with_deleted(self):
-        return SoftDeleteQuerySet(self.model, using=self._db)
+        return self.queryset_class(self.model, using=self._db)
     
     def deleted_only(self):
-        return SoftDeleteQuerySet(self.model, using=self._db).dead()
+        return self.queryset_class(self.model, using=self._db).dead()
 
 
 class SoftDeleteModel(TimeStampedModel):
@@ -85,3 +87,23 @@ class SoftDeleteModel(TimeStampedModel):
         """Check if object is deleted."""
         return self.deleted_at is not None
 
+
+
+class ProcessedEvent(TimeStampedModel):
+    """
+    A domain event already handled by one subscriber.
+    
+    Written in the same transaction as the subscriber's changes, so a
+    redelivered or retried event is skipped once it has been handled and
+    rolled back together with the changes if the subscriber fails.
+    """
+    event_id = models.UUIDField()
+    event_name = models.CharField(max_length=100)
+    handler = models.CharField(max_length=255)
+    
+    class Meta:
+        unique_together = [['event_id', 'handler']]
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.event_name} ({self.event_id}) -> {self.handler}"
@@ -5,7 +5,7 @@ Global search functionality across all models.
 from django.db.models import Q
 
 
-def global_search(query, organization=None, model_types=None, limit=50):
+def global_search(query, organization=None, model_types=None, limit=50, request=None):
     """
     Perform global search across multiple models.
     
@@ -14,6 +14,8 @@ def global_search(query, organization=None, model_types=None, limit=50):
         organization: Filter by organization
         model_types: List of model types to search (e.g., ['farmer', 'farm'])
         limit: Maximum results per model type
+        request: Current request; farmers, farms and visits are limited
+            to the user's regions (see apps.regions.scoping)
     
     Returns:
         Dictionary with results grouped by model type
@@ -35,20 +37,29 @@ def global_search(query, organization=None, model_types=None, limit=50):
     from apps.farms.models import Farm
     from apps.visits.models import Visit
     from apps.regions.models import Region
+    from apps.regions.tree import region_full_paths
     from apps.accounts.models import User
     from apps.requests.models import Request
+    from apps.regions.scoping import scope_farmers, scope_farms, scope_visits
     
     # Search Farmers
     if not model_types or 'farmer' in model_types:
+        from apps.farmers.filters import name_prefix_q, phonetic_name_q
+        
         farmer_q = Q(
-            Q(first_name__icontains=query) |
-            Q(last_name__icontains=query) |
             Q(farmer_id__icontains=query) |
             Q(phone_number__icontains=query) |
             Q(national_id__icontains=query) |
             Q(email__icontains=query)
         )
-        farmers = Farmer.objects.filter(base_filter & farmer_q)[:limit]
+        # Names by prefix of the normalized keys, and spelling variants ("Kwami" -> "Kwame")
+        for name_q in (name_prefix_q(query), phonetic_name_q(query)):
+            if name_q is not None:
+                farmer_q |= name_q
+        farmers = Farmer.objects.filter(base_filter & farmer_q)
+        if request is not None:
+            farmers = scope_farmers(farmers, request)
+        farmers = farmers[:limit]
         results['farmers'] = [
             {
                 'id': str(f.id),
@@ -70,7 +81,10 @@ def global_search(query, organization=None, model_types=None, limit=50):
             Q(owner__first_name__icontains=query) |
             Q(owner__last_name__icontains=query)
         )
-        farms = Farm.objects.filter(base_filter & farm_q)[:limit]
+        farms = Farm.objects.filter(base_filter & farm_q)
+        if request is not None:
+            farms = scope_farms(farms, request)
+        farms = farms[:limit]
         results['farms'] = [
             {
                 'id': str(f.id),
@@ -92,7 +106,10 @@ def global_search(query, organization=None, model_types=None, limit=50):
             Q(farmer__last_name__icontains=query) |
             Q(observations__icontains=query)
         )
-        visits = Visit.objects.filter(base_filter & visit_q)[:limit]
+        visits = Visit.objects.filter(base_filter & visit_q)
+        if request is not None:
+            visits = scope_visits(visits, request)
+        visits = visits[:limit]
         results['visits'] = [
             {
                 'id': str(v.id),
@@ -112,14 +129,15 @@ def global_search(query, organization=None, model_types=None, limit=50):
             Q(code__icontains=query) |
             Q(description__icontains=query)
         )
-        regions = Region.objects.filter(base_filter & region_q)[:limit]
+        regions = list(Region.objects.filter(base_filter & region_q)[:limit])
+        region_paths = region_full_paths(regions)
         results['regions'] = [
             {
                 'id': str(r.id),
                 'type': 'region',
                 'title': r.name,
                 'subtitle': r.code,
-                'description': r.full_path,
+                'description': region_paths[r.pk],
                 'url': f'/api/v1/regions/{r.id}/'
             }
             for r in regions
@@ -0,0 +1,71 @@
+"""
+Celery tasks for core app.
+"""
+
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def dispatch_event(event):
+    """Run each subscriber of a domain event as its own task."""
+    from .events import subscribers
+    
+    handler_paths = subscribers(event['name'])
+    for handler_path in handler_paths:
+        run_event_handler.delay(handler_path, event)
+    return len(handler_paths)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def run_event_handler(self, handler_path, event):
+    """
+    Run one subscriber for a domain event, at most once per event.
+    
+    The subscriber runs in one transaction with the ProcessedEvent row
+    for (event ID, handler): a redelivered message is skipped, and a failed
+    attempt leaves nothing behind (its on_commit callbacks are discarded
+    too), so retrying it cannot duplicate audit entries or notifications.
+    """
+    from .events import get_handler
+    from .models import ProcessedEvent
+    
+    handler = get_handler(handler_path)
+    if handler is None:
+        logger.warning(f"Event handler {handler_path} is not registered")
+        return None
+    
+    try:
+        with transaction.atomic():
+            # A concurrent worker with the same event blocks here until the first commits
+            _, created = ProcessedEvent.objects.get_or_create(
+                event_id=event['id'],
+                handler=handler_path,
+                defaults={'event_name': event['name']}
+            )
+            if not created:
+                logger.info(f"Event handler {handler_path} already ran for {event['name']} ({event['id']})")
+                return False
+            handler(event)
+    except Exception as e:
+        logger.error(f"Event handler {handler_path} failed for {event['name']} ({event['id']}): {e}")
+        raise self.retry(exc=e)
+    return True
+
+
+@shared_task
+def purge_processed_events():
+    """Delete processed-event records past the retention period (runs daily)."""
+    from .models import ProcessedEvent
+    
+    cutoff = timezone.now() - timedelta(days=settings.EVENT_PROCESSED_RETENTION_DAYS)
+    deleted, _ = ProcessedEvent.objects.filter(created_at__lt=cutoff).delete()
+    logger.info(f"Purged {deleted} processed event records")
+    return deleted
@@ -0,0 +1,100 @@
+"""
+Tests for core app.
+"""
+
+import uuid
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from . import codes
+from .audit import AuditLog, log_audit_event
+from .events import subscribe
+from .models import ProcessedEvent
+from .tasks import run_event_handler
+
+AUDIT_HANDLER = 'apps.core.handlers.audit_event'
+
+
+class FlakyHandler:
+    """Writes an audit entry, then fails while `failures` is positive."""
+    
+    failures = 0
+
+
+@subscribe('test.flaky')
+def flaky_handler(event):
+    log_audit_event(action='update', description='flaky', metadata={'event_id': event['id']})
+    if FlakyHandler.failures:
+        FlakyHandler.failures -= 1
+        raise RuntimeError('Temporary failure')
+
+
+def make_event(name):
+    return {
+        'id': str(uuid.uuid4()),
+        'name': name,
+        'occurred_at': '2025-01-01T00:00:00+00:00',
+        'actor_id': None,
+        'organization_id': None,
+        'context': {},
+        'payload': {'farmer_id': str(uuid.uuid4())},
+    }
+
+
+class RunEventHandlerTests(TestCase):
+    """Subscribers run at most once per event, however often it is delivered."""
+    
+    def test_redelivered_event_is_skipped(self):
+        event = make_event('farmer.verified')
+        
+        self.assertTrue(run_event_handler(AUDIT_HANDLER, event))
+        self.assertFalse(run_event_handler(AUDIT_HANDLER, event))
+        
+        self.assertEqual(AuditLog.objects.filter(metadata__event_id=event['id']).count(), 1)
+        self.assertEqual(ProcessedEvent.objects.filter(event_id=event['id']).count(), 1)
+    
+    def test_failed_attempt_leaves_nothing_behind(self):
+        event = make_event('test.flaky')
+        handler_path = f'{__name__}.flaky_handler'
+        FlakyHandler.failures = 1
+        
+        # Called directly, retry() re-raises the original exception
+        with self.assertRaises(RuntimeError):
+            run_event_handler(handler_path, event)
+        self.assertFalse(AuditLog.objects.filter(metadata__event_id=event['id']).exists())
+        self.assertFalse(ProcessedEvent.objects.filter(event_id=event['id']).exists())
+        
+        self.assertTrue(run_event_handler(handler_path, event))
+        self.assertFalse(run_event_handler(handler_path, event))
+        self.assertEqual(AuditLog.objects.filter(metadata__event_id=event['id']).count(), 1)
+
+
+class SequenceCodeTests(TestCase):
+    """Code sequences are created once per process, after commit."""
+
+    def setUp(self):
+        self.prefix = f'T{uuid.uuid4().hex[:6].upper()}'
+        self.name = codes.sequence_name(self.prefix, 2099)
+
+    def allocate(self, count):
+        return codes.allocate_codes(self.prefix, count, year=2099)
+
+    def test_committed_sequence_is_not_created_again(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.allocate(1)
+        self.assertIn(self.name, codes._ensured_sequences)
+
+        # More than the cached block, so another block is reserved
+        with CaptureQueriesContext(connection) as context:
+            more = self.allocate(codes.CODE_BLOCK_SIZE * 2)
+
+        self.assertFalse(any('CREATE SEQUENCE' in query['sql'] for query in context.captured_queries))
+        self.assertEqual(len(set(first + more)), 1 + codes.CODE_BLOCK_SIZE * 2)
+
+    def test_uncommitted_sequence_is_not_remembered(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            self.allocate(1)
+
+        self.assertNotIn(self.name, codes._ensured_sequences)
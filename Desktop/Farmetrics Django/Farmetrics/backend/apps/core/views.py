@@ -145,7 +145,8 @@ class GlobalSearchView(APIView):
             query=query,
             organization=organization,
             model_types=model_types,
-            limit=limit
+            limit=limit,
+            request=request
         )
         
         return Response(results)
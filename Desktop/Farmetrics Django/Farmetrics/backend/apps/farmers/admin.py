@@ -4,7 +4,7 @@ Admin configuration for Farmers app.
 
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Farmer, FarmerMergeHistory
+from .models import Farmer, FarmerMergeHistory, FarmerDuplicateCandidate, ImportJob
 
 
 @admin.register(Farmer)
@@ -124,3 +124,37 @@ class FarmerMergeHistoryAdmin(admin.ModelAdmin):
         # Prevent manual creation of merge records
         return False
 
+
+
+@admin.register(FarmerDuplicateCandidate)
+class FarmerDuplicateCandidateAdmin(admin.ModelAdmin):
+    """Admin interface for FarmerDuplicateCandidate model."""
+    
+    list_display = ['farmer_a', 'farmer_b', 'score', 'status', 'reviewed_by', 'created_at']
+    list_filter = ['organization', 'status', 'created_at']
+    search_fields = ['farmer_a__farmer_id', 'farmer_b__farmer_id']
+    readonly_fields = ['id', 'score', 'match_reasons', 'details', 'created_at', 'updated_at']
+    autocomplete_fields = ['organization', 'farmer_a', 'farmer_b', 'reviewed_by']
+    
+    def has_add_permission(self, request):
+        # Candidates are produced by duplicate detection
+        return False
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    """Admin interface for ImportJob model."""
+    
+    list_display = [
+        'file_name', 'organization', 'status', 'processed_rows', 'total_rows',
+        'farmers_created', 'farms_created', 'error_count', 'created_at'
+    ]
+    list_filter = ['organization', 'status', 'file_format', 'dry_run']
+    search_fields = ['file_name']
+    readonly_fields = [
+        'id', 'status', 'total_rows', 'processed_rows', 'farmers_created',
+        'farms_created', 'error_count', 'errors', 'error_message',
+        'started_at', 'completed_at', 'created_at', 'updated_at'
+    ]
+    autocomplete_fields = ['organization', 'created_by']
+    date_hierarchy = 'created_at'
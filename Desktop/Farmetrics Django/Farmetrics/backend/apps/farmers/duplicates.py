@@ -0,0 +1,278 @@
+"""
+Organization-wide farmer duplicate detection.
+
+Comparing every farmer with every other farmer is O(n^2). Instead, each
+farmer is assigned a few blocking keys (normalized phone numbers, normalized
+national ID, phonetic first+last name within a region) and only farmers that
+share a key are compared. The candidate pairs are scored with exact-match
+signals plus trigram name similarity and written to FarmerDuplicateCandidate.
+
+Memory stays proportional to the number of farmers rather than the number
+of candidate pairs: the blocking pass keeps integer row indexes only,
+pairs are generated block by block and scored in batches of
+SCORING_BATCH_SIZE, and full rows are loaded per scoring batch.
+"""
+
+import logging
+from itertools import combinations, islice
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Farmer, FarmerDuplicateCandidate
+from .phonetics import (
+    normalize_name,
+    normalize_national_id,
+    normalize_phone,
+    phonetic_key,
+    trigram_similarity,
+    trigrams,
+)
+
+logger = logging.getLogger(__name__)
+
+SCORING_BATCH_SIZE = 2000
+MIN_NATIONAL_ID_LENGTH = 5
+
+# Score weights
+WEIGHT_NATIONAL_ID = 0.45
+WEIGHT_PHONE = 0.35
+WEIGHT_NAME = 0.35
+WEIGHT_SAME_REGION = 0.05
+WEIGHT_DATE_OF_BIRTH = 0.10
+PENALTY_NATIONAL_ID_CONFLICT = 0.25
+PENALTY_DATE_OF_BIRTH_CONFLICT = 0.10
+
+FARMER_FIELDS = [
+    'id', 'first_name', 'last_name', 'phone_number', 'alternate_phone',
+    'national_id', 'region_id', 'date_of_birth',
+    'first_name_phonetic', 'last_name_phonetic',
+]
+
+
+def blocking_keys(farmer):
+    """
+    Blocking keys for a farmer values() dict.
+
+    Farmers sharing any key are compared with each other.
+    """
+    keys = set()
+
+    for field in ('phone_number', 'alternate_phone'):
+        phone = normalize_phone(farmer.get(field))
+        if phone:
+            keys.add(f'phone:{phone}')
+
+    national_id = normalize_national_id(farmer.get('national_id'))
+    if len(national_id) >= MIN_NATIONAL_ID_LENGTH:
+        keys.add(f'nid:{national_id}')
+
+    # Stored keys when available (kept current on save and by backfill_farmer_name_keys)
+    first = farmer.get('first_name_phonetic') or phonetic_key(farmer.get('first_name'))
+    last = farmer.get('last_name_phonetic') or phonetic_key(farmer.get('last_name'))
+    if first and last:
+        # Order-independent so swapped first/last names share a block
+        names = ':'.join(sorted([first, last]))
+        keys.add(f"name:{names}:{farmer.get('region_id') or ''}")
+
+    return keys
+
+
+def _full_name(farmer):
+    return normalize_name(f"{farmer.get('first_name', '')} {farmer.get('last_name', '')}")
+
+
+def score_pair(a, b):
+    """
+    Score two farmer values() dicts.
+
+    Returns:
+        (score, match_reasons, details)
+    """
+    reasons = []
+    details = {}
+    score = 0.0
+
+    phones_a = {normalize_phone(a.get(f)) for f in ('phone_number', 'alternate_phone')} - {''}
+    phones_b = {normalize_phone(b.get(f)) for f in ('phone_number', 'alternate_phone')} - {''}
+    if phones_a & phones_b:
+        score += WEIGHT_PHONE
+        reasons.append('phone')
+
+    nid_a = normalize_national_id(a.get('national_id'))
+    nid_b = normalize_national_id(b.get('national_id'))
+    if nid_a and nid_b:
+        if nid_a == nid_b:
+            score += WEIGHT_NATIONAL_ID
+            reasons.append('national_id')
+        else:
+            score -= PENALTY_NATIONAL_ID_CONFLICT
+            details['national_id_conflict'] = True
+
+    name_a = _full_name(a)
+    name_b = _full_name(b)
+    swapped_b = normalize_name(f"{b.get('last_name', '')} {b.get('first_name', '')}")
+    name_similarity = max(
+        trigram_similarity(trigrams(name_a), trigrams(name_b)),
+        trigram_similarity(trigrams(name_a), trigrams(swapped_b)),
+    )
+    details['name_similarity'] = round(name_similarity, 3)
+    score += WEIGHT_NAME * name_similarity
+    if name_similarity >= 0.5:
+        reasons.append('name')
+    elif (phonetic_key(a.get('first_name')) == phonetic_key(b.get('first_name'))
+          and phonetic_key(a.get('last_name')) == phonetic_key(b.get('last_name'))):
+        # Phonetically equal names can have low trigram overlap ("Kyei"/"Chei")
+        score += WEIGHT_NAME * 0.5
+        reasons.append('phonetic_name')
+
+    if a.get('region_id') and a.get('region_id') == b.get('region_id'):
+        score += WEIGHT_SAME_REGION
+        reasons.append('region')
+
+    dob_a = a.get('date_of_birth')
+    dob_b = b.get('date_of_birth')
+    if dob_a and dob_b:
+        if dob_a == dob_b:
+            score += WEIGHT_DATE_OF_BIRTH
+            reasons.append('date_of_birth')
+        else:
+            score -= PENALTY_DATE_OF_BIRTH_CONFLICT
+
+    return max(0.0, min(1.0, round(score, 4))), reasons, details
+
+
+def find_candidate_pairs(organization_id, max_block_size=None):
+    """
+    Stream an organization's farmers into blocks and generate candidate pairs.
+
+    Returns:
+        (farmer_ids, pairs, stats) where pairs is an iterator of (i, j)
+        index tuples into farmer_ids with farmer_ids[i] < farmer_ids[j].
+        Each pair is yielded once, by the first block it shares, and
+        stats["candidate_pairs"] counts the pairs yielded so far.
+    """
+    if max_block_size is None:
+        max_block_size = settings.FARMER_DUPLICATE_MAX_BLOCK_SIZE
+
+    farmer_ids = []
+    farmer_blocks = []
+    block_ids = {}
+    blocks = []
+
+    farmers = Farmer.objects.filter(organization_id=organization_id).values(*FARMER_FIELDS)
+    for farmer in farmers.iterator(chunk_size=5000):
+        index = len(farmer_ids)
+        farmer_ids.append(farmer['id'])
+        own_blocks = []
+        for key in blocking_keys(farmer):
+            block_id = block_ids.setdefault(key, len(blocks))
+            if block_id == len(blocks):
+                blocks.append([])
+            blocks[block_id].append(index)
+            own_blocks.append(block_id)
+        farmer_blocks.append(own_blocks)
+
+    eligible = [False] * len(blocks)
+    oversized_blocks = 0
+    for key, block_id in block_ids.items():
+        size = len(blocks[block_id])
+        if size > max_block_size:
+            # Very common keys (shared office phone, common name in a big
+            # region) carry little signal and would dominate the run time
+            oversized_blocks += 1
+            logger.info(f"Skipping oversized duplicate block {key} ({size} farmers)")
+        else:
+            eligible[block_id] = size >= 2
+
+    stats = {
+        'farmers': len(farmer_ids),
+        'blocks': len(blocks),
+        'oversized_blocks': oversized_blocks,
+        'candidate_pairs': 0,
+    }
+
+    def generate_pairs():
+        for block_id, members in enumerate(blocks):
+            if not eligible[block_id]:
+                continue
+            for i, j in combinations(members, 2):
+                # Farmers sharing several keys are paired by the first one only
+                shared = [b for b in farmer_blocks[i] if eligible[b] and b in farmer_blocks[j]]
+                if min(shared) != block_id:
+                    continue
+                if str(farmer_ids[i]) > str(farmer_ids[j]):
+                    i, j = j, i
+                stats['candidate_pairs'] += 1
+                yield i, j
+
+    return farmer_ids, generate_pairs(), stats
+
+
+def detect_duplicates(organization_id, min_score=None):
+    """
+    Run duplicate detection for an organization and refresh its
+    FarmerDuplicateCandidate rows.
+
+    Reviewed candidates (confirmed/dismissed/merged) keep their status;
+    pending candidates that no longer match are removed.
+
+    Args:
+        organization_id: Organization to scan
+        min_score: Minimum score to record (defaults to FARMER_DUPLICATE_MIN_SCORE)
+
+    Returns:
+        Dictionary of run statistics
+    """
+    if min_score is None:
+        min_score = settings.FARMER_DUPLICATE_MIN_SCORE
+
+    started_at = timezone.now()
+    farmer_ids, pairs, stats = find_candidate_pairs(organization_id)
+
+    recorded = 0
+    for batch in iter(lambda: list(islice(pairs, SCORING_BATCH_SIZE)), []):
+        needed = {farmer_ids[i] for pair in batch for i in pair}
+        rows = {
+            row['id']: row
+            for row in Farmer.objects.filter(pk__in=needed).values(*FARMER_FIELDS)
+        }
+
+        candidates = []
+        for i, j in batch:
+            a = rows.get(farmer_ids[i])
+            b = rows.get(farmer_ids[j])
+            if not a or not b:
+                continue
+            score, reasons, details = score_pair(a, b)
+            if score < min_score:
+                continue
+            candidates.append(FarmerDuplicateCandidate(
+                organization_id=organization_id,
+                farmer_a_id=a['id'],
+                farmer_b_id=b['id'],
+                score=score,
+                match_reasons=reasons,
+                details=details,
+            ))
+
+        FarmerDuplicateCandidate.objects.bulk_create(
+            candidates,
+            update_conflicts=True,
+            unique_fields=['farmer_a', 'farmer_b'],
+            update_fields=['score', 'match_reasons', 'details', 'updated_at'],
+        )
+        recorded += len(candidates)
+
+    removed, _ = FarmerDuplicateCandidate.objects.filter(
+        organization_id=organization_id,
+        status='pending',
+        updated_at__lt=started_at
+    ).delete()
+
+    stats.update({
+        'candidates': recorded,
+        'stale_removed': removed,
+        'duration_seconds': round((timezone.now() - started_at).total_seconds(), 2),
+    })
+    return stats
@@ -0,0 +1,129 @@
+"""
+Search helpers for farmers app.
+"""
+
+from django.db.models import Q
+from rest_framework.filters import SearchFilter
+
+from .phonetics import normalize_name, phonetic_key
+
+# Shorter terms produce phonetic keys that match too many names
+MIN_PHONETIC_TERM_LENGTH = 3
+
+
+def phonetic_name_q(text):
+    """
+    Build a Q matching farmers whose stored phonetic name keys match text.
+
+    A single word matches either first or last name; two or more words are
+    treated as first and last name in either order ("Kwami Oseyi" finds
+    "Kwame Osei" and "Osei Kwame").
+
+    Returns:
+        Q object, or None if text has no usable name terms
+    """
+    terms = [
+        term for term in normalize_name(text).split()
+        if len(term) >= MIN_PHONETIC_TERM_LENGTH
+    ]
+    keys = [key for key in (phonetic_key(term) for term in terms) if key]
+    if not keys:
+        return None
+
+    if len(keys) == 1:
+        return Q(first_name_phonetic=keys[0]) | Q(last_name_phonetic=keys[0])
+
+    first, last = keys[0], keys[-1]
+    return (
+        Q(first_name_phonetic=first, last_name_phonetic=last) |
+        Q(first_name_phonetic=last, last_name_phonetic=first)
+    )
+
+
+def name_prefix_q(text):
+    """
+    Build a Q matching farmers whose stored normalized names start with
+    every word of text (each word may match the first or last name).
+
+    Prefix lookups on the normalized keys use the varchar_pattern_ops
+    indexes, unlike icontains on the raw name columns.
+
+    Returns:
+        Q object, or None if text has no name terms
+    """
+    words = normalize_name(text).split()
+    if not words:
+        return None
+
+    q = Q()
+    for word in words:
+        q &= Q(first_name_normalized__startswith=word) | Q(last_name_normalized__startswith=word)
+    return q
+
+
+def name_match_q(first_name, last_name):
+    """
+    Build a Q matching farmers with the same name as first_name/last_name,
+    by normalized spelling or by sound, in either order.
+    """
+    first_norm = normalize_name(first_name)
+    last_norm = normalize_name(last_name)
+    first_key = phonetic_key(first_name)
+    last_key = phonetic_key(last_name)
+
+    q = (
+        Q(first_name_normalized=first_norm, last_name_normalized=last_norm) |
+        Q(first_name_normalized=last_norm, last_name_normalized=first_norm)
+    )
+    if first_key and last_key:
+        q |= (
+            Q(first_name_phonetic=first_key, last_name_phonetic=last_key) |
+            Q(first_name_phonetic=last_key, last_name_phonetic=first_key)
+        )
+    return q
+
+
+class FarmerNameSearchFilter(SearchFilter):
+    """
+    Farmer search: name prefixes on the normalized name keys, the view's
+    search_fields for IDs and phone numbers, plus farmers whose names sound
+    like the search text, so "Kwami" finds "Kwame".
+
+    search_fields accept DRF's "^" (starts with) and "=" (exact) prefixes;
+    fields without a prefix use icontains.
+    """
+
+    lookup_prefixes = {
+        '^': 'istartswith',
+        '=': 'iexact',
+    }
+
+    def field_lookup(self, field):
+        lookup = self.lookup_prefixes.get(field[0])
+        if lookup:
+            return f'{field[1:]}__{lookup}'
+        return f'{field}__icontains'
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+
+        lookups = [self.field_lookup(field) for field in self.get_search_fields(view, request) or []]
+
+        # Every term must match a name prefix or one of the search fields
+        terms_q = Q()
+        for term in search_terms:
+            term_q = Q()
+            for lookup in lookups:
+                term_q |= Q(**{lookup: term})
+            name_q = name_prefix_q(term)
+            if name_q is not None:
+                term_q |= name_q
+            terms_q &= term_q
+
+        phonetic_q = phonetic_name_q(' '.join(search_terms))
+        if phonetic_q is not None:
+            terms_q |= phonetic_q
+
+        return queryset.filter(terms_q)
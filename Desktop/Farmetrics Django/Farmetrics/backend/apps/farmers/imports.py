@@ -0,0 +1,534 @@
+"""
+Bulk import of farmers and farms from CSV, XLSX or GeoJSON files.
+
+Rows are streamed from the uploaded file and processed in chunks: each chunk
+is validated, farmer IDs and farm codes are generated in bulk, and the
+records are written with bulk_create inside one transaction per chunk.
+Invalid rows are skipped and reported per row on the ImportJob.
+
+Columns (CSV/XLSX headers or GeoJSON feature properties):
+    Farmer: first_name, last_name, phone_number (required for new farmers),
+        middle_name, alternate_phone, email, national_id, national_id_type,
+        date_of_birth, gender, address, community, region_code,
+        years_of_experience, primary_crop, notes
+    Farmer reference: farmer_id attaches the row's farm to an existing
+        farmer; rows sharing a farmer_ref create one farmer with many farms
+    Farm (created when farm_name is set): farm_name, farm_latitude,
+        farm_longitude, farm_region_code, farm_crop_type, farm_soil_type,
+        farm_tree_count, farm_planting_date, farm_description. For GeoJSON
+        the feature geometry is used as the farm boundary or location.
+
+CSV and XLSX files are streamed row by row. GeoJSON is a single document,
+so it is parsed into memory once per import; its size is capped by
+FARMER_IMPORT_MAX_GEOJSON_SIZE (parsed JSON takes several times the file
+size in memory), and larger datasets should be uploaded as CSV.
+"""
+
+import csv
+import io
+import json
+import logging
+from datetime import date, datetime
+
+from django.conf import settings
+from django.contrib.gis.geos import GEOSException, GEOSGeometry, MultiPolygon, Point
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.farms.counters import recompute_farmer_counters
+
+from .models import Farmer, ImportJob
+
+logger = logging.getLogger(__name__)
+
+GENDER_VALUES = {
+    'm': 'M', 'male': 'M',
+    'f': 'F', 'female': 'F',
+    'o': 'O', 'other': 'O',
+    'n': 'N', 'prefer not to say': 'N',
+}
+DATE_FORMATS = ['%d/%m/%Y', '%d-%m-%Y', '%Y/%m/%d']
+REQUIRED_FARMER_FIELDS = ['first_name', 'last_name', 'phone_number']
+
+
+class ImportFileError(Exception):
+    """Raised when an import file cannot be read at all."""
+
+
+def detect_format(file_name):
+    """File format from the file extension, or None if unsupported."""
+    extension = file_name.rsplit('.', 1)[-1].lower() if '.' in file_name else ''
+    if extension in ('json', 'geojson'):
+        return 'geojson'
+    if extension in ('csv', 'xlsx'):
+        return extension
+    return None
+
+
+def _normalize_header(value):
+    return str(value or '').strip().lower().replace(' ', '_')
+
+
+def _iter_csv(f):
+    reader = csv.reader(io.TextIOWrapper(f, encoding='utf-8-sig', newline=''))
+    header = [_normalize_header(column) for column in next(reader, [])]
+    for row_number, values in enumerate(reader, start=2):
+        if any(value.strip() for value in values):
+            yield row_number, dict(zip(header, values))
+
+
+def _iter_xlsx(f):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError("XLSX imports require openpyxl")
+
+    try:
+        workbook = load_workbook(f, read_only=True, data_only=True)
+    except Exception as e:
+        raise ImportFileError(f"Unable to read XLSX file: {e}")
+
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [_normalize_header(column) for column in next(rows, ())]
+        for row_number, values in enumerate(rows, start=2):
+            if any(value not in (None, '') for value in values):
+                yield row_number, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def _iter_geojson(f):
+    if f.size > settings.FARMER_IMPORT_MAX_GEOJSON_SIZE:
+        raise ImportFileError(
+            f"GeoJSON files are limited to {settings.FARMER_IMPORT_MAX_GEOJSON_SIZE} bytes; "
+            "upload larger datasets as CSV"
+        )
+    try:
+        data = json.load(f)
+    except ValueError as e:
+        raise ImportFileError(f"Invalid GeoJSON: {e}")
+
+    if data.get('type') == 'Feature':
+        features = [data]
+    elif data.get('type') == 'FeatureCollection':
+        features = data.get('features') or []
+    else:
+        raise ImportFileError("GeoJSON must be a Feature or FeatureCollection")
+
+    for row_number, feature in enumerate(features, start=1):
+        row = {_normalize_header(key): value for key, value in (feature.get('properties') or {}).items()}
+        row['_geometry'] = feature.get('geometry')
+        yield row_number, row
+
+
+READERS = {
+    'csv': _iter_csv,
+    'xlsx': _iter_xlsx,
+    'geojson': _iter_geojson,
+}
+
+
+def iter_rows(job):
+    """
+    Stream (row_number, row dict) tuples from an import job's file.
+
+    Raises:
+        ImportFileError: If the file cannot be parsed
+    """
+    with job.file.open('rb') as f:
+        try:
+            yield from READERS[job.file_format](f)
+        except (csv.Error, UnicodeDecodeError) as e:
+            raise ImportFileError(f"Unable to read file: {e}")
+
+
+def _text(row, key):
+    value = row.get(key)
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheet cells store phone numbers and IDs as numbers
+        value = int(value)
+    return str(value).strip()
+
+
+def _parse_row_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    parsed = None
+    try:
+        parsed = parse_date(text)
+    except ValueError:
+        pass
+    if parsed:
+        return parsed
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    raise ValueError("Invalid date")
+
+
+def _parse_phone(value):
+    from phonenumber_field.phonenumber import to_python
+
+    phone = to_python(value, region=settings.PHONENUMBER_DEFAULT_REGION)
+    if not phone or not phone.is_valid():
+        raise ValueError("Invalid phone number")
+    return phone
+
+
+class ImportContext:
+    """State shared by the chunks of one import run."""
+
+    def __init__(self, job):
+        from apps.regions.models import Region
+
+        self.job = job
+        self.organization = job.organization
+        self.regions = {
+            code.upper(): region_id
+            for code, region_id in Region.objects.filter(
+                organization=self.organization
+            ).values_list('code', 'id')
+        }
+        self.point_regions = {}
+        # farmer_ref -> Farmer ID of the farmer created for it
+        self.farmer_refs = {}
+        self.errors = []
+        self.error_count = 0
+        self.processed_rows = 0
+        self.farmers_created = 0
+        self.farms_created = 0
+
+    def add_error(self, row_number, field, message):
+        self.error_count += 1
+        if len(self.errors) < settings.FARMER_IMPORT_MAX_ERRORS:
+            self.errors.append({'row': row_number, 'field': field, 'message': message})
+
+    def region_for_code(self, code):
+        return self.regions.get(code.upper())
+
+    def region_for_point(self, point):
+        """Most specific active region containing the point (cached per ~100 m cell)."""
+        from apps.regions.models import Region
+
+        key = (round(point.x, 3), round(point.y, 3))
+        if key not in self.point_regions:
+            self.point_regions[key] = Region.objects.filter(
+                organization=self.organization,
+                is_active=True,
+                polygon__contains=point
+            ).order_by('-level').values_list('id', flat=True).first()
+        return self.point_regions[key]
+
+
+def _validate_farmer(row, context, errors):
+    data = {}
+    for field in REQUIRED_FARMER_FIELDS:
+        if not _text(row, field):
+            errors.append((field, "This field is required."))
+
+    for field in ('first_name', 'middle_name', 'last_name', 'community', 'primary_crop'):
+        value = _text(row, field)
+        if len(value) > Farmer._meta.get_field(field).max_length:
+            errors.append((field, "Value is too long."))
+        elif value:
+            data[field] = value
+
+    for field in ('address', 'notes'):
+        if _text(row, field):
+            data[field] = _text(row, field)
+
+    for field in ('phone_number', 'alternate_phone'):
+        if _text(row, field):
+            try:
+                data[field] = _parse_phone(_text(row, field))
+            except ValueError as e:
+                errors.append((field, str(e)))
+
+    if _text(row, 'email'):
+        try:
+            validate_email(_text(row, 'email'))
+            data['email'] = _text(row, 'email')
+        except ValidationError:
+            errors.append(('email', "Invalid email address"))
+
+    if _text(row, 'national_id'):
+        data['national_id'] = _text(row, 'national_id')[:50]
+    if _text(row, 'national_id_type'):
+        national_id_type = _text(row, 'national_id_type').lower()
+        valid_types = [choice for choice, _ in Farmer._meta.get_field('national_id_type').choices]
+        if national_id_type in valid_types:
+            data['national_id_type'] = national_id_type
+        else:
+            errors.append(('national_id_type', f"Must be one of: {', '.join(valid_types)}"))
+
+    if _text(row, 'gender'):
+        gender = GENDER_VALUES.get(_text(row, 'gender').lower())
+        if gender:
+            data['gender'] = gender
+        else:
+            errors.append(('gender', "Must be M, F, O or N"))
+
+    if row.get('date_of_birth') not in (None, ''):
+        try:
+            data['date_of_birth'] = _parse_row_date(row['date_of_birth'])
+        except ValueError as e:
+            errors.append(('date_of_birth', str(e)))
+
+    if _text(row, 'years_of_experience'):
+        try:
+            data['years_of_experience'] = int(_text(row, 'years_of_experience'))
+        except ValueError:
+            errors.append(('years_of_experience', "Must be a whole number"))
+
+    if _text(row, 'region_code'):
+        region_id = context.region_for_code(_text(row, 'region_code'))
+        if region_id:
+            data['region_id'] = region_id
+        else:
+            errors.append(('region_code', "Unknown region code"))
+
+    return data
+
+
+def _validate_farm(row, context, errors):
+    from apps.farms.models import Farm
+
+    data = {'name': _text(row, 'farm_name')[:200]}
+
+    if _text(row, 'farm_description'):
+        data['description'] = _text(row, 'farm_description')
+    if _text(row, 'farm_crop_type'):
+        data['crop_type'] = _text(row, 'farm_crop_type')[:100]
+
+    if _text(row, 'farm_soil_type'):
+        soil_type = _text(row, 'farm_soil_type').lower()
+        if soil_type in dict(Farm.SOIL_TYPE_CHOICES):
+            data['soil_type'] = soil_type
+        else:
+            errors.append(('farm_soil_type', "Unknown soil type"))
+
+    if _text(row, 'farm_tree_count'):
+        try:
+            data['tree_count_estimate'] = int(_text(row, 'farm_tree_count'))
+            if data['tree_count_estimate'] < 0:
+                raise ValueError
+        except ValueError:
+            errors.append(('farm_tree_count', "Must be a positive whole number"))
+
+    if row.get('farm_planting_date') not in (None, ''):
+        try:
+            data['planting_date'] = _parse_row_date(row['farm_planting_date'])
+        except ValueError as e:
+            errors.append(('farm_planting_date', str(e)))
+
+    # Location from explicit coordinates, else from the GeoJSON geometry
+    if _text(row, 'farm_latitude') or _text(row, 'farm_longitude'):
+        try:
+            latitude = float(_text(row, 'farm_latitude'))
+            longitude = float(_text(row, 'farm_longitude'))
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                raise ValueError
+            data['primary_location'] = Point(longitude, latitude, srid=4326)
+        except ValueError:
+            errors.append(('farm_latitude', "Invalid coordinates"))
+
+    geometry = row.get('_geometry')
+    if geometry:
+        try:
+            geom = GEOSGeometry(json.dumps(geometry), srid=4326)
+        except (GEOSException, ValueError, TypeError):
+            geom = None
+        if geom is None or not geom.valid:
+            errors.append(('geometry', "Invalid geometry"))
+        elif geom.geom_type == 'Point':
+            data.setdefault('primary_location', geom)
+        elif geom.geom_type in ('Polygon', 'MultiPolygon'):
+            data['polygon'] = MultiPolygon(geom, srid=4326) if geom.geom_type == 'Polygon' else geom
+            data.setdefault('primary_location', geom.point_on_surface)
+        else:
+            errors.append(('geometry', "Geometry must be a Point, Polygon or MultiPolygon"))
+
+    if 'primary_location' not in data and not any(field == 'farm_latitude' for field, _ in errors):
+        errors.append(('farm_latitude', "Farm location is required (coordinates or geometry)."))
+
+    if _text(row, 'farm_region_code'):
+        region_id = context.region_for_code(_text(row, 'farm_region_code'))
+        if region_id:
+            data['region_id'] = region_id
+        else:
+            errors.append(('farm_region_code', "Unknown region code"))
+    elif 'primary_location' in data:
+        data['region_id'] = context.region_for_point(data['primary_location'])
+
+    return data
+
+
+def process_chunk(context, chunk):
+    """
+    Validate and import one chunk of (row_number, row) tuples.
+    """
+    from apps.farms.models import Farm
+
+    job = context.job
+    organization = context.organization
+
+    existing_ids = {_text(row, 'farmer_id') for _, row in chunk if _text(row, 'farmer_id')}
+    existing = dict(
+        Farmer.objects.filter(
+            organization=organization, farmer_id__in=existing_ids
+        ).values_list('farmer_id', 'id')
+    ) if existing_ids else {}
+
+    new_farmers = []
+    farm_rows = []
+    chunk_refs = {}
+
+    for row_number, row in chunk:
+        errors = []
+        farmer_id = _text(row, 'farmer_id')
+        farmer_ref = _text(row, 'farmer_ref')
+        owner = None
+
+        if farmer_id:
+            owner = existing.get(farmer_id)
+            if not owner:
+                errors.append(('farmer_id', "Farmer not found"))
+        elif farmer_ref and (farmer_ref in context.farmer_refs or farmer_ref in chunk_refs):
+            owner = chunk_refs.get(farmer_ref) or context.farmer_refs[farmer_ref]
+
+        farmer_data = None
+        if not owner and not errors:
+            farmer_data = _validate_farmer(row, context, errors)
+
+        farm_data = None
+        if _text(row, 'farm_name'):
+            farm_data = _validate_farm(row, context, errors)
+        elif owner:
+            errors.append(('farm_name', "This field is required when referencing an existing farmer."))
+
+        if errors:
+            for field, message in errors:
+                context.add_error(row_number, field, message)
+            continue
+
+        if farmer_data is not None:
+            if farm_data and 'region_id' not in farmer_data and farm_data.get('region_id'):
+                farmer_data['region_id'] = farm_data['region_id']
+            owner = Farmer(
+                organization=organization,
+                created_by=job.created_by,
+                **farmer_data
+            )
+            new_farmers.append(owner)
+            if farmer_ref:
+                chunk_refs[farmer_ref] = owner
+
+        if farm_data:
+            farm_rows.append((owner, farm_data))
+
+    context.processed_rows += len(chunk)
+    if job.dry_run:
+        for farmer_ref, farmer in chunk_refs.items():
+            context.farmer_refs[farmer_ref] = farmer.pk
+        context.farmers_created += len(new_farmers)
+        context.farms_created += len(farm_rows)
+        return
+
+    with transaction.atomic():
+        farmer_ids = Farmer.generate_farmer_ids(organization, len(new_farmers))
+        for farmer, generated_id in zip(new_farmers, farmer_ids):
+            farmer.farmer_id = generated_id
+            farmer.update_name_keys()
+        Farmer.objects.bulk_create(new_farmers)
+
+        farms = []
+        farm_codes = Farm.generate_farm_codes(len(farm_rows))
+        for (owner, farm_data), farm_code in zip(farm_rows, farm_codes):
+            farm = Farm(
+                organization=organization,
+                farm_code=farm_code,
+                created_by=job.created_by,
+                **farm_data
+            )
+            if isinstance(owner, Farmer):
+                farm.owner = owner
+            else:
+                farm.owner_id = owner
+            farm.compute_derived_fields()
+            farms.append(farm)
+        Farm.objects.bulk_create(farms)
+
+        # bulk_create bypasses Farm.save, so rebuild the owners' farm counters
+        recompute_farmer_counters({farm.owner_id for farm in farms})
+
+    for farmer_ref, farmer in chunk_refs.items():
+        context.farmer_refs[farmer_ref] = farmer.pk
+    context.farmers_created += len(new_farmers)
+    context.farms_created += len(farms)
+
+
+def _save_progress(context, **extra):
+    ImportJob.objects.filter(pk=context.job.pk).update(
+        processed_rows=context.processed_rows,
+        farmers_created=context.farmers_created,
+        farms_created=context.farms_created,
+        error_count=context.error_count,
+        errors=context.errors,
+        updated_at=timezone.now(),
+        **extra
+    )
+
+
+def run_import(job):
+    """
+    Run an import job to completion, updating its progress after every chunk.
+
+    Chunks already written stay committed if a later chunk fails.
+    """
+    chunk_size = settings.FARMER_IMPORT_CHUNK_SIZE
+    context = ImportContext(job)
+
+    try:
+        if job.file_format == 'geojson':
+            # The document is held in memory anyway; parse it once
+            rows = list(iter_rows(job))
+            total_rows = len(rows)
+        else:
+            # Streamed formats are counted in a cheap first pass
+            rows = iter_rows(job)
+            total_rows = sum(1 for _ in iter_rows(job))
+        ImportJob.objects.filter(pk=job.pk).update(
+            status='running',
+            total_rows=total_rows,
+            started_at=timezone.now()
+        )
+
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                process_chunk(context, chunk)
+                _save_progress(context)
+                chunk = []
+        if chunk:
+            process_chunk(context, chunk)
+    except ImportFileError as e:
+        _save_progress(context, status='failed', error_message=str(e), completed_at=timezone.now())
+        return
+    except Exception as e:
+        logger.exception(f"Import job {job.pk} failed")
+        _save_progress(context, status='failed', error_message=str(e), completed_at=timezone.now())
+        raise
+
+    _save_progress(context, status='completed', completed_at=timezone.now())
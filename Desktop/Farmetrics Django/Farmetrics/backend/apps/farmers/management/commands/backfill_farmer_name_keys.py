@@ -0,0 +1,76 @@
+"""
+Management command to populate normalized and phonetic name keys for farmers.
+
+Keys are recomputed for every farmer and only rows whose keys changed are
+written, so the command is safe to re-run after the phonetic rules change.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.farmers.models import Farmer
+from apps.farmers.phonetics import name_keys
+from apps.organizations.models import Organization
+
+
+class Command(BaseCommand):
+    help = 'Populate normalized/phonetic name keys used by farmer search and duplicate detection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization',
+            type=str,
+            help='Organization slug (defaults to all organizations)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Number of records written per batch (default: 2000)'
+        )
+
+    def handle(self, *args, **options):
+        # Include soft-deleted farmers so restored records are searchable
+        queryset = Farmer.all_objects.all()
+
+        org_slug = options.get('organization')
+        if org_slug:
+            try:
+                organization = Organization.objects.get(slug=org_slug)
+            except Organization.DoesNotExist:
+                self.stdout.write(self.style.ERROR(f'Organization with slug "{org_slug}" not found'))
+                return
+            queryset = queryset.filter(organization=organization)
+
+        batch_size = options['batch_size']
+        started = time.monotonic()
+        scanned = 0
+        updated = 0
+        batch = []
+
+        queryset = queryset.only('id', 'first_name', 'last_name', *Farmer.NAME_KEY_FIELDS)
+        for farmer in queryset.order_by('pk').iterator(chunk_size=batch_size):
+            scanned += 1
+            keys = name_keys(farmer.first_name, farmer.last_name)
+            if all(getattr(farmer, field) == value for field, value in keys.items()):
+                continue
+
+            for field, value in keys.items():
+                setattr(farmer, field, value)
+            batch.append(farmer)
+
+            if len(batch) >= batch_size:
+                Farmer.all_objects.bulk_update(batch, Farmer.NAME_KEY_FIELDS)
+                updated += len(batch)
+                batch = []
+                self.stdout.write(f'  {scanned} scanned, {updated} updated...')
+
+        if batch:
+            Farmer.all_objects.bulk_update(batch, Farmer.NAME_KEY_FIELDS)
+            updated += len(batch)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Updated name keys for {updated} of {scanned} farmer(s) in {elapsed:.1f}s'
+        ))
@@ -0,0 +1,259 @@
+"""
+Farmer merge engine.
+
+Merging moves everything that references the duplicate farmer (farms,
+visits, media, requests, notifications, ...) onto the primary farmer. The
+referencing foreign keys are discovered from model meta, so new models that
+point at Farmer are handled without changes here. Each merge runs in a
+single transaction with the involved farmer rows locked, and related rows
+are re-pointed with one UPDATE per relation.
+"""
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.farms.counters import recompute_farmer_counters
+
+from .models import Farmer, FarmerDuplicateCandidate, FarmerMergeHistory
+
+# Profile fields copied from a duplicate when blank on the primary farmer
+FILL_FIELDS = [
+    'middle_name', 'alternate_phone', 'email', 'national_id', 'national_id_type',
+    'date_of_birth', 'gender', 'address', 'region', 'community', 'gps_coordinates',
+    'years_of_experience', 'profile_photo',
+]
+
+MAX_BATCH_MERGES = 500
+
+
+class MergeError(Exception):
+    """Raised when a merge request cannot be applied."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def resolve_merge_groups(pairs):
+    """
+    Resolve (primary_id, duplicate_id) pairs into merge groups.
+
+    Chains are followed to their final primary, so [(A, B), (B, C)] merges
+    both B and C into A.
+
+    Returns:
+        Dictionary mapping primary ID to a list of duplicate IDs
+
+    Raises:
+        MergeError: If a farmer is merged into two different farmers or the
+            pairs form a cycle
+    """
+    parent = {}
+    for primary_id, duplicate_id in pairs:
+        if primary_id == duplicate_id:
+            raise MergeError("Cannot merge a farmer with itself")
+        if parent.get(duplicate_id, primary_id) != primary_id:
+            raise MergeError(f"Farmer {duplicate_id} is merged into more than one farmer")
+        parent[duplicate_id] = primary_id
+
+    groups = {}
+    for duplicate_id in parent:
+        root = duplicate_id
+        seen = set()
+        while root in parent:
+            if root in seen:
+                raise MergeError("Merge pairs contain a cycle")
+            seen.add(root)
+            root = parent[root]
+        groups.setdefault(root, []).append(duplicate_id)
+
+    return groups
+
+
+def farmer_relations():
+    """
+    Foreign keys pointing at Farmer, as (model, field name) tuples.
+
+    Duplicate candidates are excluded; merge_farmers resolves them
+    separately since re-pointing could pair a farmer with itself.
+    """
+    relations = []
+    for relation in Farmer._meta.related_objects:
+        if not (relation.one_to_many or relation.one_to_one):
+            continue
+        if relation.related_model is FarmerDuplicateCandidate:
+            continue
+        relations.append((relation.related_model, relation.field.name))
+    return relations
+
+
+def snapshot_farmer(farmer):
+    """Serializable snapshot of every concrete field of a farmer."""
+    return {
+        field.attname: field.value_to_string(farmer)
+        for field in Farmer._meta.concrete_fields
+    }
+
+
+def _fill_profile(primary, duplicate):
+    """Copy profile data from the duplicate where the primary is blank."""
+    changed = []
+    for field_name in FILL_FIELDS:
+        field = Farmer._meta.get_field(field_name)
+        if not getattr(primary, field.attname) and getattr(duplicate, field.attname):
+            setattr(primary, field.attname, getattr(duplicate, field.attname))
+            changed.append(field_name)
+
+    # Keep the duplicate's phone reachable
+    if (duplicate.phone_number and duplicate.phone_number != primary.phone_number
+            and not primary.alternate_phone):
+        primary.alternate_phone = duplicate.phone_number
+        changed.append('alternate_phone')
+
+    crops = list(primary.secondary_crops or [])
+    for crop in duplicate.secondary_crops or []:
+        if crop not in crops and crop != primary.primary_crop:
+            crops.append(crop)
+    if crops != (primary.secondary_crops or []):
+        primary.secondary_crops = crops
+        changed.append('secondary_crops')
+
+    documents = list(primary.documents or [])
+    for document in duplicate.documents or []:
+        if document not in documents:
+            documents.append(document)
+    if documents != (primary.documents or []):
+        primary.documents = documents
+        changed.append('documents')
+
+    return changed
+
+
+def _resolve_candidates(primary, duplicate_ids, user):
+    """Close candidates within the merged group and drop the duplicates' others."""
+    group_ids = [primary.pk, *duplicate_ids]
+    involving_duplicates = (
+        Q(farmer_a_id__in=duplicate_ids) | Q(farmer_b_id__in=duplicate_ids)
+    )
+    within_group = Q(farmer_a_id__in=group_ids, farmer_b_id__in=group_ids)
+
+    FarmerDuplicateCandidate.objects.filter(within_group).update(
+        status='merged',
+        reviewed_by=user,
+        reviewed_at=timezone.now(),
+        updated_at=timezone.now()
+    )
+    # Pairs between a duplicate and an unrelated farmer are re-detected
+    # against the primary on the next scan
+    FarmerDuplicateCandidate.objects.filter(involving_duplicates).exclude(within_group).delete()
+
+
+def _merge_group(primary, duplicates, user, reason, relations):
+    duplicate_ids = [duplicate.pk for duplicate in duplicates]
+
+    snapshots = {}
+    for duplicate in duplicates:
+        snapshot = snapshot_farmer(duplicate)
+        snapshot['moved_records'] = {}
+        snapshots[duplicate.pk] = snapshot
+
+    # Count per duplicate first, then re-point with one UPDATE per relation
+    for model, field_name in relations:
+        manager = model._base_manager
+        rows = manager.filter(**{f'{field_name}__in': duplicate_ids})
+        label = model._meta.label
+        counts = {}
+        for duplicate_id in rows.values_list(field_name, flat=True).iterator():
+            counts[duplicate_id] = counts.get(duplicate_id, 0) + 1
+        if not counts:
+            continue
+        for duplicate_id, count in counts.items():
+            snapshots[duplicate_id]['moved_records'][label] = count
+        rows.update(**{field_name: primary})
+
+    _resolve_candidates(primary, duplicate_ids, user)
+
+    # Farms were moved with queryset updates, so rebuild the farm counters
+    recompute_farmer_counters([primary.pk, *duplicate_ids])
+    primary.refresh_from_db(fields=['farm_count', 'total_area_m2'])
+
+    changed = []
+    for duplicate in duplicates:
+        changed.extend(_fill_profile(primary, duplicate))
+    if changed:
+        primary.last_updated_by = user
+        primary.save()
+
+    histories = FarmerMergeHistory.objects.bulk_create([
+        FarmerMergeHistory(
+            organization_id=primary.organization_id,
+            primary_farmer=primary,
+            merged_farmer_id=duplicate.farmer_id,
+            merged_farmer_data=snapshots[duplicate.pk],
+            merged_by=user,
+            merge_reason=reason
+        )
+        for duplicate in duplicates
+    ])
+
+    # Soft delete duplicates
+    Farmer.all_objects.filter(pk__in=duplicate_ids).update(deleted_at=timezone.now())
+    return histories
+
+
+def merge_farmers(pairs, user, reason, organization=None):
+    """
+    Merge duplicate farmers into their primary farmers in one transaction.
+
+    Args:
+        pairs: Iterable of (primary_farmer_id, duplicate_farmer_id) tuples
+        user: User performing the merge
+        reason: Merge reason recorded in FarmerMergeHistory
+        organization: If given, all farmers must belong to it
+
+    Returns:
+        (primary farmers keyed by ID, list of FarmerMergeHistory records)
+
+    Raises:
+        MergeError: If the pairs are invalid or farmers are missing,
+            already merged or in different organizations
+    """
+    pairs = list(pairs)
+    if len(pairs) > MAX_BATCH_MERGES:
+        raise MergeError(f"At most {MAX_BATCH_MERGES} merges are allowed per request")
+
+    groups = resolve_merge_groups(pairs)
+    farmer_ids = set(groups)
+    for duplicate_ids in groups.values():
+        farmer_ids.update(duplicate_ids)
+
+    relations = farmer_relations()
+
+    with transaction.atomic():
+        # Lock in a stable order so concurrent merges cannot deadlock
+        farmers = {
+            farmer.pk: farmer
+            for farmer in Farmer.objects.select_for_update().filter(
+                pk__in=farmer_ids
+            ).order_by('pk')
+        }
+        if len(farmers) != len(farmer_ids):
+            raise MergeError("One or more farmers not found", status_code=404)
+
+        organization_ids = {farmer.organization_id for farmer in farmers.values()}
+        if len(organization_ids) > 1 or (
+            organization and organization.pk not in organization_ids
+        ):
+            raise MergeError("Farmers must belong to the same organization")
+
+        histories = []
+        primaries = {}
+        for primary_id, duplicate_ids in groups.items():
+            primary = farmers[primary_id]
+            duplicates = [farmers[duplicate_id] for duplicate_id in duplicate_ids]
+            histories.extend(_merge_group(primary, duplicates, user, reason, relations))
+            primaries[primary_id] = primary
+
+    return primaries, histories
@@ -5,7 +5,56 @@ Farmer models for managing farmer records and profiles.
 from django.db import models
 from django.core.validators import RegexValidator
 from phonenumber_field.modelfields import PhoneNumberField
-from apps.core.models import TimeStampedModel, SoftDeleteModel
+from apps.core.models import TimeStampedModel, SoftDeleteModel, SoftDeleteManager, SoftDeleteQuerySet
+
+
+class FarmerQuerySet(SoftDeleteQuerySet):
+    """QuerySet for farmers with farm statistics computed from farm rows."""
+    
+    @staticmethod
+    def farm_stats_expressions():
+        """
+        Farm count and total farm area computed from non-deleted farms, as
+        correlated subqueries keyed by {counter field: expression}.
+        """
+        from django.db.models import Count, DecimalField, IntegerField, OuterRef, Subquery, Sum, Value
+        from django.db.models.functions import Coalesce
+        from apps.farms.models import Farm
+        
+        farms = Farm.objects.filter(owner=OuterRef('pk')).order_by().values('owner')
+        return {
+            'farm_count': Coalesce(
+                Subquery(farms.annotate(count=Count('pk')).values('count'), output_field=IntegerField()),
+                Value(0)
+            ),
+            'total_area_m2': Coalesce(
+                Subquery(farms.annotate(area=Sum('area_m2')).values('area')),
+                Value(0),
+                output_field=DecimalField(max_digits=15, decimal_places=2)
+            ),
+        }
+    
+    def with_farm_stats(self):
+        """
+        Annotate farm count and total farm area computed from farm rows
+        (annotated_farm_count, annotated_farm_area), e.g. to check the
+        stored counters.
+        """
+        expressions = self.farm_stats_expressions()
+        return self.annotate(
+            annotated_farm_count=expressions['farm_count'],
+            annotated_farm_area=expressions['total_area_m2'],
+        )
+    
+    def recompute_farm_stats(self):
+        """Rewrite farm_count/total_area_m2 from farm rows. Returns rows updated."""
+        return self.update(**self.farm_stats_expressions())
+
+
+class FarmerManager(SoftDeleteManager):
+    """Soft delete manager returning FarmerQuerySet."""
+    
+    queryset_class = FarmerQuerySet
 
 
 class Farmer(SoftDeleteModel):
@@ -27,6 +76,17 @@ class Farmer(SoftDeleteModel):
         ('N', 'Prefer not to say'),
     ]
     
+    NAME_KEY_FIELDS = [
+        'first_name_normalized', 'last_name_normalized',
+        'first_name_phonetic', 'last_name_phonetic',
+    ]
+    
+    # Maintained with F() updates; never written back by a full save
+    COUNTER_FIELDS = ['farm_count', 'total_area_m2']
+    
+    objects = FarmerManager()
+    all_objects = models.Manager()  # Access all objects including deleted
+    
     organization = models.ForeignKey(
         'organizations.Organization',
         on_delete=models.CASCADE,
@@ -43,6 +103,12 @@ class Farmer(SoftDeleteModel):
     middle_name = models.CharField(max_length=100, blank=True)
     last_name = models.CharField(max_length=100, db_index=True)
     
+    # Name keys for search and duplicate detection (maintained on save)
+    first_name_normalized = models.CharField(max_length=100, blank=True, editable=False)
+    last_name_normalized = models.CharField(max_length=100, blank=True, editable=False)
+    first_name_phonetic = models.CharField(max_length=20, blank=True, editable=False)
+    last_name_phonetic = models.CharField(max_length=20, blank=True, editable=False)
+    
     # Contact Information
     phone_number = PhoneNumberField(help_text="Primary phone number")
     alternate_phone = PhoneNumberField(blank=True, null=True)
@@ -158,6 +224,16 @@ class Farmer(SoftDeleteModel):
         help_text="Additional farmer metadata"
     )
     
+    # Denormalized farm statistics (maintained by Farm.save, see apps.farms.counters)
+    farm_count = models.IntegerField(default=0, editable=False, db_index=True)
+    total_area_m2 = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        default=0,
+        editable=False,
+        help_text="Total area of non-deleted farms in square meters"
+    )
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -166,6 +242,11 @@ class Farmer(SoftDeleteModel):
             models.Index(fields=['national_id']),
             models.Index(fields=['region']),
             models.Index(fields=['first_name', 'last_name']),
+            models.Index(fields=['organization', 'last_name_phonetic', 'first_name_phonetic']),
+            models.Index(fields=['organization', 'last_name_normalized', 'first_name_normalized']),
+            # Prefix (LIKE 'name%') lookups for name search
+            models.Index(fields=['first_name_normalized'], name='farmer_first_name_norm_idx', opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['last_name_normalized'], name='farmer_last_name_norm_idx', opclasses=['varchar_pattern_ops']),
         ]
     
     def __str__(self):
@@ -175,27 +256,37 @@ class Farmer(SoftDeleteModel):
         # Auto-generate farmer ID if not provided
         if not self.farmer_id:
             self.farmer_id = self.generate_farmer_id()
+        
+        self.update_name_keys()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'first_name', 'last_name'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | set(self.NAME_KEY_FIELDS)
+        elif update_fields is None and not self._state.adding:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        
         super().save(*args, **kwargs)
     
+    def update_name_keys(self):
+        """Recompute normalized and phonetic name keys from first/last name."""
+        from .phonetics import name_keys
+        for field, value in name_keys(self.first_name, self.last_name).items():
+            setattr(self, field, value)
+    
     def generate_farmer_id(self):
         """Generate unique farmer ID."""
-        import random
-        import string
-        from django.utils import timezone
-        
-        # Format: ORG-YEAR-RANDOM (e.g., FAR-2025-A1B2C3)
-        org_code = self.organization.slug[:3].upper()
-        year = timezone.now().year
-        random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+        from apps.core.codes import next_code
         
-        farmer_id = f"{org_code}-{year}-{random_part}"
-        
-        # Ensure uniqueness
-        while Farmer.objects.filter(farmer_id=farmer_id).exists():
-            random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-            farmer_id = f"{org_code}-{year}-{random_part}"
-        
-        return farmer_id
+        # Format: ORG-YEAR-SEQUENCE (e.g., FAR-2025-000001A)
+        return next_code(self.organization.slug[:3].upper())
+    
+    @classmethod
+    def generate_farmer_ids(cls, organization, count):
+        """Generate count unique farmer IDs for bulk creation."""
+        from apps.core.codes import allocate_codes
+        return allocate_codes(organization.slug[:3].upper(), count)
     
     def get_full_name(self):
         """Return full name of farmer."""
@@ -216,16 +307,12 @@ class Farmer(SoftDeleteModel):
     @property
     def total_farms(self):
         """Get total number of farms owned by this farmer."""
-        return self.farms.filter(deleted_at__isnull=True).count()
+        return self.farm_count
     
     @property
     def total_farm_area(self):
         """Get total area of all farms in square meters."""
-        from django.db.models import Sum
-        result = self.farms.filter(deleted_at__isnull=True).aggregate(
-            total=Sum('area_m2')
-        )
-        return result['total'] or 0
+        return self.total_area_m2
 
 
 class FarmerMergeHistory(TimeStampedModel):
@@ -271,3 +358,151 @@ class FarmerMergeHistory(TimeStampedModel):
     def __str__(self):
         return f"Merged {self.merged_farmer_id} into {self.primary_farmer.farmer_id}"
 
+
+class FarmerDuplicateCandidate(TimeStampedModel):
+    """
+    Potential duplicate farmer pair found by the duplicate detection engine.
+    
+    Pairs are stored once with farmer_a < farmer_b (by id) and ranked by score.
+    """
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending Review'),
+        ('confirmed', 'Confirmed Duplicate'),
+        ('dismissed', 'Not a Duplicate'),
+        ('merged', 'Merged'),
+    ]
+    
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='farmer_duplicate_candidates'
+    )
+    farmer_a = models.ForeignKey(
+        Farmer,
+        on_delete=models.CASCADE,
+        related_name='duplicate_candidates_a'
+    )
+    farmer_b = models.ForeignKey(
+        Farmer,
+        on_delete=models.CASCADE,
+        related_name='duplicate_candidates_b'
+    )
+    
+    score = models.FloatField(
+        db_index=True,
+        help_text="Match score between 0 and 1"
+    )
+    match_reasons = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Matching signals, e.g. ['phone', 'name']"
+    )
+    details = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Per-signal similarity details"
+    )
+    
+    # Review
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending',
+        db_index=True
+    )
+    reviewed_by = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='reviewed_farmer_duplicates'
+    )
+    reviewed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-score', '-created_at']
+        unique_together = ['farmer_a', 'farmer_b']
+        indexes = [
+            models.Index(fields=['organization', 'status', '-score']),
+            models.Index(fields=['farmer_b']),
+        ]
+    
+    def __str__(self):
+        return f"{self.farmer_a_id} ~ {self.farmer_b_id} ({self.score:.2f})"
+
+
+class ImportJob(TimeStampedModel):
+    """
+    Background import of farmers and farms from a CSV, XLSX or GeoJSON file.
+    """
+    
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('xlsx', 'Excel (XLSX)'),
+        ('geojson', 'GeoJSON'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='import_jobs'
+    )
+    created_by = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='import_jobs'
+    )
+    
+    file = models.FileField(upload_to='imports/%Y/%m/')
+    file_name = models.CharField(max_length=255)
+    file_format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    dry_run = models.BooleanField(
+        default=False,
+        help_text="Validate rows only, without creating records"
+    )
+    
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending',
+        db_index=True
+    )
+    total_rows = models.IntegerField(default=0)
+    processed_rows = models.IntegerField(default=0)
+    farmers_created = models.IntegerField(default=0)
+    farms_created = models.IntegerField(default=0)
+    error_count = models.IntegerField(default=0)
+    errors = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Per-row errors: [{row, field, message}] (truncated)"
+    )
+    error_message = models.TextField(blank=True, help_text="Fatal error that stopped the job")
+    
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['organization', 'status']),
+        ]
+    
+    def __str__(self):
+        return f"Import {self.file_name} ({self.status})"
+    
+    @property
+    def progress(self):
+        """Percentage of rows processed."""
+        if not self.total_rows:
+            return 100 if self.status == 'completed' else 0
+        return round(self.processed_rows * 100 / self.total_rows, 1)
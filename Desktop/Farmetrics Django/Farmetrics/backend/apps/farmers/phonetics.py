@@ -0,0 +1,153 @@
+"""
+Name, phone and ID normalization plus fuzzy matching helpers for farmers.
+
+The phonetic key is tuned for how Ghanaian (Akan, Ewe, Ga) and Kenyan
+(Swahili, Kikuyu, Luo) names get transcribed. It keeps the start of the
+name as written (the leading consonant cluster, glides included, and the
+first vowel), so short names stay distinct ("Kwame"/"Kamau", "Yaw"/"Ama",
+"Owusu"/"Osei"). The rest is reduced to a consonant skeleton where vowels
+and glides are ignored ("Kwame"/"Kwami", "Osei"/"Oseyi", "Akua"/"Akwa").
+Equivalent spellings of the same sound are folded together
+("Kyei"/"Chei", "Gyasi"/"Jasi", "Philip"/"Filip"). Stored keys must be
+rebuilt with backfill_farmer_name_keys when these rules change.
+"""
+
+import re
+import unicodedata
+
+# Multi-letter spellings folded to a single sound, applied in order.
+# Upper-case letters are internal sound classes.
+PHONETIC_REWRITES = [
+    ('tch', 'C'),
+    ('ch', 'C'),
+    ('ky', 'C'),
+    ('tsh', 'C'),
+    ('sh', 'S'),
+    ('hy', 'S'),
+    ('gy', 'J'),
+    ('dj', 'J'),
+    ('dz', 'J'),
+    ('j', 'J'),
+    ('ph', 'f'),
+    ('ck', 'k'),
+    ('qu', 'k'),
+    ('q', 'k'),
+    ('c', 'k'),
+    ('x', 'ks'),
+    ('z', 's'),
+    ('v', 'f'),
+]
+
+VOWELS = set('aeiou')
+# Letters ignored after the first position
+SILENT_LETTERS = VOWELS | set('hwy')
+PHONETIC_KEY_LENGTH = 10
+
+
+def normalize_name(value):
+    """Lowercase, strip accents and keep only letters and single spaces."""
+    if not value:
+        return ''
+    value = unicodedata.normalize('NFKD', str(value))
+    value = ''.join(ch for ch in value if not unicodedata.combining(ch)).lower()
+    value = re.sub(r'[^a-z]+', ' ', value)
+    return ' '.join(value.split())
+
+
+def phonetic_key(value):
+    """
+    Compute the phonetic key of a name (multi-word values are joined).
+
+    Examples:
+        phonetic_key('Kwame') == phonetic_key('Kwami') == 'KWAM'
+        phonetic_key('Kamau') == 'KAM'
+        phonetic_key('Yaw') == phonetic_key('Yao') == 'YA'
+        phonetic_key('Osei') == phonetic_key('Oseyi') == 'OS'
+        phonetic_key('Owusu') == 'OWS'
+    """
+    name = normalize_name(value).replace(' ', '')
+    if not name:
+        return ''
+
+    for source, target in PHONETIC_REWRITES:
+        name = name.replace(source, target)
+
+    # Leading consonant cluster as written ("Kw", "Ny", "Y"), then the first
+    # vowel; a glide right after a leading vowel is kept too ("Owusu"/"Osei")
+    key = ''
+    index = 0
+    while index < len(name) and name[index] not in VOWELS:
+        code = name[index].upper()
+        if not key.endswith(code):
+            key += code
+        index += 1
+    if index < len(name):
+        key += name[index].upper()
+        index += 1
+        if index == 1 and index < len(name) and name[index] in 'wy':
+            key += name[index].upper()
+            index += 1
+
+    # Consonant skeleton of the rest
+    previous = ''
+    for ch in name[index:]:
+        if ch in SILENT_LETTERS:
+            previous = ''
+            continue
+        code = ch.upper()
+        if code != previous:
+            key += code
+        previous = code
+
+    return key[:PHONETIC_KEY_LENGTH]
+
+
+def name_keys(first_name, last_name):
+    """
+    Stored name keys for a farmer.
+
+    Returns:
+        Dictionary of Farmer name key field values
+    """
+    return {
+        'first_name_normalized': normalize_name(first_name)[:100],
+        'last_name_normalized': normalize_name(last_name)[:100],
+        'first_name_phonetic': phonetic_key(first_name),
+        'last_name_phonetic': phonetic_key(last_name),
+    }
+
+
+def normalize_phone(value):
+    """
+    Reduce a phone number to its last 9 digits (the national significant
+    number in Ghana and Kenya), so "+233 24 123 4567" and "0241234567" match.
+    """
+    if not value:
+        return ''
+    digits = re.sub(r'\D', '', str(value))
+    return digits[-9:] if len(digits) >= 9 else ''
+
+
+def normalize_national_id(value):
+    """Uppercase alphanumerics only ("GHA-123456789-0" -> "GHA1234567890")."""
+    if not value:
+        return ''
+    return re.sub(r'[^0-9A-Za-z]', '', str(value)).upper()
+
+
+def trigrams(value):
+    """Set of trigrams of a string, padded per word like PostgreSQL pg_trgm."""
+    result = set()
+    for word in normalize_name(value).split():
+        padded = f'  {word} '
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def trigram_similarity(a, b):
+    """Trigram similarity between two strings in [0, 1] (same as pg_trgm similarity())."""
+    trigrams_a = a if isinstance(a, set) else trigrams(a)
+    trigrams_b = b if isinstance(b, set) else trigrams(b)
+    if not trigrams_a or not trigrams_b:
+        return 0.0
+    return len(trigrams_a & trigrams_b) / len(trigrams_a | trigrams_b)
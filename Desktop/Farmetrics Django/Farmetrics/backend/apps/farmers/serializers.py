@@ -3,7 +3,7 @@ Serializers for farmers app.
 """
 
 from rest_framework import serializers
-from .models import Farmer, FarmerMergeHistory
+from .models import Farmer, FarmerMergeHistory, FarmerDuplicateCandidate, ImportJob
 
 
 class FarmerSerializer(serializers.ModelSerializer):
@@ -124,3 +124,95 @@ class FarmerMergeSerializer(serializers.Serializer):
             )
         return attrs
 
+
+class FarmerMergePairSerializer(serializers.Serializer):
+    """Serializer for one primary/duplicate pair in a batch merge."""
+    
+    primary_farmer_id = serializers.UUIDField(required=True)
+    duplicate_farmer_id = serializers.UUIDField(required=True)
+    
+    def validate(self, attrs):
+        if attrs['primary_farmer_id'] == attrs['duplicate_farmer_id']:
+            raise serializers.ValidationError(
+                "Cannot merge a farmer with itself"
+            )
+        return attrs
+
+
+class FarmerBatchMergeSerializer(serializers.Serializer):
+    """Serializer for merging many duplicate pairs at once."""
+    
+    merges = FarmerMergePairSerializer(many=True, allow_empty=False)
+    merge_reason = serializers.CharField(required=True)
+
+
+class FarmerDuplicateCandidateSerializer(serializers.ModelSerializer):
+    """Serializer for duplicate candidate pairs."""
+    
+    farmer_a_detail = FarmerListSerializer(source='farmer_a', read_only=True)
+    farmer_b_detail = FarmerListSerializer(source='farmer_b', read_only=True)
+    reviewed_by_name = serializers.CharField(source='reviewed_by.get_full_name', read_only=True)
+    
+    class Meta:
+        model = FarmerDuplicateCandidate
+        fields = [
+            'id', 'organization', 'farmer_a', 'farmer_a_detail', 'farmer_b',
+            'farmer_b_detail', 'score', 'match_reasons', 'details', 'status',
+            'reviewed_by', 'reviewed_by_name', 'reviewed_at', 'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'id', 'organization', 'farmer_a', 'farmer_b', 'score', 'match_reasons',
+            'details', 'reviewed_by', 'reviewed_at', 'created_at', 'updated_at'
+        ]
+    
+    def validate_status(self, value):
+        if value not in ('pending', 'confirmed', 'dismissed'):
+            raise serializers.ValidationError(
+                "Status must be 'pending', 'confirmed' or 'dismissed'"
+            )
+        return value
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """Serializer for import job status and results."""
+    
+    created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
+    progress = serializers.FloatField(read_only=True)
+    
+    class Meta:
+        model = ImportJob
+        fields = [
+            'id', 'organization', 'file_name', 'file_format', 'dry_run', 'status',
+            'total_rows', 'processed_rows', 'progress', 'farmers_created',
+            'farms_created', 'error_count', 'errors', 'error_message',
+            'created_by', 'created_by_name', 'started_at', 'completed_at',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
+class ImportJobCreateSerializer(serializers.Serializer):
+    """Serializer for uploading an import file."""
+    
+    file = serializers.FileField(required=True)
+    dry_run = serializers.BooleanField(default=False)
+    
+    def validate_file(self, value):
+        from django.conf import settings
+        from .imports import detect_format
+        
+        file_format = detect_format(value.name)
+        if not file_format:
+            raise serializers.ValidationError(
+                "Unsupported file type. Upload a .csv, .xlsx or .geojson file."
+            )
+        if value.size > settings.FARMER_IMPORT_MAX_FILE_SIZE:
+            raise serializers.ValidationError(
+                f"File exceeds maximum size of {settings.FARMER_IMPORT_MAX_FILE_SIZE} bytes"
+            )
+        if file_format == 'geojson' and value.size > settings.FARMER_IMPORT_MAX_GEOJSON_SIZE:
+            raise serializers.ValidationError(
+                f"GeoJSON files are limited to {settings.FARMER_IMPORT_MAX_GEOJSON_SIZE} bytes; "
+                "upload larger datasets as CSV"
+            )
+        return value
@@ -0,0 +1,48 @@
+"""
+Celery tasks for farmers app.
+"""
+
+import logging
+
+from celery import shared_task
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def detect_farmer_duplicates(organization_id):
+    """Run organization-wide duplicate detection (one run per organization at a time)."""
+    from .duplicates import detect_duplicates
+    
+    lock_key = f'farmer_duplicate_detection:{organization_id}'
+    if not cache.add(lock_key, True, timeout=60 * 60):
+        logger.info(f"Duplicate detection already running for organization {organization_id}")
+        return None
+    
+    try:
+        stats = detect_duplicates(organization_id)
+        logger.info(f"Duplicate detection for organization {organization_id}: {stats}")
+        return stats
+    finally:
+        cache.delete(lock_key)
+
+
+@shared_task
+def run_import_job(job_id):
+    """Run a farmer/farm import job."""
+    from .imports import run_import
+    from .models import ImportJob
+    
+    try:
+        job = ImportJob.objects.select_related('organization', 'created_by').get(pk=job_id)
+    except ImportJob.DoesNotExist:
+        logger.warning(f"Import job {job_id} not found")
+        return None
+    
+    if job.status != 'pending':
+        logger.info(f"Import job {job_id} already {job.status}")
+        return None
+    
+    run_import(job)
+    return str(job_id)
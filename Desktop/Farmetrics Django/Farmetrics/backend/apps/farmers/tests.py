@@ -0,0 +1,333 @@
+"""
+Tests for farmers app.
+"""
+
+import json
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.farms.models import Farm
+from apps.organizations.models import Organization, OrganizationMembership
+
+from . import duplicates, imports
+from .models import Farmer, FarmerDuplicateCandidate, ImportJob
+from .phonetics import phonetic_key
+
+
+class FarmerQueryCountTests(TestCase):
+    """Farmer list and detail pages run a fixed number of queries."""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Query Count Org')
+        self.user = User.objects.create_user(email='admin@example.com', password='x')
+        OrganizationMembership.objects.create(
+            organization=self.organization, user=self.user, role='country_admin'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.client.credentials(HTTP_X_ORGANIZATION_SLUG=self.organization.slug)
+        self.sequence = 0
+
+    def create_farmer(self, farms=0):
+        self.sequence += 1
+        farmer = Farmer.objects.create(
+            organization=self.organization,
+            first_name='Ama',
+            last_name=f'Mensah{self.sequence}',
+            phone_number=f'+23324{self.sequence:07d}',
+        )
+        for index in range(farms):
+            Farm.objects.create(
+                organization=self.organization,
+                owner=farmer,
+                name=f'Farm {self.sequence}-{index}',
+            )
+        return farmer
+
+    def count_queries(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_list_query_count_does_not_grow_with_farmers_or_farms(self):
+        url = reverse('farmers:farmer_list')
+        self.create_farmer(farms=1)
+        self.client.get(url)  # Warm per-user caches (scope, permissions)
+        baseline = self.count_queries(url)
+
+        for _ in range(10):
+            self.create_farmer(farms=3)
+
+        with self.assertNumQueries(baseline):
+            response = self.client.get(url)
+        self.assertEqual(response.data['count'], 11)
+        self.assertEqual(
+            sorted({row['total_farms'] for row in response.data['results']}),
+            [1, 3]
+        )
+
+    def test_detail_query_count_does_not_grow_with_farms(self):
+        small = self.create_farmer(farms=1)
+        large = self.create_farmer(farms=10)
+        self.client.get(reverse('farmers:farmer_detail', args=[small.pk]))  # Warm caches
+        baseline = self.count_queries(reverse('farmers:farmer_detail', args=[small.pk]))
+
+        with self.assertNumQueries(baseline):
+            response = self.client.get(reverse('farmers:farmer_detail', args=[large.pk]))
+        self.assertEqual(response.data['total_farms'], 10)
+
+    def test_duplicate_candidate_list_query_count_does_not_grow(self):
+        url = reverse('farmers:farmer_duplicate_list')
+
+        def create_candidate(farms):
+            FarmerDuplicateCandidate.objects.create(
+                organization=self.organization,
+                farmer_a=self.create_farmer(farms=farms),
+                farmer_b=self.create_farmer(farms=farms),
+                score=0.9,
+            )
+
+        create_candidate(farms=1)
+        self.client.get(url)  # Warm caches
+        baseline = self.count_queries(url)
+
+        for _ in range(5):
+            create_candidate(farms=2)
+
+        with self.assertNumQueries(baseline):
+            response = self.client.get(url)
+        self.assertEqual(response.data['count'], 6)
+
+
+class DuplicateDetectionTests(TestCase):
+    """Candidate pairs are generated once each and scored in batches."""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Duplicates Org')
+
+    def create_farmer(self, first_name, last_name, phone_number):
+        return Farmer.objects.create(
+            organization=self.organization,
+            first_name=first_name,
+            last_name=last_name,
+            phone_number=phone_number,
+        )
+
+    def test_pair_sharing_several_keys_is_generated_once(self):
+        # Same phone and same name: two shared blocking keys
+        self.create_farmer('Kwame', 'Asante', '+233241234567')
+        self.create_farmer('Kwame', 'Asante', '+233241234567')
+        self.create_farmer('Akosua', 'Boateng', '+233209876543')
+
+        farmer_ids, pairs, stats = duplicates.find_candidate_pairs(self.organization.pk)
+        pairs = list(pairs)
+
+        self.assertEqual(len(pairs), 1)
+        self.assertEqual(stats['candidate_pairs'], 1)
+        i, j = pairs[0]
+        self.assertLess(str(farmer_ids[i]), str(farmer_ids[j]))
+
+    def test_oversized_blocks_are_skipped(self):
+        for _ in range(3):
+            self.create_farmer('Kwame', 'Asante', '+233241234567')
+
+        _, pairs, stats = duplicates.find_candidate_pairs(self.organization.pk, max_block_size=2)
+
+        self.assertEqual(list(pairs), [])
+        self.assertEqual(stats['oversized_blocks'], 2)
+
+    def test_detect_duplicates_spans_scoring_batches(self):
+        for index in range(4):
+            self.create_farmer('Kwame', 'Asante', f'+23324123456{index}')
+        self.create_farmer('Kwame', 'Asante', '+233209876543')
+
+        with mock.patch.object(duplicates, 'SCORING_BATCH_SIZE', 3):
+            stats = duplicates.detect_duplicates(self.organization.pk, min_score=0.1)
+
+        # Five farmers in one name block: ten pairs over four batches
+        self.assertEqual(stats['candidate_pairs'], 10)
+        self.assertEqual(stats['candidates'], 10)
+        self.assertEqual(
+            FarmerDuplicateCandidate.objects.filter(organization=self.organization).count(), 10
+        )
+
+
+class DuplicateCandidateListTests(TestCase):
+    """Duplicate candidate list query parameters are validated."""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Candidates Org')
+        self.user = User.objects.create_user(email='reviewer@example.com', password='x')
+        OrganizationMembership.objects.create(
+            organization=self.organization, user=self.user, role='country_admin'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.client.credentials(HTTP_X_ORGANIZATION_SLUG=self.organization.slug)
+        self.url = reverse('farmers:farmer_duplicate_list')
+
+    def test_invalid_parameters_are_rejected(self):
+        for params, field in (({'farmer': 'not-a-uuid'}, 'farmer'), ({'min_score': 'high'}, 'min_score')):
+            with self.subTest(field):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(field, response.data)
+
+    def test_farmer_filter_matches_either_side(self):
+        farmers = [
+            Farmer.objects.create(
+                organization=self.organization,
+                first_name='Kwame',
+                last_name='Asante',
+                phone_number=f'+23324123456{index}',
+            )
+            for index in range(3)
+        ]
+        FarmerDuplicateCandidate.objects.create(
+            organization=self.organization, farmer_a=farmers[0], farmer_b=farmers[1], score=0.9
+        )
+        FarmerDuplicateCandidate.objects.create(
+            organization=self.organization, farmer_a=farmers[1], farmer_b=farmers[2], score=0.8
+        )
+
+        response = self.client.get(self.url, {'farmer': str(farmers[2].pk)})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+
+
+class PhoneticKeyTests(TestCase):
+    """Spelling variants share a key; different names do not."""
+
+    def test_spelling_variants_match(self):
+        for a, b in (
+            ('Kwame', 'Kwami'),
+            ('Osei', 'Oseyi'),
+            ('Akua', 'Akwa'),
+            ('Kyei', 'Chei'),
+            ('Gyasi', 'Jasi'),
+            ('Yaw', 'Yao'),
+            ('Mensah', 'Mensa'),
+            ('Philip', 'Filip'),
+        ):
+            with self.subTest(f'{a}/{b}'):
+                self.assertEqual(phonetic_key(a), phonetic_key(b))
+
+    def test_different_names_do_not_match(self):
+        for a, b in (
+            ('Kwame', 'Kamau'),
+            ('Yaw', 'Ama'),
+            ('Owusu', 'Osei'),
+            ('Kofi', 'Kwaku'),
+            ('Nyambura', 'Njeri'),
+        ):
+            with self.subTest(f'{a}/{b}'):
+                self.assertNotEqual(phonetic_key(a), phonetic_key(b))
+
+
+class FarmerSearchTests(TestCase):
+    """Farmer list search by name prefix, sound and ID."""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Search Org')
+        self.user = User.objects.create_user(email='search@example.com', password='x')
+        OrganizationMembership.objects.create(
+            organization=self.organization, user=self.user, role='country_admin'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.client.credentials(HTTP_X_ORGANIZATION_SLUG=self.organization.slug)
+        self.farmers = {
+            name: Farmer.objects.create(
+                organization=self.organization,
+                first_name=name.split()[0],
+                last_name=name.split()[1],
+                phone_number=f'+23324123450{index}',
+            )
+            for index, name in enumerate(['Kwame Asante', 'Kamau Njoroge', 'Yaw Owusu', 'Ama Osei'])
+        }
+
+    def search(self, text):
+        response = self.client.get(reverse('farmers:farmer_list'), {'search': text})
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['full_name'] for row in response.data['results'])
+
+    def test_name_prefix(self):
+        self.assertEqual(self.search('kwa'), ['Kwame Asante'])
+        self.assertEqual(self.search('Asan'), ['Kwame Asante'])
+        self.assertEqual(self.search('kwame asante'), ['Kwame Asante'])
+
+    def test_spelling_variants(self):
+        self.assertEqual(self.search('Kwami'), ['Kwame Asante'])
+        self.assertEqual(self.search('Yao'), ['Yaw Owusu'])
+        self.assertEqual(self.search('Oseyi'), ['Ama Osei'])
+
+    def test_similar_sounding_names_are_not_confused(self):
+        self.assertEqual(self.search('Kamau'), ['Kamau Njoroge'])
+        self.assertEqual(self.search('Owusu'), ['Yaw Owusu'])
+
+    def test_farmer_id_prefix(self):
+        farmer = self.farmers['Ama Osei']
+
+        self.assertIn('Ama Osei', self.search(farmer.farmer_id))
+
+
+class GeoJSONImportTests(TestCase):
+    """GeoJSON imports are parsed once and capped in size."""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Import Org')
+
+    def create_job(self):
+        features = [
+            {
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': [-1.62 + index / 100, 6.69]},
+                'properties': {
+                    'first_name': 'Kwabena',
+                    'last_name': f'Darko{index}',
+                    'phone_number': f'+23324555000{index}',
+                    'farm_name': f'Cocoa {index}',
+                },
+            }
+            for index in range(3)
+        ]
+        content = json.dumps({'type': 'FeatureCollection', 'features': features}).encode()
+        return ImportJob.objects.create(
+            organization=self.organization,
+            file=SimpleUploadedFile('farmers.geojson', content),
+            file_name='farmers.geojson',
+            file_format='geojson',
+        )
+
+    def test_document_is_parsed_once(self):
+        job = self.create_job()
+
+        with mock.patch.object(imports.json, 'load', wraps=json.load) as load:
+            imports.run_import(job)
+
+        self.assertEqual(load.call_count, 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual((job.total_rows, job.farmers_created, job.farms_created), (3, 3, 3))
+
+    @override_settings(FARMER_IMPORT_MAX_GEOJSON_SIZE=100)
+    def test_oversized_document_is_rejected_before_parsing(self):
+        job = self.create_job()
+
+        with mock.patch.object(imports.json, 'load') as load:
+            imports.run_import(job)
+
+        load.assert_not_called()
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('CSV', job.error_message)
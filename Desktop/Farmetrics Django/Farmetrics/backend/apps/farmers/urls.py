@@ -15,7 +15,13 @@ urlpatterns = [
     
     # Duplicate management
     path('duplicates/check/', views.FarmerDuplicateCheckView.as_view(), name='farmer_duplicate_check'),
+    path('duplicates/scan/', views.FarmerDuplicateScanView.as_view(), name='farmer_duplicate_scan'),
+    path('duplicates/', views.FarmerDuplicateCandidateListView.as_view(), name='farmer_duplicate_list'),
+    path('duplicates/<uuid:pk>/', views.FarmerDuplicateCandidateDetailView.as_view(), name='farmer_duplicate_detail'),
     path('merge/', views.FarmerMergeView.as_view(), name='farmer_merge'),
+    path('merge/batch/', views.FarmerBatchMergeView.as_view(), name='farmer_batch_merge'),
     path('merge-history/', views.FarmerMergeHistoryListView.as_view(), name='farmer_merge_history'),
+    path('imports/', views.ImportJobListCreateView.as_view(), name='farmer_import_list'),
+    path('imports/<uuid:pk>/', views.ImportJobDetailView.as_view(), name='farmer_import_detail'),
 ]
 
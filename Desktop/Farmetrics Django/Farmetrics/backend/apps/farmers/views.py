@@ -2,14 +2,23 @@
 Views for farmers app.
 """
 
+import uuid
+
 from rest_framework import generics, status, permissions, filters
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
 from drf_spectacular.utils import extend_schema
 
-from .models import Farmer, FarmerMergeHistory
+from apps.core.events import publish
+from apps.regions.scoping import scope_farmers
+
+from .filters import FarmerNameSearchFilter, name_match_q
+from .merge import MergeError, merge_farmers
+from .models import Farmer, FarmerMergeHistory, FarmerDuplicateCandidate, ImportJob
 from .serializers import (
     FarmerSerializer,
     FarmerCreateSerializer,
@@ -17,19 +26,36 @@ from .serializers import (
     FarmerMergeHistorySerializer,
     FarmerDuplicateCheckSerializer,
     FarmerMergeSerializer,
+    FarmerBatchMergeSerializer,
+    FarmerDuplicateCandidateSerializer,
+    ImportJobSerializer,
+    ImportJobCreateSerializer,
 )
 
 
+def _farmers_in_scope(request, farmer_ids):
+    """Whether all farmers are within the request user's regions."""
+    farmer_ids = set(farmer_ids)
+    return scope_farmers(Farmer.objects.filter(pk__in=farmer_ids), request).count() == len(farmer_ids)
+
+
 class FarmerListView(generics.ListCreateAPIView):
     """
     List all farmers or create a new farmer.
     """
     queryset = Farmer.objects.all()
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['verification_status', 'region', 'organization']
-    search_fields = ['farmer_id', 'first_name', 'last_name', 'phone_number', 'national_id']
-    ordering_fields = ['created_at', 'first_name', 'last_name']
+    filter_backends = [DjangoFilterBackend, FarmerNameSearchFilter, filters.OrderingFilter]
+    filterset_fields = {
+        'verification_status': ['exact'],
+        'region': ['exact'],
+        'organization': ['exact'],
+        'farm_count': ['exact', 'gte', 'lte'],
+        'total_area_m2': ['gte', 'lte'],
+    }
+    # Names are searched by prefix on the normalized name keys (see FarmerNameSearchFilter)
+    search_fields = ['^farmer_id', '=phone_number', '=national_id']
+    ordering_fields = ['created_at', 'first_name', 'last_name', 'farm_count', 'total_area_m2']
     ordering = ['-created_at']
     
     def get_serializer_class(self):
@@ -60,8 +86,8 @@ class FarmerListView(generics.ListCreateAPIView):
         if hasattr(self.request, 'organization') and self.request.organization:
             queryset = queryset.filter(organization=self.request.organization)
         
-        # Filter by region if user has geographic scope
-        # TODO: Add geographic filtering based on user's assignment
+        # Limit supervisors and field officers to their assigned regions
+        queryset = scope_farmers(queryset, self.request)
         
         return queryset.select_related('region', 'created_by', 'verified_by')
     
@@ -120,6 +146,9 @@ class FarmerDetailView(generics.RetrieveUpdateDestroyAPIView):
         if hasattr(self.request, 'organization') and self.request.organization:
             queryset = queryset.filter(organization=self.request.organization)
         
+        # Farmers outside the user's regions are not found
+        queryset = scope_farmers(queryset, self.request)
+        
         return queryset.select_related('region', 'created_by', 'verified_by', 'last_updated_by')
     
     def perform_update(self, serializer):
@@ -155,7 +184,7 @@ class FarmerVerifyView(APIView):
     )
     def post(self, request, pk):
         try:
-            farmer = Farmer.objects.get(pk=pk)
+            farmer = scope_farmers(Farmer.objects.all(), request).get(pk=pk)
             
             # Check organization access
             if hasattr(request, 'organization') and request.organization:
@@ -181,6 +210,12 @@ class FarmerVerifyView(APIView):
             farmer.verified_at = timezone.now()
             farmer.save()
             
+            publish(
+                'farmer.verified',
+                {'farmer_id': farmer.pk, 'status': status_value, 'notes': notes},
+                actor=request.user, organization_id=farmer.organization_id, request=request
+            )
+            
             return Response(
                 FarmerSerializer(farmer).data,
                 status=status.HTTP_200_OK
@@ -213,6 +248,7 @@ class FarmerDuplicateCheckView(APIView):
         # Filter by organization
         if hasattr(request, 'organization') and request.organization:
             queryset = queryset.filter(organization=request.organization)
+        queryset = scope_farmers(queryset, request)
         
         phone_number = serializer.validated_data.get('phone_number')
         national_id = serializer.validated_data.get('national_id')
@@ -226,9 +262,10 @@ class FarmerDuplicateCheckView(APIView):
         if national_id:
             q |= Q(national_id=national_id)
         if first_name and last_name:
-            q |= Q(first_name__iexact=first_name, last_name__iexact=last_name)
+            # Matches spelling variants ("Kwami Oseyi" / "Kwame Osei") and swapped names
+            q |= name_match_q(first_name, last_name)
         
-        duplicates = queryset.filter(q)
+        duplicates = queryset.filter(q).select_related('region')
         
         return Response({
             'count': duplicates.count(),
@@ -244,7 +281,8 @@ class FarmerMergeView(APIView):
     
     @extend_schema(
         summary="Merge farmers",
-        description="Merge duplicate farmer records",
+        description="Merge a duplicate farmer into a primary farmer. All records referencing "
+                    "the duplicate (farms, visits, media, requests, ...) are moved to the primary.",
         tags=["Farmers"],
         request=FarmerMergeSerializer
     )
@@ -252,59 +290,70 @@ class FarmerMergeView(APIView):
         serializer = FarmerMergeSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
+        pair = (
+            serializer.validated_data['primary_farmer_id'],
+            serializer.validated_data['duplicate_farmer_id'],
+        )
+        if not _farmers_in_scope(request, pair):
+            return Response({"error": "One or more farmers not found"}, status=status.HTTP_404_NOT_FOUND)
         try:
-            primary_farmer = Farmer.objects.get(
-                id=serializer.validated_data['primary_farmer_id']
-            )
-            duplicate_farmer = Farmer.objects.get(
-                id=serializer.validated_data['duplicate_farmer_id']
-            )
-            
-            # Check organization access
-            if hasattr(request, 'organization') and request.organization:
-                if (primary_farmer.organization != request.organization or 
-                    duplicate_farmer.organization != request.organization):
-                    return Response(
-                        {"error": "Farmers must belong to the same organization"},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-            
-            # Create snapshot of duplicate farmer data
-            duplicate_data = {
-                'farmer_id': duplicate_farmer.farmer_id,
-                'first_name': duplicate_farmer.first_name,
-                'last_name': duplicate_farmer.last_name,
-                'phone_number': str(duplicate_farmer.phone_number),
-                'national_id': duplicate_farmer.national_id,
-            }
-            
-            # Transfer farms to primary farmer
-            duplicate_farmer.farms.update(owner=primary_farmer)
-            
-            # Create merge history record
-            merge_history = FarmerMergeHistory.objects.create(
-                organization=primary_farmer.organization,
-                primary_farmer=primary_farmer,
-                merged_farmer_id=duplicate_farmer.farmer_id,
-                merged_farmer_data=duplicate_data,
-                merged_by=request.user,
-                merge_reason=serializer.validated_data['merge_reason']
+            primaries, histories = merge_farmers(
+                [pair],
+                user=request.user,
+                reason=serializer.validated_data['merge_reason'],
+                organization=getattr(request, 'organization', None)
             )
-            
-            # Soft delete duplicate farmer
-            duplicate_farmer.delete()
-            
-            return Response({
-                'message': 'Farmers merged successfully',
-                'primary_farmer': FarmerSerializer(primary_farmer).data,
-                'merge_history': FarmerMergeHistorySerializer(merge_history).data
-            }, status=status.HTTP_200_OK)
-            
-        except Farmer.DoesNotExist:
-            return Response(
-                {"error": "One or both farmers not found"},
-                status=status.HTTP_404_NOT_FOUND
+        except MergeError as e:
+            return Response({"error": e.message}, status=e.status_code)
+        
+        return Response({
+            'message': 'Farmers merged successfully',
+            'primary_farmer': FarmerSerializer(primaries[pair[0]]).data,
+            'merge_history': FarmerMergeHistorySerializer(histories[0]).data
+        }, status=status.HTTP_200_OK)
+
+
+class FarmerBatchMergeView(APIView):
+    """
+    Merge many duplicate farmer pairs in one transaction.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    @extend_schema(
+        summary="Batch merge farmers",
+        description="Merge many primary/duplicate pairs atomically. Chained pairs "
+                    "(A<-B, B<-C) are merged into the final primary.",
+        tags=["Farmers"],
+        request=FarmerBatchMergeSerializer
+    )
+    def post(self, request):
+        serializer = FarmerBatchMergeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        pairs = [
+            (merge['primary_farmer_id'], merge['duplicate_farmer_id'])
+            for merge in serializer.validated_data['merges']
+        ]
+        if not _farmers_in_scope(request, [farmer_id for pair in pairs for farmer_id in pair]):
+            return Response({"error": "One or more farmers not found"}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            primaries, histories = merge_farmers(
+                pairs,
+                user=request.user,
+                reason=serializer.validated_data['merge_reason'],
+                organization=getattr(request, 'organization', None)
             )
+        except MergeError as e:
+            return Response({"error": e.message}, status=e.status_code)
+        
+        return Response({
+            'message': f'{len(histories)} farmer(s) merged successfully',
+            'primary_farmers': FarmerListSerializer(
+                Farmer.objects.filter(pk__in=primaries).select_related('region'),
+                many=True
+            ).data,
+            'merge_history': FarmerMergeHistorySerializer(histories, many=True).data
+        }, status=status.HTTP_200_OK)
 
 
 class FarmerMergeHistoryListView(generics.ListAPIView):
@@ -326,6 +375,7 @@ class FarmerMergeHistoryListView(generics.ListAPIView):
         # Filter by organization
         if hasattr(self.request, 'organization') and self.request.organization:
             queryset = queryset.filter(organization=self.request.organization)
+        queryset = scope_farmers(queryset, self.request, prefix='primary_farmer__')
         
         # Filter by primary farmer if provided
         farmer_id = self.request.query_params.get('farmer_id')
@@ -334,3 +384,211 @@ class FarmerMergeHistoryListView(generics.ListAPIView):
         
         return queryset.select_related('primary_farmer', 'merged_by', 'organization')
 
+
+
+class FarmerDuplicateScanView(APIView):
+    """
+    Start organization-wide duplicate detection.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    @extend_schema(
+        summary="Scan for duplicates",
+        description="Start a background job that scans all farmers in the organization "
+                    "for likely duplicates. Results appear in the duplicate candidate list.",
+        tags=["Farmers"]
+    )
+    def post(self, request):
+        if not hasattr(request, 'organization') or not request.organization:
+            return Response(
+                {"error": "Organization context required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        from .tasks import detect_farmer_duplicates
+        task = detect_farmer_duplicates.delay(str(request.organization.id))
+        
+        return Response(
+            {"message": "Duplicate scan started", "task_id": task.id},
+            status=status.HTTP_202_ACCEPTED
+        )
+
+
+class FarmerDuplicateCandidateListView(generics.ListAPIView):
+    """
+    List ranked duplicate candidate pairs.
+    """
+    queryset = FarmerDuplicateCandidate.objects.all()
+    serializer_class = FarmerDuplicateCandidateSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['status']
+    ordering_fields = ['score', 'created_at']
+    ordering = ['-score']
+    
+    @extend_schema(
+        summary="List duplicate candidates",
+        description="Get likely duplicate farmer pairs ranked by match score",
+        tags=["Farmers"]
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        
+        # Filter by organization
+        if hasattr(self.request, 'organization') and self.request.organization:
+            queryset = queryset.filter(organization=self.request.organization)
+        
+        # Both farmers of a pair must be within the user's regions
+        queryset = scope_farmers(queryset, self.request, prefix='farmer_a__')
+        queryset = scope_farmers(queryset, self.request, prefix='farmer_b__')
+        
+        min_score = self.request.query_params.get('min_score')
+        if min_score:
+            try:
+                queryset = queryset.filter(score__gte=float(min_score))
+            except ValueError:
+                raise ValidationError({'min_score': 'Must be a number'})
+        
+        farmer = self.request.query_params.get('farmer')
+        if farmer:
+            try:
+                farmer = uuid.UUID(farmer)
+            except ValueError:
+                raise ValidationError({'farmer': 'Must be a valid UUID'})
+            queryset = queryset.filter(Q(farmer_a_id=farmer) | Q(farmer_b_id=farmer))
+        
+        return queryset.select_related(
+            'farmer_a', 'farmer_a__region', 'farmer_b', 'farmer_b__region', 'reviewed_by'
+        )
+
+
+class FarmerDuplicateCandidateDetailView(generics.RetrieveUpdateAPIView):
+    """
+    Retrieve or review a duplicate candidate pair.
+    """
+    queryset = FarmerDuplicateCandidate.objects.all()
+    serializer_class = FarmerDuplicateCandidateSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    http_method_names = ['get', 'patch', 'head', 'options']
+    
+    @extend_schema(
+        summary="Get duplicate candidate",
+        description="Get a duplicate candidate pair",
+        tags=["Farmers"]
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+    
+    @extend_schema(
+        summary="Review duplicate candidate",
+        description="Confirm or dismiss a duplicate candidate pair",
+        tags=["Farmers"]
+    )
+    def patch(self, request, *args, **kwargs):
+        return super().patch(request, *args, **kwargs)
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        
+        # Filter by organization
+        if hasattr(self.request, 'organization') and self.request.organization:
+            queryset = queryset.filter(organization=self.request.organization)
+        queryset = scope_farmers(queryset, self.request, prefix='farmer_a__')
+        queryset = scope_farmers(queryset, self.request, prefix='farmer_b__')
+        
+        return queryset.select_related('farmer_a', 'farmer_b', 'reviewed_by')
+    
+    def perform_update(self, serializer):
+        from django.utils import timezone
+        serializer.save(reviewed_by=self.request.user, reviewed_at=timezone.now())
+
+
+class ImportJobListCreateView(generics.ListAPIView):
+    """
+    List import jobs or upload a file to import farmers and farms.
+    """
+    queryset = ImportJob.objects.all()
+    serializer_class = ImportJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
+    
+    @extend_schema(
+        summary="List import jobs",
+        description="Get farmer/farm import jobs with their progress",
+        tags=["Farmers"]
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+    
+    @extend_schema(
+        summary="Import farmers and farms",
+        description="Upload a CSV, XLSX or GeoJSON file to create farmers and farms in the "
+                    "background. Poll the returned job for progress and per-row errors.",
+        tags=["Farmers"],
+        request=ImportJobCreateSerializer,
+        responses=ImportJobSerializer
+    )
+    def post(self, request):
+        if not hasattr(request, 'organization') or not request.organization:
+            return Response(
+                {"error": "Organization context required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        serializer = ImportJobCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        from django.db import transaction
+        from .imports import detect_format
+        from .tasks import run_import_job
+        
+        uploaded_file = serializer.validated_data['file']
+        job = ImportJob.objects.create(
+            organization=request.organization,
+            created_by=request.user,
+            file=uploaded_file,
+            file_name=uploaded_file.name[:255],
+            file_format=detect_format(uploaded_file.name),
+            dry_run=serializer.validated_data['dry_run']
+        )
+        transaction.on_commit(lambda: run_import_job.delay(str(job.pk)))
+        
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        
+        # Filter by organization
+        if hasattr(self.request, 'organization') and self.request.organization:
+            queryset = queryset.filter(organization=self.request.organization)
+        
+        return queryset.select_related('created_by')
+
+
+class ImportJobDetailView(generics.RetrieveAPIView):
+    """
+    Get import job progress and errors.
+    """
+    queryset = ImportJob.objects.all()
+    serializer_class = ImportJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    @extend_schema(
+        summary="Get import job",
+        description="Get import job progress, counts and per-row errors",
+        tags=["Farmers"]
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        
+        # Filter by organization
+        if hasattr(self.request, 'organization') and self.request.organization:
+            queryset = queryset.filter(organization=self.request.organization)
+        
+        return queryset.select_related('created_by')
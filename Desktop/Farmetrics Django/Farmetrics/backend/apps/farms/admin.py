@@ -25,7 +25,7 @@ class FarmAdmin(admin.GISModelAdmin):
     ]
     readonly_fields = [
         'id', 'farm_code', 'area_m2', 'area_acres', 'tree_density',
-        'age_years', 'visit_count', 'created_at', 'updated_at', 'deleted_at'
+        'age_years', 'visit_count', 'last_visit_at', 'created_at', 'updated_at', 'deleted_at'
     ]
     autocomplete_fields = [
         'organization', 'owner', 'region', 'created_by',
@@ -57,7 +57,7 @@ class FarmAdmin(admin.GISModelAdmin):
             'fields': ('status', 'verified_at', 'verified_by')
         }),
         ('Management', {
-            'fields': ('management_notes', 'metadata', 'visit_count')
+            'fields': ('management_notes', 'metadata', 'visit_count', 'last_visit_at')
         }),
         ('Data Management', {
             'fields': ('created_by', 'last_updated_by'),
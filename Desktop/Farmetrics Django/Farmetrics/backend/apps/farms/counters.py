@@ -0,0 +1,101 @@
+"""
+Denormalized counters for farmers and farms.
+
+Farmer.farm_count/total_area_m2 and Farm.visit_count/last_visit_at are
+adjusted with F() expressions from Farm.save and Visit.save, comparing the
+stored state (read under a row lock) against the state after saving. Counter
+states are tuples, or None when the row does not count (new or soft
+deleted). Bulk writes that bypass save() (bulk_create, queryset updates,
+merges) call the recompute helpers instead, and the reconcile_counters
+command repairs any drift.
+"""
+
+from decimal import Decimal
+
+from django.db.models import F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+def farm_state(owner_id, area_m2, deleted_at):
+    """Counter state of a farm: (owner_id, area) or None if deleted."""
+    if deleted_at is not None:
+        return None
+    # Match the two decimal places stored in total_area_m2
+    return (owner_id, Decimal(str(area_m2 or 0)).quantize(Decimal('0.01')))
+
+
+def visit_state(farm_id, visit_date, deleted_at):
+    """Counter state of a visit: (farm_id, visit_date) or None if deleted."""
+    if deleted_at is not None:
+        return None
+    return (farm_id, visit_date)
+
+
+def apply_farm_change(old, new):
+    """Adjust owner counters for a farm moving from state old to new."""
+    from apps.farmers.models import Farmer
+
+    if old == new:
+        return
+
+    deltas = {}
+    if old:
+        count, area = deltas.get(old[0], (0, 0))
+        deltas[old[0]] = (count - 1, area - old[1])
+    if new:
+        count, area = deltas.get(new[0], (0, 0))
+        deltas[new[0]] = (count + 1, area + new[1])
+
+    for owner_id, (count, area) in deltas.items():
+        if count or area:
+            Farmer.all_objects.filter(pk=owner_id).update(
+                farm_count=F('farm_count') + count,
+                total_area_m2=F('total_area_m2') + area
+            )
+
+
+def _latest_visit_subquery():
+    from apps.visits.models import Visit
+
+    return Subquery(
+        Visit.objects.filter(farm=OuterRef('pk')).order_by().values('farm').annotate(
+            latest=Max('visit_date')
+        ).values('latest')
+    )
+
+
+def apply_visit_change(old, new):
+    """Adjust farm visit counters for a visit moving from state old to new."""
+    from .models import Farm
+
+    if old == new:
+        return
+
+    if old and new and old[0] == new[0]:
+        # Same farm, visit date changed
+        if new[1] >= old[1]:
+            Farm.all_objects.filter(pk=new[0]).update(
+                last_visit_at=Greatest(Coalesce(F('last_visit_at'), new[1]), new[1])
+            )
+        else:
+            Farm.all_objects.filter(pk=new[0]).update(last_visit_at=_latest_visit_subquery())
+        return
+
+    if old:
+        Farm.all_objects.filter(pk=old[0]).update(
+            visit_count=F('visit_count') - 1,
+            last_visit_at=_latest_visit_subquery()
+        )
+    if new:
+        Farm.all_objects.filter(pk=new[0]).update(
+            visit_count=F('visit_count') + 1,
+            last_visit_at=Greatest(Coalesce(F('last_visit_at'), new[1]), new[1])
+        )
+
+
+def recompute_farmer_counters(farmer_ids):
+    """Rebuild farm counters for the given farmers from farm rows."""
+    from apps.farmers.models import Farmer
+
+    return Farmer.objects.all_with_deleted().filter(pk__in=farmer_ids).recompute_farm_stats()
+
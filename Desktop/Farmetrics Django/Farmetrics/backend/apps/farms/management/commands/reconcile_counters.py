@@ -0,0 +1,79 @@
+"""
+Management command to reconcile denormalized farmer and farm counters.
+
+Compares Farmer.farm_count/total_area_m2 and Farm.visit_count/last_visit_at
+with values computed from the farm and visit rows, and rewrites only the
+rows that drifted (e.g. after queryset updates or manual SQL).
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from apps.farmers.models import Farmer
+from apps.farms.models import Farm
+from apps.organizations.models import Organization
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Reconcile farm_count/total_area_m2 on farmers and visit_count/last_visit_at on farms'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization',
+            type=str,
+            help='Organization slug (defaults to all organizations)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drifted rows without fixing them'
+        )
+
+    def handle(self, *args, **options):
+        farmers = Farmer.objects.all_with_deleted()
+        farms = Farm.objects.all_with_deleted()
+
+        org_slug = options.get('organization')
+        if org_slug:
+            try:
+                organization = Organization.objects.get(slug=org_slug)
+            except Organization.DoesNotExist:
+                self.stdout.write(self.style.ERROR(f'Organization with slug "{org_slug}" not found'))
+                return
+            farmers = farmers.filter(organization=organization)
+            farms = farms.filter(organization=organization)
+
+        drifted_farmers = farmers.with_farm_stats().filter(
+            ~Q(farm_count=F('annotated_farm_count')) |
+            ~Q(total_area_m2=F('annotated_farm_area'))
+        ).values_list('pk', flat=True)
+        drifted_farms = farms.with_visit_stats().filter(
+            ~Q(visit_count=F('annotated_visit_count')) |
+            ~Q(last_visit_at=F('annotated_last_visit_at')) |
+            Q(last_visit_at__isnull=True, annotated_last_visit_at__isnull=False) |
+            Q(last_visit_at__isnull=False, annotated_last_visit_at__isnull=True)
+        ).values_list('pk', flat=True)
+
+        farmer_ids = list(drifted_farmers)
+        farm_ids = list(drifted_farms)
+
+        self.stdout.write(f'Farmers with drifted counters: {len(farmer_ids)}')
+        self.stdout.write(f'Farms with drifted counters: {len(farm_ids)}')
+
+        if options['dry_run']:
+            return
+
+        for start in range(0, len(farmer_ids), BATCH_SIZE):
+            Farmer.objects.all_with_deleted().filter(
+                pk__in=farmer_ids[start:start + BATCH_SIZE]
+            ).recompute_farm_stats()
+        for start in range(0, len(farm_ids), BATCH_SIZE):
+            Farm.objects.all_with_deleted().filter(
+                pk__in=farm_ids[start:start + BATCH_SIZE]
+            ).recompute_visit_stats()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Reconciled {len(farmer_ids)} farmer(s) and {len(farm_ids)} farm(s)'
+        ))
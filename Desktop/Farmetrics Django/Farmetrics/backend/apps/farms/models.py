@@ -5,7 +5,51 @@ Farm models for managing farm records, boundaries, and history.
 from django.contrib.gis.db import models as gis_models
 from django.db import models
 from django.core.validators import MinValueValidator
-from apps.core.models import TimeStampedModel, SoftDeleteModel
+from apps.core.models import TimeStampedModel, SoftDeleteModel, SoftDeleteManager, SoftDeleteQuerySet
+
+
+class FarmQuerySet(SoftDeleteQuerySet):
+    """QuerySet for farms with visit statistics annotations."""
+    
+    @staticmethod
+    def visit_stats_expressions():
+        """
+        Visit count and latest visit date computed from non-deleted visits,
+        as correlated subqueries keyed by {counter field: expression}.
+        """
+        from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Value
+        from django.db.models.functions import Coalesce
+        from apps.visits.models import Visit
+        
+        visits = Visit.objects.filter(farm=OuterRef('pk')).order_by().values('farm')
+        return {
+            'visit_count': Coalesce(
+                Subquery(visits.annotate(count=Count('pk')).values('count'), output_field=IntegerField()),
+                Value(0)
+            ),
+            'last_visit_at': Subquery(visits.annotate(latest=Max('visit_date')).values('latest')),
+        }
+    
+    def with_visit_stats(self):
+        """
+        Annotate visit count and latest visit date computed from visit rows
+        (annotated_visit_count, annotated_last_visit_at).
+        """
+        expressions = self.visit_stats_expressions()
+        return self.annotate(
+            annotated_visit_count=expressions['visit_count'],
+            annotated_last_visit_at=expressions['last_visit_at'],
+        )
+    
+    def recompute_visit_stats(self):
+        """Rewrite visit_count/last_visit_at from visit rows. Returns rows updated."""
+        return self.update(**self.visit_stats_expressions())
+
+
+class FarmManager(SoftDeleteManager):
+    """Soft delete manager returning FarmQuerySet."""
+    
+    queryset_class = FarmQuerySet
 
 
 class Farm(SoftDeleteModel):
@@ -150,6 +194,10 @@ class Farm(SoftDeleteModel):
         help_text="Additional farm metadata (irrigation, certifications, etc.)"
     )
     
+    # Denormalized visit statistics (maintained by Visit.save, see apps.farms.counters)
+    visit_count = models.IntegerField(default=0, editable=False, db_index=True)
+    last_visit_at = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
+    
     # Data Management
     created_by = models.ForeignKey(
         'accounts.User',
@@ -172,16 +220,70 @@ class Farm(SoftDeleteModel):
             models.Index(fields=['owner']),
             models.Index(fields=['region']),
             models.Index(fields=['farm_code']),
+            models.Index(fields=['organization', 'last_visit_at']),
         ]
     
+    # Maintained with F() updates; never written back by a full save
+    COUNTER_FIELDS = ['visit_count', 'last_visit_at']
+    
+    objects = FarmManager()
+    all_objects = models.Manager()  # Access all objects including deleted
+    
     def __str__(self):
         return f"{self.name} ({self.farm_code})"
     
+    def _locked_counter_state(self):
+        """
+        Counter state of the stored row, locked until the transaction ends.
+        
+        Read under SELECT ... FOR UPDATE (not from the state the instance was
+        loaded with) so concurrent saves of the same farm apply each counter
+        change exactly once.
+        """
+        from .counters import farm_state
+        if self._state.adding:
+            return None
+        row = Farm.all_objects.select_for_update().filter(pk=self.pk).values_list(
+            'owner_id', 'area_m2', 'deleted_at'
+        ).first()
+        return farm_state(*row) if row else None
+    
     def save(self, *args, **kwargs):
+        from django.db import transaction
+        from .counters import apply_farm_change, farm_state
+        
         # Auto-generate farm code if not provided
         if not self.farm_code:
             self.farm_code = self.generate_farm_code()
         
+        self.compute_derived_fields()
+        
+        if kwargs.get('update_fields') is None and not self._state.adding:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        
+        with transaction.atomic():
+            old_state = self._locked_counter_state()
+            super().save(*args, **kwargs)
+            apply_farm_change(old_state, farm_state(self.owner_id, self.area_m2, self.deleted_at))
+    
+    def hard_delete(self):
+        """Permanently delete the farm and release its owner counters."""
+        from django.db import transaction
+        from .counters import apply_farm_change
+        
+        with transaction.atomic():
+            apply_farm_change(self._locked_counter_state(), None)
+            super().hard_delete()
+    
+    def compute_derived_fields(self):
+        """
+        Calculate area and tree density from the polygon and tree count.
+        
+        Called from save(); call it directly before bulk_create.
+        """
         # Auto-calculate area from polygon
         if self.polygon:
             # Transform to equal-area projection for accurate area calculation
@@ -194,27 +296,19 @@ class Farm(SoftDeleteModel):
             hectares = self.area_m2 / 10000
             if hectares > 0:
                 self.tree_density = self.tree_count_estimate / hectares
-        
-        super().save(*args, **kwargs)
     
     def generate_farm_code(self):
         """Generate unique farm code."""
-        import random
-        import string
-        from django.utils import timezone
+        from apps.core.codes import next_code
         
-        # Format: FARM-YEAR-RANDOM (e.g., FARM-2025-X1Y2Z3)
-        year = timezone.now().year
-        random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        
-        farm_code = f"FARM-{year}-{random_part}"
-        
-        # Ensure uniqueness
-        while Farm.objects.filter(farm_code=farm_code).exists():
-            random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-            farm_code = f"FARM-{year}-{random_part}"
-        
-        return farm_code
+        # Format: FARM-YEAR-SEQUENCE (e.g., FARM-2025-000001A)
+        return next_code('FARM')
+    
+    @classmethod
+    def generate_farm_codes(cls, count):
+        """Generate count unique farm codes for bulk creation."""
+        from apps.core.codes import allocate_codes
+        return allocate_codes('FARM', count)
     
     @property
     def age_years(self):
@@ -225,11 +319,6 @@ class Farm(SoftDeleteModel):
             delta = today - self.planting_date
             return delta.days / 365.25
         return None
-    
-    @property
-    def visit_count(self):
-        """Get total number of visits to this farm."""
-        return self.visits.count()
 
 
 class FarmHistory(TimeStampedModel):
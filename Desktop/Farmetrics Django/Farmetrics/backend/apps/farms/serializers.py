@@ -14,7 +14,6 @@ class FarmSerializer(GeoFeatureModelSerializer):
     owner_farmer_id = serializers.CharField(source='owner.farmer_id', read_only=True)
     region_name = serializers.CharField(source='region.name', read_only=True)
     age_years = serializers.FloatField(read_only=True)
-    visit_count = serializers.IntegerField(read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
     
@@ -29,11 +28,11 @@ class FarmSerializer(GeoFeatureModelSerializer):
             'tree_count_estimate', 'tree_density', 'status', 'status_display',
             'verified_at', 'verified_by', 'management_notes', 'metadata',
             'created_by', 'created_by_name', 'last_updated_by',
-            'age_years', 'visit_count', 'is_deleted', 'created_at', 'updated_at'
+            'age_years', 'visit_count', 'last_visit_at', 'is_deleted', 'created_at', 'updated_at'
         ]
         read_only_fields = [
             'id', 'farm_code', 'area_m2', 'area_acres', 'tree_density',
-            'age_years', 'visit_count', 'is_deleted', 'created_at', 'updated_at'
+            'age_years', 'visit_count', 'last_visit_at', 'is_deleted', 'created_at', 'updated_at'
         ]
 
 
@@ -50,7 +49,7 @@ class FarmListSerializer(serializers.ModelSerializer):
             'id', 'farm_code', 'name', 'owner', 'owner_name',
             'region_name', 'area_m2', 'area_acres', 'crop_type',
             'status', 'status_display', 'tree_count_estimate',
-            'created_at'
+            'visit_count', 'last_visit_at', 'created_at'
         ]
 
 
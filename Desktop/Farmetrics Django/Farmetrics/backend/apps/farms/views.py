@@ -10,6 +10,9 @@ from django.contrib.gis.geos import Point
 from django.contrib.gis.measure import D
 from drf_spectacular.utils import extend_schema
 
+from apps.core.events import publish
+from apps.regions.scoping import scope_farms
+
 from .models import Farm, FarmHistory, FarmBoundaryPoint
 from .serializers import (
     FarmSerializer,
@@ -28,9 +31,18 @@ class FarmListView(generics.ListCreateAPIView):
     queryset = Farm.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['status', 'region', 'owner', 'organization', 'crop_type', 'soil_type']
+    filterset_fields = {
+        'status': ['exact'],
+        'region': ['exact'],
+        'owner': ['exact'],
+        'organization': ['exact'],
+        'crop_type': ['exact'],
+        'soil_type': ['exact'],
+        'visit_count': ['exact', 'gte', 'lte'],
+        'last_visit_at': ['gte', 'lte', 'isnull'],
+    }
     search_fields = ['farm_code', 'name', 'owner__first_name', 'owner__last_name']
-    ordering_fields = ['created_at', 'name', 'area_m2']
+    ordering_fields = ['created_at', 'name', 'area_m2', 'visit_count', 'last_visit_at']
     ordering = ['-created_at']
     
     def get_serializer_class(self):
@@ -61,6 +73,9 @@ class FarmListView(generics.ListCreateAPIView):
         if hasattr(self.request, 'organization') and self.request.organization:
             queryset = queryset.filter(organization=self.request.organization)
         
+        # Limit supervisors and field officers to their assigned regions
+        queryset = scope_farms(queryset, self.request)
+        
         return queryset.select_related('owner', 'region', 'created_by', 'verified_by')
     
     def perform_create(self, serializer):
@@ -118,6 +133,9 @@ class FarmDetailView(generics.RetrieveUpdateDestroyAPIView):
         if hasattr(self.request, 'organization') and self.request.organization:
             queryset = queryset.filter(organization=self.request.organization)
         
+        # Farms outside the user's regions are not found
+        queryset = scope_farms(queryset, self.request)
+        
         return queryset.select_related('owner', 'region', 'created_by', 'verified_by', 'last_updated_by')
     
     def perform_update(self, serializer):
@@ -170,7 +188,7 @@ class FarmVerifyView(APIView):
     )
     def post(self, request, pk):
         try:
-            farm = Farm.objects.get(pk=pk)
+            farm = scope_farms(Farm.objects.all(), request).get(pk=pk)
             
             # Check organization access
             if hasattr(request, 'organization') and request.organization:
@@ -186,6 +204,11 @@ class FarmVerifyView(APIView):
             farm.verified_at = timezone.now()
             farm.save()
             
+            publish(
+                'farm.verified', {'farm_id': farm.pk},
+                actor=request.user, organization_id=farm.organization_id, request=request
+            )
+            
             return Response(
                 FarmSerializer(farm).data,
                 status=status.HTTP_200_OK
@@ -228,6 +251,7 @@ class FarmNearbyView(APIView):
         # Filter by organization
         if hasattr(request, 'organization') and request.organization:
             queryset = queryset.filter(organization=request.organization)
+        queryset = scope_farms(queryset, request)
         
         return Response({
             'count': queryset.count(),
@@ -256,6 +280,7 @@ class FarmHistoryListView(generics.ListAPIView):
         farm_id = self.kwargs.get('farm_id')
         if farm_id:
             queryset = queryset.filter(farm_id=farm_id)
+        queryset = scope_farms(queryset, self.request, prefix='farm__')
         
         return queryset.select_related('farm', 'changed_by')
 
@@ -290,6 +315,7 @@ class FarmBoundaryPointListView(generics.ListCreateAPIView):
         farm_id = self.kwargs.get('farm_id')
         if farm_id:
             queryset = queryset.filter(farm_id=farm_id)
+        queryset = scope_farms(queryset, self.request, prefix='farm__')
         
         return queryset.select_related('farm', 'collected_by').order_by('sequence')
     
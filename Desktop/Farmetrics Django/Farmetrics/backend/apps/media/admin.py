@@ -3,7 +3,7 @@ Admin configuration for Media app.
 """
 
 from django.contrib import admin
-from .models import Media
+from .models import Media, MediaUploadSession
 
 
 @admin.register(Media)
@@ -17,7 +17,7 @@ class MediaAdmin(admin.ModelAdmin):
     list_filter = ['media_type', 'is_verified', 'is_public', 'created_at', 'date_taken']
     search_fields = ['file_name', 'title', 'description', 'camera_make', 'camera_model']
     readonly_fields = [
-        'id', 'file_name', 'file_size', 'mime_type', 'exif_data',
+        'id', 'file_name', 'file_size', 'mime_type', 'content_hash', 'exif_data',
         'camera_make', 'camera_model', 'date_taken', 'orientation',
         'width', 'height', 'created_at', 'updated_at'
     ]
@@ -26,7 +26,7 @@ class MediaAdmin(admin.ModelAdmin):
     
     fieldsets = (
         ('File Information', {
-            'fields': ('organization', 'file', 'file_name', 'file_size', 'mime_type', 'media_type')
+            'fields': ('organization', 'file', 'file_name', 'file_size', 'mime_type', 'media_type', 'content_hash')
         }),
         ('Upload Information', {
             'fields': ('uploaded_by', 'created_at')
@@ -56,3 +56,20 @@ class MediaAdmin(admin.ModelAdmin):
         }),
     )
 
+
+
+@admin.register(MediaUploadSession)
+class MediaUploadSessionAdmin(admin.ModelAdmin):
+    """Admin interface for MediaUploadSession model."""
+    
+    list_display = [
+        'file_name', 'uploaded_by', 'status', 'bytes_received',
+        'total_size', 'expires_at', 'created_at'
+    ]
+    list_filter = ['status', 'created_at']
+    search_fields = ['file_name', 'uploaded_by__email']
+    readonly_fields = [
+        'id', 'bytes_received', 'temp_path', 'media', 'completed_at',
+        'created_at', 'updated_at'
+    ]
+    raw_id_fields = ['uploaded_by', 'media']
@@ -0,0 +1,169 @@
+"""
+EXIF parsing for images.
+
+This module only depends on Pillow (no Django models) so it can run inside
+worker processes, e.g. the backfill_media_exif process pool.
+"""
+
+from datetime import datetime
+
+EXIF_IFD = 0x8769
+GPS_IFD = 0x8825
+
+# Tags not worth storing in exif_data (large binary blobs)
+SKIPPED_TAGS = {'MakerNote', 'UserComment', 'PrintImageMatching', 'GPSInfo', 'ExifOffset'}
+MAX_BYTES_VALUE = 256
+
+
+def _clean(value):
+    """Convert an EXIF value to a JSON/PostgreSQL-safe string."""
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', errors='replace')
+    # PostgreSQL JSON cannot store NUL characters
+    return str(value).replace('\x00', '').strip()
+
+
+def _rational(value):
+    """Convert an IFDRational, number or "num/den" string to float."""
+    if isinstance(value, str):
+        if '/' in value:
+            num, den = value.split('/')
+            return float(num) / float(den) if float(den) else 0.0
+        return float(value)
+    return float(value)
+
+
+def convert_to_degrees(value):
+    """
+    Convert an EXIF GPS coordinate to decimal degrees.
+
+    Accepts the formats produced by different Pillow versions and stored
+    EXIF strings:
+        - (degrees, minutes, seconds) as IFDRational/float values
+        - ((num, den), (num, den), (num, den)) tuples
+        - (num, den, num, den, num, den) flat tuples
+        - "41/1, 5/1, 0/1" or "(41.0, 5.0, 0.0)" strings
+        - a single decimal number
+
+    Returns:
+        Decimal degrees as float, or None if the value can't be parsed
+    """
+    try:
+        if isinstance(value, str):
+            parts = [p.strip() for p in value.strip('()[] ').split(',') if p.strip()]
+            if len(parts) == 1:
+                return _rational(parts[0])
+            value = parts
+
+        if isinstance(value, (tuple, list)):
+            if len(value) == 6 and all(isinstance(v, int) for v in value):
+                value = [(value[0], value[1]), (value[2], value[3]), (value[4], value[5])]
+
+            parts = []
+            for part in value[:3]:
+                if isinstance(part, (tuple, list)):
+                    parts.append(part[0] / part[1] if part[1] else 0.0)
+                else:
+                    parts.append(_rational(part))
+            while len(parts) < 3:
+                parts.append(0.0)
+
+            degrees, minutes, seconds = parts
+            return degrees + (minutes / 60.0) + (seconds / 3600.0)
+
+        return float(value)
+    except (TypeError, ValueError, ZeroDivisionError, IndexError):
+        return None
+
+
+def _parse_datetime(value):
+    try:
+        return datetime.strptime(_clean(value), '%Y:%m:%d %H:%M:%S')
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_exif(source):
+    """
+    Extract EXIF metadata from an image.
+
+    Args:
+        source: File path or binary file object
+
+    Returns:
+        Dictionary with keys exif_data, camera_make, camera_model,
+        date_taken (naive datetime or None), orientation, width, height and
+        gps (a (longitude, latitude) tuple or None)
+    """
+    from PIL import Image
+    from PIL.ExifTags import TAGS, GPSTAGS
+
+    result = {
+        'exif_data': {},
+        'camera_make': '',
+        'camera_model': '',
+        'date_taken': None,
+        'orientation': None,
+        'width': None,
+        'height': None,
+        'gps': None,
+    }
+
+    with Image.open(source) as img:
+        result['width'] = img.width
+        result['height'] = img.height
+
+        exif = img.getexif()
+        if not exif:
+            return result
+
+        tags = dict(exif)
+        try:
+            tags.update(exif.get_ifd(EXIF_IFD))
+        except (KeyError, TypeError):
+            pass
+
+        exif_dict = {}
+        for tag_id, value in tags.items():
+            tag = TAGS.get(tag_id, str(tag_id))
+            if tag in SKIPPED_TAGS:
+                continue
+            if isinstance(value, bytes) and len(value) > MAX_BYTES_VALUE:
+                continue
+            exif_dict[tag] = _clean(value)
+
+        result['camera_make'] = exif_dict.get('Make', '')[:100]
+        result['camera_model'] = exif_dict.get('Model', '')[:100]
+        result['date_taken'] = (
+            _parse_datetime(tags.get(0x9003))  # DateTimeOriginal
+            or _parse_datetime(tags.get(0x0132))  # DateTime
+        )
+        try:
+            orientation = int(tags.get(0x0112)) if tags.get(0x0112) is not None else None
+            result['orientation'] = orientation if orientation and 1 <= orientation <= 8 else None
+        except (TypeError, ValueError):
+            pass
+
+        try:
+            gps_ifd = exif.get_ifd(GPS_IFD)
+        except (KeyError, TypeError):
+            gps_ifd = {}
+
+        if gps_ifd:
+            gps_data = {GPSTAGS.get(key, str(key)): value for key, value in gps_ifd.items()}
+            exif_dict['GPSInfo'] = {key: _clean(value) for key, value in gps_data.items()}
+
+            lat = convert_to_degrees(gps_data.get('GPSLatitude'))
+            lon = convert_to_degrees(gps_data.get('GPSLongitude'))
+            if lat is not None and lon is not None:
+                if _clean(gps_data.get('GPSLatitudeRef', 'N')).upper() == 'S':
+                    lat = -lat
+                if _clean(gps_data.get('GPSLongitudeRef', 'E')).upper() == 'W':
+                    lon = -lon
+                # (0, 0) is what many cameras write without a fix
+                if -90 <= lat <= 90 and -180 <= lon <= 180 and (lat, lon) != (0.0, 0.0):
+                    result['gps'] = (lon, lat)
+
+        result['exif_data'] = exif_dict
+
+    return result
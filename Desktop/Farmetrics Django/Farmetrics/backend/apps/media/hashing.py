@@ -0,0 +1,45 @@
+"""
+Content hashing for media files.
+"""
+
+import hashlib
+
+HASH_BLOCK_SIZE = 1024 * 1024  # 1 MB
+
+
+def hash_fileobj(fileobj):
+    """
+    Compute the SHA-256 hex digest of an open file, reading it in blocks.
+    
+    Accepts Django File/UploadedFile objects (streamed via chunks()) as well
+    as plain binary file objects.
+    """
+    digest = hashlib.sha256()
+    if hasattr(fileobj, 'chunks'):
+        for block in fileobj.chunks(HASH_BLOCK_SIZE):
+            digest.update(block)
+    else:
+        for block in iter(lambda: fileobj.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_path(path):
+    """Compute the SHA-256 hex digest of a file on local disk."""
+    with open(path, 'rb') as f:
+        return hash_fileobj(f)
+
+
+def get_content_hash(uploaded_file):
+    """
+    Return the content hash of an uploaded file.
+    
+    Uses the hash recorded by the hashing upload handlers while the request
+    streamed in, falling back to hashing the file.
+    """
+    content_hash = getattr(uploaded_file, 'content_hash', None)
+    if content_hash:
+        return content_hash
+    content_hash = hash_fileobj(uploaded_file)
+    uploaded_file.seek(0)
+    return content_hash
@@ -0,0 +1,219 @@
+"""
+Management command to backfill EXIF metadata for existing images.
+
+Rows are streamed from the database, decoded in a process pool (Pillow is
+CPU bound) and written back with bulk_update in batches. Workers receive
+only a local path or storage name and read the file themselves: Pillow
+parses the header lazily, and for remote storages only the first
+EXIF_HEADER_BYTES are read (the whole file only when the header is not
+enough to parse). Every processed row is marked in metadata['exif_backfill'],
+so an interrupted run resumes where it stopped when started again.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.media.exif import parse_exif
+from apps.media.models import Media
+from apps.organizations.models import Organization
+
+MARKER_KEY = 'exif_backfill'
+
+# Leading bytes read from remote storages; JPEG EXIF (APP1) is at most 64 KB
+# and comes right after the start of the file
+EXIF_HEADER_BYTES = 256 * 1024
+
+
+def _init_worker():
+    # Spawned workers (non-fork platforms) start without configured settings
+    import django
+    django.setup()
+
+
+def _parse_from_storage(name):
+    import io
+    from PIL import UnidentifiedImageError
+
+    storage = Media._meta.get_field('file').storage
+    with storage.open(name, 'rb') as f:
+        header = f.read(EXIF_HEADER_BYTES)
+        try:
+            return parse_exif(io.BytesIO(header))
+        except (OSError, UnidentifiedImageError, SyntaxError):
+            if len(header) < EXIF_HEADER_BYTES:
+                raise
+            # Metadata beyond the header (e.g. TIFF/PNG); read the rest here
+            return parse_exif(io.BytesIO(header + f.read()))
+
+
+def _extract(job):
+    """Worker: parse EXIF from a local path, or a storage name read in the worker."""
+    media_id, path, name = job
+    try:
+        if path:
+            return media_id, parse_exif(path), None
+        return media_id, _parse_from_storage(name), None
+    except Exception as e:
+        return media_id, None, str(e)
+
+
+class Command(BaseCommand):
+    help = 'Backfill EXIF metadata (camera, date, dimensions, GPS) for images missing it'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization',
+            type=str,
+            help='Organization slug (defaults to all organizations)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 2,
+            help='Number of worker processes (default: CPU count)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Number of records processed and written per batch (default: 200)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Maximum number of records to process in this run'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Reprocess records already handled by a previous run'
+        )
+        parser.add_argument(
+            '--link-farms',
+            action='store_true',
+            help='Link media that gained a GPS location to the containing/nearest farm'
+        )
+
+    def handle(self, *args, **options):
+        queryset = Media.objects.filter(media_type='image').exclude(file='').filter(
+            Q(exif_data={}) | Q(gps_location__isnull=True)
+        )
+        if not options['force']:
+            queryset = queryset.exclude(metadata__has_key=MARKER_KEY)
+
+        org_slug = options.get('organization')
+        if org_slug:
+            try:
+                organization = Organization.objects.get(slug=org_slug)
+            except Organization.DoesNotExist:
+                self.stdout.write(self.style.ERROR(f'Organization with slug "{org_slug}" not found'))
+                return
+            queryset = queryset.filter(organization=organization)
+
+        queryset = queryset.order_by('created_at', 'id')
+        total = queryset.count()
+        if options['limit']:
+            total = min(total, options['limit'])
+            queryset = queryset[:total]
+
+        self.stdout.write(
+            f"Backfilling EXIF for {total} image(s) with {options['workers']} worker(s)..."
+        )
+
+        self.stats = {'processed': 0, 'updated': 0, 'with_gps': 0, 'failed': 0, 'bytes': 0, 'linked': 0}
+        self.started = time.monotonic()
+        batch_size = options['batch_size']
+
+        try:
+            with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as executor:
+                batch = []
+                for media in queryset.iterator(chunk_size=batch_size):
+                    batch.append(media)
+                    if len(batch) >= batch_size:
+                        self._process_batch(executor, batch, options['link_farms'])
+                        self._report_progress(total)
+                        batch = []
+                if batch:
+                    self._process_batch(executor, batch, options['link_farms'])
+                    self._report_progress(total)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING(
+                '\nInterrupted. Completed batches are saved; run again to resume.'
+            ))
+
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {self.stats['processed']} image(s) in {elapsed:.1f}s "
+            f"({self.stats['processed'] / elapsed if elapsed else 0:.1f} images/s, "
+            f"{self.stats['bytes'] / (1024 * 1024) / elapsed if elapsed else 0:.1f} MB/s)"
+        ))
+        self.stdout.write(
+            f"  Updated: {self.stats['updated']}  With GPS: {self.stats['with_gps']}  "
+            f"Failed: {self.stats['failed']}"
+        )
+        if options['link_farms']:
+            self.stdout.write(f"  Linked to farms: {self.stats['linked']}")
+
+    def _job(self, media):
+        """(id, local path, storage name); the path is None for remote storages."""
+        try:
+            path = media.file.path
+        except NotImplementedError:
+            path = None
+        self.stats['bytes'] += media.file_size or 0
+        return media.pk, path, media.file.name
+
+    def _process_batch(self, executor, batch, link_farms):
+        by_id = {}
+        jobs = []
+        for media in batch:
+            by_id[media.pk] = media
+            jobs.append(self._job(media))
+
+        processed_at = timezone.now().isoformat()
+        for media_id, result, error in executor.map(_extract, jobs, chunksize=4):
+            media = by_id[media_id]
+            if error:
+                self._mark(media, 'error', error, processed_at)
+                continue
+
+            had_location = media.gps_location is not None
+            media.apply_exif_result(result)
+            self._mark(media, 'ok' if result['exif_data'] else 'no_exif', processed_at=processed_at)
+            self.stats['updated'] += 1
+            if media.gps_location is not None and not had_location:
+                self.stats['with_gps'] += 1
+                media._gained_location = True
+
+        Media.objects.bulk_update(batch, [
+            'exif_data', 'camera_make', 'camera_model', 'date_taken',
+            'orientation', 'width', 'height', 'gps_location', 'metadata'
+        ])
+        self.stats['processed'] += len(batch)
+
+        if link_farms:
+            for media in batch:
+                if getattr(media, '_gained_location', False) and media.link_to_farm():
+                    self.stats['linked'] += 1
+
+    def _mark(self, media, status, error='', processed_at=None):
+        marker = {'status': status, 'processed_at': processed_at or timezone.now().isoformat()}
+        if error:
+            marker['error'] = error[:500]
+            self.stats['failed'] += 1
+        media.metadata = {**(media.metadata or {}), MARKER_KEY: marker}
+
+    def _report_progress(self, total):
+        elapsed = time.monotonic() - self.started
+        processed = self.stats['processed']
+        rate = processed / elapsed if elapsed else 0
+        remaining = (total - processed) / rate if rate else 0
+        self.stdout.write(
+            f"  {processed}/{total} ({rate:.1f} images/s, ~{remaining:.0f}s remaining)"
+        )
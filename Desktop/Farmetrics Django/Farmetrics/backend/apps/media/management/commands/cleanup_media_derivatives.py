@@ -0,0 +1,23 @@
+"""
+Management command to bound the local image derivative cache.
+"""
+
+from django.core.management.base import BaseCommand
+from apps.media.serving import prune_derivative_cache
+
+
+class Command(BaseCommand):
+    help = 'Evict least recently used image derivatives until the cache fits its size bound'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-size',
+            type=int,
+            help='Size bound in bytes (defaults to MEDIA_DERIVATIVE_CACHE_MAX_SIZE)'
+        )
+    
+    def handle(self, *args, **options):
+        removed, freed = prune_derivative_cache(options.get('max_size'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Removed {removed} derivative file(s), freed {freed} bytes'
+        ))
@@ -0,0 +1,14 @@
+"""
+Management command to expire abandoned chunked upload sessions.
+"""
+
+from django.core.management.base import BaseCommand
+from apps.media.uploads import cleanup_expired_sessions
+
+
+class Command(BaseCommand):
+    help = 'Expire abandoned chunked upload sessions and delete their temporary files'
+    
+    def handle(self, *args, **options):
+        count = cleanup_expired_sessions()
+        self.stdout.write(self.style.SUCCESS(f'Expired {count} upload session(s)'))
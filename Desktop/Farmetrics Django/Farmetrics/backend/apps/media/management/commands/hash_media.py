@@ -0,0 +1,142 @@
+"""
+Management command to compute content hashes for existing media files
+and report space reclaimable through deduplication.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Max
+
+from apps.media.hashing import hash_fileobj
+from apps.media.models import Media
+from apps.organizations.models import Organization
+
+
+def _hash_stored_file(name):
+    """Hash a stored file; returns (name, hash or None, error)."""
+    try:
+        with default_storage.open(name, 'rb') as f:
+            return name, hash_fileobj(f), None
+    except Exception as e:
+        return name, None, str(e)
+
+
+class Command(BaseCommand):
+    help = 'Compute content hashes for media files and report reclaimable space'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization',
+            type=str,
+            help='Organization slug (defaults to all organizations)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Number of parallel hashing workers (default: 8)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of records hashed and written per batch (default: 500)'
+        )
+        parser.add_argument(
+            '--report-only',
+            action='store_true',
+            help='Skip hashing and only report reclaimable space'
+        )
+
+    def handle(self, *args, **options):
+        queryset = Media.all_objects.exclude(file='')
+
+        org_slug = options.get('organization')
+        if org_slug:
+            try:
+                organization = Organization.objects.get(slug=org_slug)
+            except Organization.DoesNotExist:
+                self.stdout.write(self.style.ERROR(f'Organization with slug "{org_slug}" not found'))
+                return
+            queryset = queryset.filter(organization=organization)
+
+        if not options['report_only']:
+            self._hash_missing(queryset, options['workers'], options['batch_size'])
+
+        self._report(queryset)
+
+    def _hash_missing(self, queryset, workers, batch_size):
+        pending = queryset.filter(content_hash='').only('id', 'file')
+        total = pending.count()
+        self.stdout.write(f'Hashing {total} media file(s) with {workers} worker(s)...')
+
+        hashed = 0
+        failed = 0
+        # Hashing is I/O bound and hashlib releases the GIL on large buffers,
+        # so a thread pool parallelizes well without pickling overhead.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            batch = []
+            for media in pending.iterator(chunk_size=batch_size):
+                batch.append(media)
+                if len(batch) >= batch_size:
+                    h, f = self._hash_batch(executor, batch)
+                    hashed += h
+                    failed += f
+                    batch = []
+                    self.stdout.write(f'  {hashed + failed}/{total} processed')
+            if batch:
+                h, f = self._hash_batch(executor, batch)
+                hashed += h
+                failed += f
+
+        self.stdout.write(self.style.SUCCESS(f'Hashed {hashed} file(s)'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'Failed to hash {failed} file(s)'))
+
+    def _hash_batch(self, executor, batch):
+        # Records that already share a stored file only need hashing once
+        names = {media.file.name for media in batch}
+        hashes = {}
+        for name, content_hash, error in executor.map(_hash_stored_file, names):
+            if content_hash:
+                hashes[name] = content_hash
+            else:
+                self.stdout.write(self.style.WARNING(f'  Failed to hash {name}: {error}'))
+
+        updated = []
+        failed = 0
+        for media in batch:
+            content_hash = hashes.get(media.file.name)
+            if content_hash:
+                media.content_hash = content_hash
+                updated.append(media)
+            else:
+                failed += 1
+
+        Media.all_objects.bulk_update(updated, ['content_hash'])
+        return len(updated), failed
+
+    def _report(self, queryset):
+        duplicates = queryset.exclude(content_hash='').values(
+            'organization', 'content_hash'
+        ).annotate(
+            records=Count('id'),
+            stored_files=Count('file', distinct=True),
+            size=Max('file_size')
+        ).filter(stored_files__gt=1)
+
+        groups = 0
+        redundant_files = 0
+        reclaimable = 0
+        for group in duplicates.iterator():
+            groups += 1
+            redundant_files += group['stored_files'] - 1
+            reclaimable += (group['stored_files'] - 1) * (group['size'] or 0)
+
+        self.stdout.write(f'Duplicate content groups: {groups}')
+        self.stdout.write(f'Redundant stored files: {redundant_files}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Reclaimable space: {reclaimable / (1024 * 1024):.1f} MB ({reclaimable} bytes)'
+        ))
@@ -0,0 +1,96 @@
+"""
+Management command to link geotagged media to farms in bulk.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef, Subquery
+
+from apps.farms.models import Farm
+from apps.media.models import Media
+from apps.media.spatial import find_farm_for_point
+from apps.organizations.models import Organization
+
+
+class Command(BaseCommand):
+    help = 'Link geotagged media without a farm to the containing or nearest farm'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization',
+            type=str,
+            help='Organization slug (defaults to all organizations)'
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=None,
+            help='Nearest-farm tolerance in meters (defaults to MEDIA_FARM_LINK_TOLERANCE_M)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of records written per batch for nearest-farm linking (default: 500)'
+        )
+
+    def handle(self, *args, **options):
+        unlinked = Media.objects.filter(
+            related_farm__isnull=True,
+            gps_location__isnull=False
+        )
+
+        org_slug = options.get('organization')
+        if org_slug:
+            try:
+                organization = Organization.objects.get(slug=org_slug)
+            except Organization.DoesNotExist:
+                self.stdout.write(self.style.ERROR(f'Organization with slug "{org_slug}" not found'))
+                return
+            unlinked = unlinked.filter(organization=organization)
+
+        self.stdout.write(f'Unlinked geotagged media: {unlinked.count()}')
+
+        # Pass 1: a single set-based UPDATE for points inside a farm boundary
+        containing_farms = Farm.objects.filter(
+            organization_id=OuterRef('organization_id'),
+            polygon__contains=OuterRef('gps_location')
+        ).order_by('area_m2')
+
+        contained = unlinked.filter(Exists(containing_farms)).update(
+            related_farm=Subquery(containing_farms.values('pk')[:1])
+        )
+        self.stdout.write(self.style.SUCCESS(f'  Linked {contained} by farm boundary'))
+
+        # Pass 2: nearest farm within tolerance for the remainder
+        nearest = 0
+        batch = []
+        remaining = unlinked.filter(related_farm__isnull=True).only(
+            'id', 'organization_id', 'gps_location'
+        )
+        for media in remaining.iterator(chunk_size=options['batch_size']):
+            farm = find_farm_for_point(media.organization_id, media.gps_location, options['tolerance'])
+            if farm:
+                media.related_farm_id = farm.pk
+                batch.append(media)
+            if len(batch) >= options['batch_size']:
+                Media.objects.bulk_update(batch, ['related_farm'])
+                nearest += len(batch)
+                batch = []
+        if batch:
+            Media.objects.bulk_update(batch, ['related_farm'])
+            nearest += len(batch)
+        self.stdout.write(self.style.SUCCESS(f'  Linked {nearest} to nearest farm'))
+
+        # Fill the farmer from the linked farm's owner
+        linked_without_farmer = Media.objects.filter(
+            related_farm__isnull=False,
+            related_farmer__isnull=True
+        )
+        if org_slug:
+            linked_without_farmer = linked_without_farmer.filter(organization=organization)
+        farmers = linked_without_farmer.update(
+            related_farmer=Subquery(
+                Farm.all_objects.filter(pk=OuterRef('related_farm_id')).values('owner_id')[:1]
+            )
+        )
+        self.stdout.write(self.style.SUCCESS(f'  Set farmer on {farmers} media record(s)'))
@@ -42,6 +42,12 @@ class Media(SoftDeleteModel):
         help_text="File size in bytes"
     )
     mime_type = models.CharField(max_length=100, blank=True)
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        help_text="SHA-256 hex digest of the file content"
+    )
     
     # Upload Information
     uploaded_by = models.ForeignKey(
@@ -146,12 +152,21 @@ class Media(SoftDeleteModel):
             models.Index(fields=['date_taken']),
             models.Index(fields=['related_farm']),
             models.Index(fields=['related_farmer']),
+            models.Index(fields=['organization', 'content_hash']),
         ]
     
+    # Fields copied from an existing record when its stored file is reused
+    EXTRACTED_FIELDS = [
+        'mime_type', 'exif_data', 'camera_make', 'camera_model', 'date_taken',
+        'orientation', 'width', 'height', 'duration_seconds'
+    ]
+    
     def __str__(self):
         return f"{self.file_name} ({self.media_type})"
     
     def save(self, *args, **kwargs):
+        is_new = self._state.adding
+        
         # Extract file information if new file
         if self.file and not self.file_name:
             self.file_name = os.path.basename(self.file.name)
@@ -171,9 +186,65 @@ class Media(SoftDeleteModel):
         
         super().save(*args, **kwargs)
         
-        # Extract EXIF data for images (async task recommended)
-        if self.media_type == 'image' and self.file:
+        # Extract EXIF data for new images (async task recommended).
+        # Only on creation: extract_exif_data saves again with update_fields.
+        # Skipped when metadata was copied from a duplicate upload.
+        if (is_new and self.media_type == 'image' and self.file
+                and not getattr(self, '_metadata_reused', False)):
             self.extract_exif_data()
+        
+        # Auto-link to the farm at the capture location
+        if is_new and not self.related_farm_id and self.gps_location is not None:
+            self.link_to_farm()
+    
+    def link_to_farm(self):
+        """
+        Link to the farm containing (or nearest to) the GPS location.
+        
+        Returns:
+            True if a farm was linked
+        """
+        from .spatial import link_media_to_farm
+        
+        try:
+            return link_media_to_farm(self)
+        except Exception as e:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.warning(f"Failed to link media to farm: {e}")
+            return False
+    
+    @classmethod
+    def find_by_content_hash(cls, organization_id, content_hash):
+        """
+        Find the earliest stored file in an organization with the given content hash.
+        
+        Soft-deleted records are included since their files remain in storage.
+        """
+        if not content_hash:
+            return None
+        return cls.all_objects.filter(
+            organization_id=organization_id,
+            content_hash=content_hash
+        ).exclude(file='').order_by('created_at').first()
+    
+    def reuse_stored_file(self, original):
+        """
+        Point this (unsaved) record at the file already stored for `original`
+        and copy its extracted metadata instead of storing and parsing the
+        file again.
+        """
+        self.file.name = original.file.name
+        self.file_size = original.file_size
+        self.content_hash = original.content_hash
+        if not self.media_type:
+            self.media_type = original.media_type
+        for field in self.EXTRACTED_FIELDS:
+            if not getattr(self, field):
+                setattr(self, field, getattr(original, field))
+        if self.gps_location is None:
+            self.gps_location = original.gps_location
+        self._metadata_reused = True
     
     def extract_exif_data(self):
         """
@@ -181,102 +252,60 @@ class Media(SoftDeleteModel):
         Uses Pillow for EXIF extraction.
         """
         try:
-            from PIL import Image
-            from PIL.ExifTags import TAGS, GPSTAGS
-            import json
-            from datetime import datetime
+            from .exif import parse_exif
             
             if not self.file:
                 return
             
-            # Open image and extract EXIF
-            with Image.open(self.file) as img:
-                exif_dict = {}
-                
-                # Get EXIF data
-                exif = img._getexif()
-                if exif:
-                    for tag_id, value in exif.items():
-                        tag = TAGS.get(tag_id, tag_id)
-                        exif_dict[tag] = str(value)
-                        
-                        # Extract common fields
-                        if tag == 'Make':
-                            self.camera_make = str(value)
-                        elif tag == 'Model':
-                            self.camera_model = str(value)
-                        elif tag == 'DateTime':
-                            try:
-                                self.date_taken = datetime.strptime(str(value), '%Y:%m:%d %H:%M:%S')
-                            except:
-                                pass
-                        elif tag == 'Orientation':
-                            self.orientation = value
-                
-                # Get image dimensions
-                self.width = img.width
-                self.height = img.height
-                
-                # Extract GPS data
-                gps_info = exif_dict.get('GPSInfo')
-                if gps_info:
-                    gps_data = {}
-                    for key, value in gps_info.items():
-                        tag = GPSTAGS.get(key, key)
-                        gps_data[tag] = str(value)
-                    
-                    # Convert GPS to Point if coordinates available
-                    if 'GPSLatitude' in gps_data and 'GPSLongitude' in gps_data:
-                        try:
-                            lat = self._convert_to_degrees(gps_data.get('GPSLatitude'))
-                            lon = self._convert_to_degrees(gps_data.get('GPSLongitude'))
-                            
-                            # Handle North/South and East/West
-                            if gps_data.get('GPSLatitudeRef') == 'S':
-                                lat = -lat
-                            if gps_data.get('GPSLongitudeRef') == 'W':
-                                lon = -lon
-                            
-                            from django.contrib.gis.geos import Point
-                            self.gps_location = Point(lon, lat, srid=4326)
-                        except:
-                            pass
-                
-                # Store full EXIF data
-                self.exif_data = exif_dict
-                
-                # Save updates
-                self.save(update_fields=[
-                    'exif_data', 'camera_make', 'camera_model', 'date_taken',
-                    'orientation', 'width', 'height', 'gps_location'
-                ])
-                
+            with self.file.open('rb') as f:
+                result = parse_exif(f)
+            
+            update_fields = self.apply_exif_result(result)
+            self.save(update_fields=update_fields)
+        
         except Exception as e:
             # Log error but don't fail
             import logging
             logger = logging.getLogger(__name__)
             logger.warning(f"Failed to extract EXIF data: {e}")
     
+    def apply_exif_result(self, result):
+        """
+        Apply the output of apps.media.exif.parse_exif to this instance.
+        
+        Manually entered GPS locations are kept.
+        
+        Returns:
+            List of updated field names
+        """
+        from django.contrib.gis.geos import Point
+        from django.utils import timezone
+        
+        self.exif_data = result['exif_data']
+        self.camera_make = result['camera_make']
+        self.camera_model = result['camera_model']
+        self.orientation = result['orientation']
+        self.width = result['width']
+        self.height = result['height']
+        
+        date_taken = result['date_taken']
+        if date_taken is not None and timezone.is_naive(date_taken):
+            date_taken = timezone.make_aware(date_taken)
+        self.date_taken = date_taken
+        
+        if result['gps'] and self.gps_location is None:
+            lon, lat = result['gps']
+            self.gps_location = Point(lon, lat, srid=4326)
+        
+        return [
+            'exif_data', 'camera_make', 'camera_model', 'date_taken',
+            'orientation', 'width', 'height', 'gps_location'
+        ]
+    
     def _convert_to_degrees(self, value):
         """Convert GPS coordinate to decimal degrees."""
-        try:
-            # Handle different formats
-            if isinstance(value, str):
-                # Parse string format like "41/1, 5/1, 0/1"
-                parts = value.split(',')
-                degrees = float(parts[0].split('/')[0]) / float(parts[0].split('/')[1])
-                minutes = float(parts[1].split('/')[0]) / float(parts[1].split('/')[1])
-                seconds = float(parts[2].split('/')[0]) / float(parts[2].split('/')[1])
-                return degrees + (minutes / 60.0) + (seconds / 3600.0)
-            elif isinstance(value, tuple):
-                degrees = value[0] / value[1] if value[1] != 0 else 0
-                minutes = value[2] / value[3] if value[3] != 0 else 0
-                seconds = value[4] / value[5] if value[5] != 0 else 0
-                return degrees + (minutes / 60.0) + (seconds / 3600.0)
-            else:
-                return float(value)
-        except:
-            return None
+        from .exif import convert_to_degrees
+        return convert_to_degrees(value)
     
     @property
     def file_url(self):
@@ -287,7 +316,99 @@ class Media(SoftDeleteModel):
     
     @property
     def thumbnail_url(self):
-        """Get thumbnail URL (to be implemented with image processing)."""
-        # TODO: Generate and return thumbnail URL
+        """
+        Get thumbnail URL (resized derivative for images).
+
+        The derivative URL is signed and expires after
+        MEDIA_DERIVATIVE_URL_MAX_AGE, so it can be loaded without an
+        Authorization header.
+        """
+        if self.media_type == 'image' and self.file:
+            from .serving import derivative_url
+            return derivative_url(self, 'thumb')
         return self.file_url
 
+
+
+class MediaUploadSession(TimeStampedModel):
+    """
+    Resumable chunked upload session.
+    
+    Chunks are appended to a temporary file on local disk at the offset
+    reported by the session; when all bytes have arrived the file is moved
+    into storage and a Media record is created.
+    """
+    
+    STATUS_CHOICES = [
+        ('active', 'Active'),
+        ('completed', 'Completed'),
+        ('aborted', 'Aborted'),
+        ('expired', 'Expired'),
+    ]
+    
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='media_upload_sessions'
+    )
+    uploaded_by = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.CASCADE,
+        related_name='media_upload_sessions'
+    )
+    
+    # File Information
+    file_name = models.CharField(max_length=255)
+    total_size = models.BigIntegerField(
+        help_text="Expected total file size in bytes"
+    )
+    bytes_received = models.BigIntegerField(
+        default=0,
+        help_text="Number of bytes received so far (next expected offset)"
+    )
+    checksum = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Expected SHA-256 hex digest of the complete file"
+    )
+    mime_type = models.CharField(max_length=100, blank=True)
+    temp_path = models.CharField(max_length=500)
+    
+    # Media fields applied when the upload completes
+    media_data = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Media attributes (title, tags, related farm, etc.) to apply on completion"
+    )
+    
+    # Status
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='active',
+        db_index=True
+    )
+    expires_at = models.DateTimeField(db_index=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    media = models.OneToOneField(
+        Media,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='upload_session'
+    )
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['uploaded_by', 'status']),
+            models.Index(fields=['status', 'expires_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.file_name} ({self.bytes_received}/{self.total_size})"
+    
+    @property
+    def is_expired(self):
+        from django.utils import timezone
+        return self.expires_at <= timezone.now()
@@ -2,9 +2,15 @@
 Serializers for media app.
 """
 
+import os
+
+from django.conf import settings
 from rest_framework import serializers
 from rest_framework_gis.serializers import GeoFeatureModelSerializer
-from .models import Media
+from apps.farmers.models import Farmer
+from apps.farms.models import Farm
+from .hashing import get_content_hash
+from .models import Media, MediaUploadSession
 
 
 class MediaSerializer(GeoFeatureModelSerializer):
@@ -21,15 +27,15 @@ class MediaSerializer(GeoFeatureModelSerializer):
         geo_field = 'gps_location'
         fields = [
             'id', 'organization', 'file', 'file_name', 'file_size', 'mime_type',
-            'media_type', 'uploaded_by', 'uploaded_by_name', 'gps_location',
-            'gps_accuracy', 'exif_data', 'camera_make', 'camera_model',
+            'content_hash', 'media_type', 'uploaded_by', 'uploaded_by_name',
+            'gps_location', 'gps_accuracy', 'exif_data', 'camera_make', 'camera_model',
             'date_taken', 'orientation', 'width', 'height', 'duration_seconds',
             'title', 'description', 'tags', 'related_farm', 'related_farm_name',
             'related_farmer', 'related_farmer_name', 'is_public', 'is_verified',
             'metadata', 'file_url', 'thumbnail_url', 'created_at', 'updated_at'
         ]
         read_only_fields = [
-            'id', 'file_name', 'file_size', 'mime_type', 'exif_data',
+            'id', 'file_name', 'file_size', 'mime_type', 'content_hash', 'exif_data',
             'camera_make', 'camera_model', 'date_taken', 'orientation',
             'width', 'height', 'file_url', 'thumbnail_url', 'created_at', 'updated_at'
         ]
@@ -63,5 +69,110 @@ class MediaUploadSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         validated_data['uploaded_by'] = self.context['request'].user
-        return super().create(validated_data)
+        
+        uploaded_file = validated_data.pop('file')
+        media = Media(**validated_data)
+        media.content_hash = get_content_hash(uploaded_file)
+        
+        existing = Media.find_by_content_hash(media.organization_id, media.content_hash)
+        if existing:
+            # Identical file already stored for this organization
+            media.file_name = os.path.basename(uploaded_file.name)
+            media.reuse_stored_file(existing)
+        else:
+            media.file = uploaded_file
+        media.save()
+        return media
+
+
+
+class MediaUploadSessionSerializer(serializers.ModelSerializer):
+    """Serializer for chunked upload session state."""
+    
+    offset = serializers.IntegerField(source='bytes_received', read_only=True)
+    max_chunk_size = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = MediaUploadSession
+        fields = [
+            'id', 'file_name', 'total_size', 'offset', 'max_chunk_size',
+            'checksum', 'mime_type', 'status', 'expires_at', 'completed_at',
+            'media', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+    
+    def get_max_chunk_size(self, obj):
+        return settings.MEDIA_UPLOAD_MAX_CHUNK_SIZE
 
+
+class MediaUploadSessionCreateSerializer(serializers.Serializer):
+    """Serializer for starting a chunked upload."""
+    
+    file_name = serializers.CharField(max_length=255)
+    total_size = serializers.IntegerField(min_value=1)
+    checksum = serializers.RegexField(
+        r'^[0-9a-fA-F]{64}$',
+        required=False,
+        allow_blank=True,
+        help_text="SHA-256 hex digest of the complete file"
+    )
+    mime_type = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    
+    # Media attributes applied when the upload completes
+    media_type = serializers.ChoiceField(choices=Media.MEDIA_TYPE_CHOICES, required=False)
+    title = serializers.CharField(max_length=200, required=False, allow_blank=True)
+    description = serializers.CharField(required=False, allow_blank=True)
+    tags = serializers.ListField(child=serializers.CharField(), required=False)
+    related_farm = serializers.PrimaryKeyRelatedField(
+        queryset=Farm.objects.none(), required=False, allow_null=True
+    )
+    related_farmer = serializers.PrimaryKeyRelatedField(
+        queryset=Farmer.objects.none(), required=False, allow_null=True
+    )
+    latitude = serializers.FloatField(required=False, min_value=-90, max_value=90)
+    longitude = serializers.FloatField(required=False, min_value=-180, max_value=180)
+    gps_accuracy = serializers.FloatField(required=False, allow_null=True)
+    is_public = serializers.BooleanField(required=False)
+    metadata = serializers.JSONField(required=False)
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Only farms and farmers of the uploading organization can be linked
+        organization = self.context.get('organization')
+        self.fields['related_farm'].queryset = Farm.objects.filter(organization=organization)
+        self.fields['related_farmer'].queryset = Farmer.objects.filter(organization=organization)
+    
+    MEDIA_FIELDS = [
+        'media_type', 'title', 'description', 'tags', 'related_farm',
+        'related_farmer', 'latitude', 'longitude', 'gps_accuracy',
+        'is_public', 'metadata'
+    ]
+    
+    def validate(self, data):
+        if ('latitude' in data) != ('longitude' in data):
+            raise serializers.ValidationError("Both latitude and longitude are required")
+        return data
+    
+    def get_media_data(self):
+        """Return validated Media attributes in JSON-serializable form."""
+        media_data = {}
+        for field in self.MEDIA_FIELDS:
+            if field in self.validated_data:
+                value = self.validated_data[field]
+                if field in ('related_farm', 'related_farmer') and value is not None:
+                    value = str(value.pk)
+                media_data[field] = value
+        return media_data
+
+
+class MediaUploadChunkSerializer(serializers.Serializer):
+    """Serializer for appending a chunk to an upload session."""
+    
+    offset = serializers.IntegerField(min_value=0)
+    chunk = serializers.FileField()
+    checksum = serializers.RegexField(
+        r'^[0-9a-fA-F]{64}$',
+        required=False,
+        allow_blank=True,
+        help_text="SHA-256 hex digest of this chunk"
+    )
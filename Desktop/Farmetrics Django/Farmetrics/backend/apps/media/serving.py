@@ -0,0 +1,371 @@
+"""
+Serving media files: resized image derivatives and ranged file responses.
+
+Derivatives are generated on first request and cached on local disk, keyed by
+(media id, size, format) plus the content hash so a replaced file never
+serves a stale variant. The cache is bounded by MEDIA_DERIVATIVE_CACHE_MAX_SIZE
+(see prune_derivative_cache). Responses carry strong ETags and Cache-Control
+so clients and proxies can revalidate cheaply.
+
+Derivative URLs can be signed (derivative_url) so they load in an
+``<img src>`` without an Authorization header.
+"""
+
+import mimetypes
+import os
+import re
+import tempfile
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.http import (
+    FileResponse,
+    HttpResponse,
+    HttpResponseNotModified,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
+
+# Maximum width/height in pixels for each derivative size
+DERIVATIVE_SIZES = {
+    'thumb': 200,
+    'small': 480,
+    'medium': 1024,
+    'large': 2048,
+}
+
+# format -> (Pillow format, content type, file extension)
+DERIVATIVE_FORMATS = {
+    'jpeg': ('JPEG', 'image/jpeg', 'jpg'),
+    'webp': ('WEBP', 'image/webp', 'webp'),
+}
+
+RANGE_BLOCK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+SIGNATURE_SALT = 'media.derivative'
+
+# Cache hits refresh the file mtime at most this often (seconds), so
+# pruning evicts the least recently used derivatives first
+TOUCH_INTERVAL = 60 * 60
+
+# Temporary render files older than this (seconds) are left over from crashes
+STALE_TEMP_AGE = 60 * 60
+
+
+class DerivativeError(Exception):
+    """Raised when a derivative cannot be produced for a media file."""
+
+
+def _content_version(media):
+    """Token that changes whenever the stored file content changes."""
+    if media.content_hash:
+        return media.content_hash[:16]
+    return f"{media.file_size}-{int(media.updated_at.timestamp())}"
+
+
+def derivative_etag(media, size, fmt):
+    return f'"{media.pk.hex}-{size}-{fmt}-{_content_version(media)}"'
+
+
+def file_etag(media):
+    return f'"{media.pk.hex}-{_content_version(media)}"'
+
+
+def cache_control(media):
+    visibility = 'public' if media.is_public else 'private'
+    return f"{visibility}, max-age={settings.MEDIA_DERIVATIVE_MAX_AGE}"
+
+
+def choose_format(request, requested=None):
+    """Pick the derivative format: explicit request, else WebP when accepted."""
+    if requested:
+        return requested
+    if 'image/webp' in request.META.get('HTTP_ACCEPT', ''):
+        return 'webp'
+    return 'jpeg'
+
+
+def derivative_url(media, size):
+    """
+    Signed URL of an image derivative, valid for MEDIA_DERIVATIVE_URL_MAX_AGE.
+
+    The signature covers the media ID and size, so the URL can be used
+    without an Authorization header (e.g. as an ``<img src>``).
+    """
+    from django.urls import reverse
+
+    signature = signing.dumps([media.pk.hex, size], salt=SIGNATURE_SALT, compress=True)
+    return f"{reverse('media:media_derivative', kwargs={'pk': media.pk})}?size={size}&signature={signature}"
+
+
+def check_derivative_signature(signature, media_id, size):
+    """Whether a derivative URL signature is valid for this media and size."""
+    try:
+        signed_id, signed_size = signing.loads(
+            signature,
+            salt=SIGNATURE_SALT,
+            max_age=settings.MEDIA_DERIVATIVE_URL_MAX_AGE
+        )
+    except (signing.BadSignature, TypeError, ValueError):
+        return False
+    return signed_id == media_id.hex and signed_size == size
+
+
+def get_derivative_path(media, size, fmt):
+    """
+    Return the path of a cached derivative, generating it if needed.
+
+    Raises:
+        DerivativeError: If the media is not an image or cannot be decoded
+    """
+    if media.media_type != 'image' or not media.file:
+        raise DerivativeError("Derivatives are only available for images")
+
+    _, _, ext = DERIVATIVE_FORMATS[fmt]
+    media_id = media.pk.hex
+    cache_dir = os.path.join(settings.MEDIA_DERIVATIVE_CACHE_DIR, media_id[:2], media_id)
+    path = os.path.join(cache_dir, f"{size}-{_content_version(media)}.{ext}")
+
+    try:
+        mtime = os.path.getmtime(path)
+    except FileNotFoundError:
+        os.makedirs(cache_dir, exist_ok=True)
+        _render_derivative(media, size, fmt, cache_dir, path)
+    else:
+        if time.time() - mtime > TOUCH_INTERVAL:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+    return path
+
+
+def _render_derivative(media, size, fmt, cache_dir, path):
+    from PIL import Image, ImageOps
+
+    pil_format, _, _ = DERIVATIVE_FORMATS[fmt]
+    max_px = DERIVATIVE_SIZES[size]
+
+    try:
+        with media.file.open('rb') as f, Image.open(f) as img:
+            # Let the JPEG decoder downscale while decoding
+            img.draft('RGB', (max_px, max_px))
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((max_px, max_px), Image.LANCZOS)
+
+            if pil_format == 'JPEG' and img.mode not in ('RGB', 'L'):
+                img = img.convert('RGB')
+
+            # Write to a temp file and rename so concurrent requests never
+            # see a partially written derivative
+            fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as out:
+                    img.save(
+                        out,
+                        format=pil_format,
+                        quality=settings.MEDIA_DERIVATIVE_QUALITY,
+                        optimize=True
+                    )
+                os.replace(temp_path, path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+    except Image.DecompressionBombError as e:
+        raise DerivativeError(f"Image is too large to process: {e}")
+    except (OSError, ValueError) as e:
+        raise DerivativeError(f"Unable to process image: {e}")
+
+
+def prune_derivative_cache(max_size=None):
+    """
+    Evict cached derivatives until the cache fits in max_size bytes.
+
+    The least recently used derivatives (oldest mtime, refreshed on cache
+    hits) are removed first, along with temporary files left by crashed
+    renders and empty directories. Deleted derivatives are regenerated on
+    the next request.
+
+    Args:
+        max_size: Size bound in bytes (defaults to MEDIA_DERIVATIVE_CACHE_MAX_SIZE)
+
+    Returns:
+        Tuple of (files removed, bytes freed)
+    """
+    if max_size is None:
+        max_size = settings.MEDIA_DERIVATIVE_CACHE_MAX_SIZE
+
+    now = time.time()
+    entries = []
+    total = 0
+    removed = 0
+    freed = 0
+
+    def remove(path, size):
+        nonlocal removed, freed
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        removed += 1
+        freed += size
+
+    for dirpath, _, filenames in os.walk(settings.MEDIA_DERIVATIVE_CACHE_DIR):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if filename.endswith('.tmp'):
+                if now - stat.st_mtime > STALE_TEMP_AGE:
+                    remove(path, stat.st_size)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_size:
+            break
+        remove(path, size)
+        total -= size
+
+    # Drop media directories emptied by eviction (bottom-up)
+    for dirpath, _, _ in os.walk(settings.MEDIA_DERIVATIVE_CACHE_DIR, topdown=False):
+        if dirpath != settings.MEDIA_DERIVATIVE_CACHE_DIR:
+            try:
+                os.rmdir(dirpath)
+            except OSError:
+                pass
+
+    return removed, freed
+
+
+def _not_modified(request, etag):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags
+
+
+def _with_cache_headers(response, media, etag):
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control(media)
+    return response
+
+
+def serve_derivative(request, media, size, fmt, vary_accept=False):
+    """
+    Serve a resized image derivative with caching headers.
+
+    Raises:
+        DerivativeError: If the media is not a decodable image
+    """
+    etag = derivative_etag(media, size, fmt)
+    if _not_modified(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        path = get_derivative_path(media, size, fmt)
+        _, content_type, _ = DERIVATIVE_FORMATS[fmt]
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+
+    if vary_accept:
+        response['Vary'] = 'Accept'
+    return _with_cache_headers(response, media, etag)
+
+
+def _parse_range(header, size):
+    """
+    Parse a single-range "bytes=" header.
+
+    Returns:
+        (start, end) inclusive, None to serve the whole file (absent,
+        multi-range or malformed header), or False if unsatisfiable
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+def _iter_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            block = f.read(min(RANGE_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+def serve_media_file(request, media):
+    """
+    Serve the original media file with ETag and HTTP Range support.
+
+    Range requests (video seeking/resume) are supported for storages with
+    local paths (FileSystemStorage); other storages are redirected to the
+    storage URL, which handles ranges itself.
+    """
+    try:
+        path = media.file.path
+    except NotImplementedError:
+        return HttpResponseRedirect(media.file.url)
+
+    etag = file_etag(media)
+    if _not_modified(request, etag):
+        return _with_cache_headers(HttpResponseNotModified(), media, etag)
+
+    size = os.path.getsize(path)
+    content_type = (
+        media.mime_type
+        or mimetypes.guess_type(media.file_name)[0]
+        or 'application/octet-stream'
+    )
+
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if range_header and (not if_range or if_range == etag):
+        byte_range = _parse_range(range_header, size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    elif byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _iter_range(path, start, length),
+            status=206,
+            content_type=content_type
+        )
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    else:
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+
+    response['Accept-Ranges'] = 'bytes'
+    return _with_cache_headers(response, media, etag)
@@ -0,0 +1,120 @@
+"""
+Spatial lookups for media: photo-to-farm linking and map filters.
+
+All lookups are written so PostGIS can use the GiST indexes GeoDjango
+creates on geometry fields (Media.gps_location, Farm.polygon,
+Farm.primary_location): containment and bounding-box tests use ST_Contains /
+ST_Within, and distance searches are pre-filtered with ST_DWithin in degrees
+before the exact spherical distance is applied.
+"""
+
+import math
+
+from django.conf import settings
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.geos import Point, Polygon
+from django.contrib.gis.measure import D
+
+METERS_PER_DEGREE = 111320
+
+
+def degrees_for_meters(meters, latitude):
+    """
+    Convert a distance in meters to a (conservative) distance in degrees at
+    the given latitude, for index-assisted ST_DWithin pre-filtering.
+    """
+    return meters / (METERS_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+
+
+def find_farm_for_point(organization_id, point, tolerance_m=None):
+    """
+    Find the farm a GPS point belongs to.
+
+    Args:
+        organization_id: Organization to search in
+        point: Point (SRID 4326)
+        tolerance_m: Maximum distance to the nearest farm when the point is
+            not inside any farm boundary (defaults to MEDIA_FARM_LINK_TOLERANCE_M)
+
+    Returns:
+        The farm whose boundary contains the point (smallest if several
+        overlap), otherwise the nearest farm within tolerance, or None
+    """
+    from apps.farms.models import Farm
+
+    if tolerance_m is None:
+        tolerance_m = settings.MEDIA_FARM_LINK_TOLERANCE_M
+
+    farms = Farm.objects.filter(organization_id=organization_id)
+
+    farm = farms.filter(polygon__contains=point).order_by('area_m2').first()
+    if farm:
+        return farm
+
+    if not tolerance_m:
+        return None
+
+    return farms.filter(
+        primary_location__dwithin=(point, degrees_for_meters(tolerance_m, point.y)),
+        primary_location__distance_lte=(point, D(m=tolerance_m))
+    ).annotate(
+        distance=Distance('primary_location', point)
+    ).order_by('distance').first()
+
+
+def link_media_to_farm(media, tolerance_m=None):
+    """
+    Link a media record without a farm to the farm at its GPS location.
+    Also fills related_farmer from the farm owner when blank.
+
+    Returns:
+        True if the media was linked
+    """
+    if media.related_farm_id or media.gps_location is None:
+        return False
+
+    farm = find_farm_for_point(media.organization_id, media.gps_location, tolerance_m)
+    if not farm:
+        return False
+
+    media.related_farm = farm
+    update_fields = ['related_farm']
+    if not media.related_farmer_id:
+        media.related_farmer_id = farm.owner_id
+        update_fields.append('related_farmer')
+    media.save(update_fields=update_fields)
+    return True
+
+
+def parse_bbox(value):
+    """
+    Parse a "min_lon,min_lat,max_lon,max_lat" string into a Polygon.
+
+    Raises:
+        ValueError: If the value is malformed
+    """
+    try:
+        min_lon, min_lat, max_lon, max_lat = [float(v) for v in value.split(',')]
+    except (TypeError, ValueError):
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+
+    if not (-180 <= min_lon <= max_lon <= 180 and -90 <= min_lat <= max_lat <= 90):
+        raise ValueError("bbox coordinates are out of range")
+
+    bbox = Polygon.from_bbox((min_lon, min_lat, max_lon, max_lat))
+    bbox.srid = 4326
+    return bbox
+
+
+def filter_within_bbox(queryset, bbox, field='gps_location'):
+    """Filter a queryset to rows whose point lies inside a bounding box polygon."""
+    return queryset.filter(**{f'{field}__within': bbox})
+
+
+def filter_within_radius(queryset, latitude, longitude, radius_m, field='gps_location'):
+    """Filter a queryset to rows whose point lies within radius_m of a location."""
+    point = Point(longitude, latitude, srid=4326)
+    return queryset.filter(**{
+        f'{field}__dwithin': (point, degrees_for_meters(radius_m, latitude)),
+        f'{field}__distance_lte': (point, D(m=radius_m)),
+    })
@@ -0,0 +1,21 @@
+"""
+Celery tasks for media app.
+"""
+
+from celery import shared_task
+
+from .serving import prune_derivative_cache
+from .uploads import cleanup_expired_sessions
+
+
+@shared_task
+def cleanup_expired_upload_sessions():
+    """Expire abandoned chunked upload sessions and delete their temporary files."""
+    return cleanup_expired_sessions()
+
+
+@shared_task
+def cleanup_media_derivatives():
+    """Evict least recently used image derivatives beyond the cache size bound."""
+    removed, _ = prune_derivative_cache()
+    return removed
@@ -0,0 +1,287 @@
+"""
+Tests for media app.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.farmers.models import Farmer
+from apps.organizations.models import Organization, OrganizationMembership
+
+from .management.commands import backfill_media_exif
+from .models import Media, MediaUploadSession
+from .serving import prune_derivative_cache
+
+
+class MediaAPITestCase(TestCase):
+    """Authenticated client for an organization member."""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Media Org')
+        self.user = User.objects.create_user(email='uploader@example.com', password='x')
+        OrganizationMembership.objects.create(
+            organization=self.organization, user=self.user, role='country_admin'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.client.credentials(HTTP_X_ORGANIZATION_SLUG=self.organization.slug)
+
+
+class ChunkedUploadTests(MediaAPITestCase):
+    """Resumable uploads: chunks at the session offset, verified on completion."""
+
+    content = b'0123456789'
+
+    def start(self, **data):
+        response = self.client.post(reverse('media:upload_session_create'), {
+            'file_name': 'notes.txt',
+            'total_size': len(self.content),
+            'checksum': hashlib.sha256(self.content).hexdigest(),
+            'media_type': 'document',
+            **data,
+        }, format='json')
+        return response
+
+    def send(self, session_id, offset, data):
+        return self.client.post(
+            reverse('media:upload_session_chunk', args=[session_id]),
+            {'offset': offset, 'chunk': SimpleUploadedFile('chunk', data)},
+            format='multipart'
+        )
+
+    def test_upload_in_chunks_and_resume_after_offset_mismatch(self):
+        response = self.start()
+        self.assertEqual(response.status_code, 201)
+        session_id = response.data['id']
+
+        self.assertEqual(self.send(session_id, 0, self.content[:4]).status_code, 200)
+
+        # A client that lost track of the offset is told where to resume
+        response = self.send(session_id, 8, self.content[8:])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['offset'], 4)
+
+        self.assertEqual(self.send(session_id, 4, self.content[4:]).status_code, 200)
+        response = self.client.post(reverse('media:upload_session_complete', args=[session_id]))
+
+        self.assertEqual(response.status_code, 201)
+        media = Media.objects.get(pk=response.data['id'])
+        self.assertEqual(media.organization, self.organization)
+        self.assertEqual(media.content_hash, hashlib.sha256(self.content).hexdigest())
+        with media.file.open('rb') as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertEqual(MediaUploadSession.objects.get(pk=session_id).status, 'completed')
+
+    def test_incomplete_upload_cannot_complete(self):
+        session_id = self.start().data['id']
+        self.send(session_id, 0, self.content[:4])
+
+        response = self.client.post(reverse('media:upload_session_complete', args=[session_id]))
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Media.objects.exists())
+
+    def test_related_farmer_must_belong_to_organization(self):
+        other = Organization.objects.create(name='Other Org')
+        farmer = Farmer.objects.create(
+            organization=other, first_name='Ama', last_name='Owusu', phone_number='+233241234567'
+        )
+
+        response = self.start(related_farmer=str(farmer.pk))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('related_farmer', response.data)
+
+
+class MediaAccessTests(MediaAPITestCase):
+    """Media is only served to active members of its organization."""
+
+    def setUp(self):
+        super().setUp()
+        self.other = Organization.objects.create(name='Other Org')
+        self.media = Media.objects.create(
+            organization=self.other,
+            file=SimpleUploadedFile('report.txt', b'data'),
+            media_type='document',
+            file_name='report.txt',
+            file_size=4,
+            uploaded_by=self.user,
+        )
+
+    def test_other_organization_media_is_not_found(self):
+        for url_name in ('media:media_detail', 'media:media_file'):
+            with self.subTest(url_name):
+                response = self.client.get(reverse(url_name, args=[self.media.pk]))
+                self.assertEqual(response.status_code, 404)
+
+    def test_membership_is_required_without_organization(self):
+        # Without an organization header nothing limits the lookup but membership
+        self.client.credentials()
+
+        for url_name in ('media:media_detail', 'media:media_file'):
+            with self.subTest(url_name):
+                response = self.client.get(reverse(url_name, args=[self.media.pk]))
+                self.assertEqual(response.status_code, 404)
+
+    def test_inactive_membership_is_not_enough(self):
+        membership = OrganizationMembership.objects.create(
+            organization=self.other, user=self.user, role='country_admin', is_active=False
+        )
+        self.client.credentials(HTTP_X_ORGANIZATION_SLUG=self.other.slug)
+        response = self.client.get(reverse('media:media_file', args=[self.media.pk]))
+        self.assertEqual(response.status_code, 404)
+
+        membership.is_active = True
+        membership.save()
+        response = self.client.get(reverse('media:media_file', args=[self.media.pk]))
+        self.assertEqual(response.status_code, 200)
+
+
+class DerivativeTests(MediaAPITestCase):
+    """Signed thumbnail URLs and derivative rendering limits."""
+
+    def setUp(self):
+        from PIL import Image
+
+        super().setUp()
+        buffer = io.BytesIO()
+        Image.new('RGB', (64, 48), 'green').save(buffer, format='PNG')
+        self.png = buffer.getvalue()
+        self.media = Media.objects.create(
+            organization=self.organization,
+            file=SimpleUploadedFile('field.png', self.png),
+            media_type='image',
+            uploaded_by=self.user,
+        )
+        self.anonymous = APIClient()
+
+    def test_signed_thumbnail_url_loads_without_authentication(self):
+        response = self.anonymous.get(self.media.thumbnail_url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('image/'))
+
+    def test_signature_is_bound_to_media_and_size(self):
+        url = self.media.thumbnail_url
+        other = Media.objects.create(
+            organization=self.organization,
+            file=SimpleUploadedFile('other.png', self.png),
+            media_type='image',
+            uploaded_by=self.user,
+        )
+
+        for tampered in (
+            url.replace('size=thumb', 'size=large'),
+            url.replace(str(self.media.pk), str(other.pk)),
+            url[:-2],
+        ):
+            with self.subTest(tampered):
+                self.assertEqual(self.anonymous.get(tampered).status_code, 404)
+
+    def test_unsigned_request_requires_authentication(self):
+        url = reverse('media:media_derivative', args=[self.media.pk])
+
+        self.assertIn(self.anonymous.get(url).status_code, (401, 403))
+        self.assertEqual(self.client.get(url, {'size': 'small'}).status_code, 200)
+
+    def test_decompression_bomb_is_rejected(self):
+        from PIL import Image
+
+        url = reverse('media:media_derivative', args=[self.media.pk])
+        with mock.patch.object(Image, 'MAX_IMAGE_PIXELS', 100):
+            response = self.client.get(url, {'size': 'large'})
+
+        self.assertEqual(response.status_code, 400)
+
+
+class PruneDerivativeCacheTests(TestCase):
+    """The derivative cache is trimmed to its size bound, oldest first."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        override = override_settings(MEDIA_DERIVATIVE_CACHE_DIR=self.cache_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def write(self, name, size, age):
+        directory = os.path.join(self.cache_dir, name[:2], name)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, 'thumb.jpg')
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_least_recently_used_files_are_evicted(self):
+        oldest = self.write('aa01', 100, age=300)
+        older = self.write('ab02', 100, age=200)
+        newest = self.write('ac03', 100, age=100)
+
+        removed, freed = prune_derivative_cache(max_size=150)
+
+        self.assertEqual((removed, freed), (2, 200))
+        self.assertFalse(os.path.exists(oldest))
+        self.assertFalse(os.path.exists(older))
+        self.assertTrue(os.path.exists(newest))
+        self.assertFalse(os.path.exists(os.path.dirname(oldest)))
+
+    def test_cache_within_bound_is_untouched(self):
+        path = self.write('aa01', 100, age=100)
+
+        self.assertEqual(prune_derivative_cache(max_size=1000), (0, 0))
+        self.assertTrue(os.path.exists(path))
+
+
+class BackfillExifWorkerTests(MediaAPITestCase):
+    """Backfill workers read files from storage themselves, header first."""
+
+    def create_photo(self, size):
+        import random
+
+        from PIL import Image
+
+        image = Image.new('RGB', size)
+        # Noise so the JPEG is much larger than its EXIF header
+        image.putdata([tuple(random.randrange(256) for _ in range(3)) for _ in range(size[0] * size[1])])
+        exif = Image.Exif()
+        exif[0x010F] = 'Tecno'  # Make
+        exif[0x0110] = 'Spark 10'  # Model
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', exif=exif, quality=95)
+        return Media.objects.create(
+            organization=self.organization,
+            file=SimpleUploadedFile('farm.jpg', buffer.getvalue()),
+            media_type='image',
+            uploaded_by=self.user,
+        )
+
+    def test_job_carries_names_not_file_contents(self):
+        media = self.create_photo((32, 32))
+
+        job = backfill_media_exif.Command()
+        job.stats = {'bytes': 0}
+
+        self.assertEqual(job._job(media), (media.pk, media.file.path, media.file.name))
+
+    def test_storage_read_parses_exif_from_header(self):
+        media = self.create_photo((200, 200))
+        self.assertGreater(media.file.size, 4096)
+
+        with mock.patch.object(backfill_media_exif, 'EXIF_HEADER_BYTES', 4096):
+            media_id, result, error = backfill_media_exif._extract((media.pk, None, media.file.name))
+
+        self.assertIsNone(error)
+        self.assertEqual(media_id, media.pk)
+        self.assertEqual((result['camera_make'], result['camera_model']), ('Tecno', 'Spark 10'))
+        self.assertEqual((result['width'], result['height']), (200, 200))
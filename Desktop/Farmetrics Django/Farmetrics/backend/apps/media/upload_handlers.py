@@ -0,0 +1,54 @@
+"""
+Upload handlers that compute a content hash while the request body streams in.
+"""
+
+import hashlib
+
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler,
+)
+
+
+class HashingMemoryFileUploadHandler(MemoryFileUploadHandler):
+    """
+    In-memory upload handler that records the SHA-256 of each small file
+    as `content_hash` on the resulting UploadedFile.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.digest = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        # Large files are passed on to the next handler, which hashes them
+        if self.activated:
+            self.digest.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.content_hash = self.digest.hexdigest()
+        return file
+
+
+class HashingTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Temporary-file upload handler that records the SHA-256 of each file
+    as `content_hash` on the resulting UploadedFile.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.digest = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.digest.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.content_hash = self.digest.hexdigest()
+        return file
@@ -0,0 +1,337 @@
+"""
+Resumable chunked uploads for media files.
+
+Protocol:
+    1. init     - create a MediaUploadSession with the expected size/checksum
+    2. append   - send chunks in order, each at the session's current offset
+    3. complete - verify size/checksum and create the Media record
+
+Chunks are streamed straight to a temporary file on local disk, so neither
+the chunks nor the assembled file are ever held in memory. On completion the
+assembled file is handed to storage as a temporary file, which lets
+FileSystemStorage move it into place instead of copying it.
+"""
+
+import hashlib
+import logging
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.gis.geos import Point
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .hashing import hash_path
+from .models import Media, MediaUploadSession
+
+logger = logging.getLogger(__name__)
+
+
+class UploadSessionError(Exception):
+    """Error raised by the chunked upload protocol."""
+
+    def __init__(self, message, status_code=400, **extra):
+        super().__init__(message)
+        self.status_code = status_code
+        self.extra = extra
+
+
+class _AssembledUploadFile(File):
+    """
+    File wrapper for an assembled upload on local disk.
+
+    Exposes temporary_file_path() so FileSystemStorage moves the file
+    instead of streaming a copy of it.
+    """
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def get_upload_temp_dir():
+    """Return the directory holding in-progress uploads, creating it if needed."""
+    temp_dir = settings.MEDIA_UPLOAD_TEMP_DIR
+    os.makedirs(temp_dir, exist_ok=True)
+    return temp_dir
+
+
+def _session_expiry():
+    return timezone.now() + timedelta(hours=settings.MEDIA_UPLOAD_SESSION_TTL_HOURS)
+
+
+def _remove_temp_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Failed to remove upload temp file {path}: {e}")
+
+
+def create_upload_session(organization, user, file_name, total_size, checksum='',
+                          mime_type='', media_data=None):
+    """
+    Start a new chunked upload.
+
+    Args:
+        organization: Organization the media will belong to
+        user: Uploading user
+        file_name: Original file name
+        total_size: Expected size of the complete file in bytes
+        checksum: Optional SHA-256 hex digest of the complete file
+        mime_type: MIME type reported by the client
+        media_data: JSON-serializable Media attributes applied on completion
+
+    Returns:
+        MediaUploadSession instance
+    """
+    if total_size > settings.MEDIA_UPLOAD_MAX_SIZE:
+        raise UploadSessionError(
+            f"File exceeds the maximum upload size of {settings.MEDIA_UPLOAD_MAX_SIZE} bytes",
+            status_code=413
+        )
+
+    active_sessions = MediaUploadSession.objects.filter(
+        uploaded_by=user,
+        status='active',
+        expires_at__gt=timezone.now()
+    ).count()
+    if active_sessions >= settings.MEDIA_UPLOAD_MAX_ACTIVE_SESSIONS:
+        raise UploadSessionError(
+            "Too many active uploads. Complete or cancel an existing upload first.",
+            status_code=429
+        )
+
+    session = MediaUploadSession(
+        organization=organization,
+        uploaded_by=user,
+        file_name=os.path.basename(file_name),
+        total_size=total_size,
+        checksum=checksum.lower(),
+        mime_type=mime_type,
+        media_data=media_data or {},
+        expires_at=_session_expiry(),
+    )
+    session.temp_path = os.path.join(get_upload_temp_dir(), f"{session.id}.part")
+
+    # Create the (empty) temp file up front so appends can open it in r+b mode
+    open(session.temp_path, 'wb').close()
+    session.save()
+
+    return session
+
+
+def _get_locked_session(session_id, user):
+    """Fetch an active session owned by user, locking the row."""
+    try:
+        session = MediaUploadSession.objects.select_for_update().get(
+            pk=session_id,
+            uploaded_by=user
+        )
+    except MediaUploadSession.DoesNotExist:
+        raise UploadSessionError("Upload session not found", status_code=404)
+
+    if session.status != 'active':
+        raise UploadSessionError(
+            f"Upload session is {session.status}",
+            status_code=409,
+            status=session.status
+        )
+    if session.is_expired:
+        raise UploadSessionError("Upload session has expired", status_code=410)
+
+    return session
+
+
+def append_chunk(session_id, user, offset, chunk, chunk_checksum=''):
+    """
+    Append a chunk to an upload session.
+
+    The chunk must start exactly at the session's current offset; a client
+    resuming after a dropped connection should first read the session to
+    learn the offset. The session row is locked for the duration of the
+    write so concurrent appends to the same session are serialized.
+
+    Args:
+        session_id: MediaUploadSession id
+        user: Uploading user
+        offset: Byte offset the chunk starts at
+        chunk: Uploaded chunk (Django UploadedFile)
+        chunk_checksum: Optional SHA-256 hex digest of the chunk
+
+    Returns:
+        Updated MediaUploadSession instance
+    """
+    with transaction.atomic():
+        session = _get_locked_session(session_id, user)
+
+        if offset != session.bytes_received:
+            raise UploadSessionError(
+                "Chunk offset does not match the upload offset",
+                status_code=409,
+                offset=session.bytes_received
+            )
+        if chunk.size > settings.MEDIA_UPLOAD_MAX_CHUNK_SIZE:
+            raise UploadSessionError(
+                f"Chunk exceeds the maximum chunk size of {settings.MEDIA_UPLOAD_MAX_CHUNK_SIZE} bytes",
+                status_code=413
+            )
+        if offset + chunk.size > session.total_size:
+            raise UploadSessionError("Chunk extends past the declared file size")
+
+        digest = hashlib.sha256()
+        with open(session.temp_path, 'r+b') as f:
+            # Drop any bytes left behind by an interrupted earlier attempt
+            f.seek(offset)
+            f.truncate()
+            for block in chunk.chunks():
+                digest.update(block)
+                f.write(block)
+
+            if chunk_checksum and digest.hexdigest() != chunk_checksum.lower():
+                f.truncate(offset)
+                raise UploadSessionError(
+                    "Chunk checksum mismatch",
+                    offset=session.bytes_received
+                )
+
+        session.bytes_received = offset + chunk.size
+        session.expires_at = _session_expiry()
+        session.save(update_fields=['bytes_received', 'expires_at', 'updated_at'])
+
+    return session
+
+
+def _build_media(session):
+    """Build an unsaved Media instance from the session's stored attributes."""
+    data = dict(session.media_data)
+
+    latitude = data.pop('latitude', None)
+    longitude = data.pop('longitude', None)
+
+    media = Media(
+        organization=session.organization,
+        uploaded_by=session.uploaded_by,
+        file_name=session.file_name,
+        file_size=session.total_size,
+        mime_type=session.mime_type,
+        media_type=data.pop('media_type', ''),
+        title=data.pop('title', ''),
+        description=data.pop('description', ''),
+        tags=data.pop('tags', []),
+        related_farm_id=data.pop('related_farm', None),
+        related_farmer_id=data.pop('related_farmer', None),
+        gps_accuracy=data.pop('gps_accuracy', None),
+        is_public=data.pop('is_public', False),
+        metadata=data.pop('metadata', {}),
+    )
+    if latitude is not None and longitude is not None:
+        media.gps_location = Point(longitude, latitude, srid=4326)
+
+    return media
+
+
+def _check_related_records(media):
+    """
+    Make sure linked farms/farmers still exist in the organization.
+
+    Checked before the file is stored: a failing foreign key at commit
+    would leave the temporary file moved and the session unrecoverable.
+    """
+    from apps.farmers.models import Farmer
+    from apps.farms.models import Farm
+
+    if media.related_farm_id and not Farm.objects.filter(
+        pk=media.related_farm_id, organization_id=media.organization_id
+    ).exists():
+        raise UploadSessionError("Related farm not found", status_code=409)
+    if media.related_farmer_id and not Farmer.objects.filter(
+        pk=media.related_farmer_id, organization_id=media.organization_id
+    ).exists():
+        raise UploadSessionError("Related farmer not found", status_code=409)
+
+
+def complete_upload_session(session_id, user):
+    """
+    Finish an upload: verify size/checksum, store the file and create Media.
+
+    Args:
+        session_id: MediaUploadSession id
+        user: Uploading user
+
+    Returns:
+        The created Media instance
+    """
+    with transaction.atomic():
+        session = _get_locked_session(session_id, user)
+
+        if session.bytes_received != session.total_size:
+            raise UploadSessionError(
+                "Upload is incomplete",
+                status_code=409,
+                offset=session.bytes_received
+            )
+
+        content_hash = hash_path(session.temp_path)
+        if session.checksum and content_hash != session.checksum:
+            raise UploadSessionError("File checksum mismatch")
+
+        media = _build_media(session)
+        media.content_hash = content_hash
+        _check_related_records(media)
+
+        existing = Media.find_by_content_hash(session.organization_id, content_hash)
+        if existing:
+            # Identical file already stored for this organization
+            media.reuse_stored_file(existing)
+        else:
+            with open(session.temp_path, 'rb') as f:
+                media.file.save(session.file_name, _AssembledUploadFile(f), save=False)
+        media.save()
+
+        session.status = 'completed'
+        session.completed_at = timezone.now()
+        session.media = media
+        session.save(update_fields=['status', 'completed_at', 'media', 'updated_at'])
+
+    # FileSystemStorage moved the file; other storages copied it (or the
+    # stored file was reused)
+    _remove_temp_file(session.temp_path)
+
+    return media
+
+
+def abort_upload_session(session_id, user):
+    """Cancel an upload and discard the received bytes."""
+    with transaction.atomic():
+        session = _get_locked_session(session_id, user)
+        session.status = 'aborted'
+        session.save(update_fields=['status', 'updated_at'])
+
+    _remove_temp_file(session.temp_path)
+    return session
+
+
+def cleanup_expired_sessions():
+    """
+    Expire abandoned upload sessions and delete their temporary files.
+
+    Returns:
+        Number of sessions expired
+    """
+    expired = MediaUploadSession.objects.filter(
+        status='active',
+        expires_at__lte=timezone.now()
+    )
+
+    count = 0
+    for session in expired.iterator():
+        _remove_temp_file(session.temp_path)
+        count += MediaUploadSession.objects.filter(
+            pk=session.pk,
+            status='active'
+        ).update(status='expired', updated_at=timezone.now())
+
+    return count
@@ -12,5 +12,13 @@ urlpatterns = [
     path('', views.MediaListView.as_view(), name='media_list'),
     path('<uuid:pk>/', views.MediaDetailView.as_view(), name='media_detail'),
     path('<uuid:pk>/verify/', views.MediaVerifyView.as_view(), name='media_verify'),
+    path('<uuid:pk>/file/', views.MediaFileView.as_view(), name='media_file'),
+    path('<uuid:pk>/derivative/', views.MediaDerivativeView.as_view(), name='media_derivative'),
+    
+    # Chunked uploads
+    path('uploads/', views.MediaUploadSessionCreateView.as_view(), name='upload_session_create'),
+    path('uploads/<uuid:pk>/', views.MediaUploadSessionDetailView.as_view(), name='upload_session_detail'),
+    path('uploads/<uuid:pk>/chunks/', views.MediaUploadChunkView.as_view(), name='upload_session_chunk'),
+    path('uploads/<uuid:pk>/complete/', views.MediaUploadCompleteView.as_view(), name='upload_session_complete'),
 ]
 
@@ -3,19 +3,92 @@ Views for media app.
 """
 
 from rest_framework import generics, status, permissions, filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.negotiation import BaseContentNegotiation
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
 
-from .models import Media
+from apps.regions.scoping import scope_media
+
+from .models import Media, MediaUploadSession
 from .serializers import (
     MediaSerializer,
     MediaListSerializer,
     MediaUploadSerializer,
+    MediaUploadSessionSerializer,
+    MediaUploadSessionCreateSerializer,
+    MediaUploadChunkSerializer,
+)
+from .serving import (
+    DERIVATIVE_SIZES,
+    DERIVATIVE_FORMATS,
+    DerivativeError,
+    check_derivative_signature,
+    choose_format,
+    serve_derivative,
+    serve_media_file,
+)
+from .spatial import parse_bbox, filter_within_bbox, filter_within_radius
+from .uploads import (
+    UploadSessionError,
+    create_upload_session,
+    append_chunk,
+    complete_upload_session,
+    abort_upload_session,
 )
 
 
+class FileContentNegotiation(BaseContentNegotiation):
+    """
+    Skip Accept-header negotiation for views returning raw file responses,
+    so image/video Accept headers don't produce 406 errors.
+    """
+    
+    def select_parser(self, request, parsers):
+        return parsers[0]
+    
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return (renderers[0], renderers[0].media_type)
+
+
+def _member_media(queryset, request):
+    """Limit media to organizations the user is an active member of (superusers see all)."""
+    if request.user.is_superuser:
+        return queryset
+    return queryset.filter(
+        organization__memberships__user=request.user,
+        organization__memberships__is_active=True
+    )
+
+
+def _get_media_for_request(request, pk):
+    """
+    Get media by id within the request organization and the user's regions, or None.
+
+    Membership is checked even when no organization was resolved for the
+    request, so media of other organizations is never served.
+    """
+    try:
+        media = _member_media(scope_media(Media.objects.all(), request), request).get(pk=pk)
+    except Media.DoesNotExist:
+        return None
+    
+    if hasattr(request, 'organization') and request.organization:
+        if media.organization != request.organization:
+            return None
+    
+    return media
+
+
+def _upload_error_response(error):
+    return Response(
+        {"error": str(error), **error.extra},
+        status=error.status_code
+    )
+
+
 class MediaListView(generics.ListCreateAPIView):
     """
     List all media or upload new media.
@@ -35,8 +108,40 @@ class MediaListView(generics.ListCreateAPIView):
     
     @extend_schema(
         summary="List media",
-        description="Get list of all media files with filtering",
-        tags=["Media"]
+        description="Get list of all media files with filtering. "
+                    "Geotagged media can be filtered for map views with "
+                    "bbox=min_lon,min_lat,max_lon,max_lat or latitude/longitude/radius_km.",
+        tags=["Media"],
+        parameters=[
+            {
+                'name': 'bbox',
+                'in': 'query',
+                'description': 'Bounding box: min_lon,min_lat,max_lon,max_lat',
+                'required': False,
+                'schema': {'type': 'string'}
+            },
+            {
+                'name': 'latitude',
+                'in': 'query',
+                'description': 'Latitude of radius search center',
+                'required': False,
+                'schema': {'type': 'number'}
+            },
+            {
+                'name': 'longitude',
+                'in': 'query',
+                'description': 'Longitude of radius search center',
+                'required': False,
+                'schema': {'type': 'number'}
+            },
+            {
+                'name': 'radius_km',
+                'in': 'query',
+                'description': 'Search radius in kilometers (max 100)',
+                'required': False,
+                'schema': {'type': 'number'}
+            }
+        ]
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
@@ -56,8 +161,40 @@ class MediaListView(generics.ListCreateAPIView):
         if hasattr(self.request, 'organization') and self.request.organization:
             queryset = queryset.filter(organization=self.request.organization)
         
+        # Spatial filters for map views
+        queryset = self._filter_by_location(queryset)
+        
+        # Limit supervisors and field officers to their assigned regions
+        # (their own uploads stay visible)
+        queryset = scope_media(queryset, self.request)
+        
         return queryset.select_related('uploaded_by', 'related_farm', 'related_farmer')
     
+    def _filter_by_location(self, queryset):
+        params = self.request.query_params
+        
+        bbox = params.get('bbox')
+        if bbox:
+            try:
+                queryset = filter_within_bbox(queryset, parse_bbox(bbox))
+            except ValueError as e:
+                raise ValidationError({'bbox': str(e)})
+        
+        if 'latitude' in params or 'longitude' in params or 'radius_km' in params:
+            try:
+                latitude = float(params['latitude'])
+                longitude = float(params['longitude'])
+                radius_km = float(params.get('radius_km', 1))
+            except (KeyError, ValueError):
+                raise ValidationError(
+                    {'radius': 'latitude and longitude are required numbers; radius_km must be a number'}
+                )
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180 and 0 < radius_km <= 100):
+                raise ValidationError({'radius': 'Coordinates or radius_km out of range'})
+            queryset = filter_within_radius(queryset, latitude, longitude, radius_km * 1000)
+        
+        return queryset
+    
     def perform_create(self, serializer):
         # Set organization and uploaded_by
         if hasattr(self.request, 'organization') and self.request.organization:
@@ -113,6 +250,9 @@ class MediaDetailView(generics.RetrieveUpdateDestroyAPIView):
         if hasattr(self.request, 'organization') and self.request.organization:
             queryset = queryset.filter(organization=self.request.organization)
         
+        # Media outside the user's organizations and regions is not found
+        queryset = _member_media(scope_media(queryset, self.request), self.request)
+        
         return queryset.select_related('uploaded_by', 'related_farm', 'related_farmer')
 
 
@@ -129,7 +269,7 @@ class MediaVerifyView(APIView):
     )
     def post(self, request, pk):
         try:
-            media = Media.objects.get(pk=pk)
+            media = _member_media(scope_media(Media.objects.all(), request), request).get(pk=pk)
             
             # Check organization access
             if hasattr(request, 'organization') and request.organization:
@@ -152,3 +292,259 @@ class MediaVerifyView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+
+
+class MediaUploadSessionCreateView(APIView):
+    """
+    Start a resumable chunked upload.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    @extend_schema(
+        summary="Start chunked upload",
+        description="Create an upload session for a large file; send chunks to the returned session",
+        request=MediaUploadSessionCreateSerializer,
+        responses={201: MediaUploadSessionSerializer},
+        tags=["Media"]
+    )
+    def post(self, request):
+        if not hasattr(request, 'organization') or not request.organization:
+            return Response(
+                {"error": "Organization context required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        serializer = MediaUploadSessionCreateSerializer(
+            data=request.data,
+            context={'organization': request.organization}
+        )
+        serializer.is_valid(raise_exception=True)
+        
+        try:
+            session = create_upload_session(
+                organization=request.organization,
+                user=request.user,
+                file_name=serializer.validated_data['file_name'],
+                total_size=serializer.validated_data['total_size'],
+                checksum=serializer.validated_data.get('checksum', ''),
+                mime_type=serializer.validated_data.get('mime_type', ''),
+                media_data=serializer.get_media_data()
+            )
+        except UploadSessionError as e:
+            return _upload_error_response(e)
+        
+        return Response(
+            MediaUploadSessionSerializer(session).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class MediaUploadSessionDetailView(APIView):
+    """
+    Get the state of a chunked upload (to resume it) or cancel it.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    @extend_schema(
+        summary="Get upload session",
+        description="Get the current offset of a chunked upload so an interrupted upload can resume",
+        responses={200: MediaUploadSessionSerializer},
+        tags=["Media"]
+    )
+    def get(self, request, pk):
+        try:
+            session = MediaUploadSession.objects.get(pk=pk, uploaded_by=request.user)
+        except MediaUploadSession.DoesNotExist:
+            return Response(
+                {"error": "Upload session not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        return Response(MediaUploadSessionSerializer(session).data)
+    
+    @extend_schema(
+        summary="Cancel upload session",
+        description="Cancel a chunked upload and discard the received data",
+        tags=["Media"]
+    )
+    def delete(self, request, pk):
+        try:
+            abort_upload_session(pk, request.user)
+        except UploadSessionError as e:
+            return _upload_error_response(e)
+        
+        return Response(
+            {"message": "Upload cancelled"},
+            status=status.HTTP_200_OK
+        )
+
+
+class MediaUploadChunkView(APIView):
+    """
+    Append a chunk to a chunked upload.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    @extend_schema(
+        summary="Upload chunk",
+        description="Append a chunk at the session's current offset. "
+                    "A mismatched offset returns 409 with the expected offset.",
+        request=MediaUploadChunkSerializer,
+        responses={200: MediaUploadSessionSerializer},
+        tags=["Media"]
+    )
+    def post(self, request, pk):
+        serializer = MediaUploadChunkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        try:
+            session = append_chunk(
+                pk,
+                request.user,
+                offset=serializer.validated_data['offset'],
+                chunk=serializer.validated_data['chunk'],
+                chunk_checksum=serializer.validated_data.get('checksum', '')
+            )
+        except UploadSessionError as e:
+            return _upload_error_response(e)
+        
+        return Response(MediaUploadSessionSerializer(session).data)
+
+
+class MediaUploadCompleteView(APIView):
+    """
+    Complete a chunked upload and create the media record.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    @extend_schema(
+        summary="Complete chunked upload",
+        description="Verify the assembled file and create the media record",
+        responses={201: MediaSerializer},
+        tags=["Media"]
+    )
+    def post(self, request, pk):
+        try:
+            media = complete_upload_session(pk, request.user)
+        except UploadSessionError as e:
+            return _upload_error_response(e)
+        
+        return Response(
+            MediaSerializer(media).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class MediaDerivativeView(APIView):
+    """
+    Serve a resized/recompressed variant of an image.
+    
+    Requests carrying a valid ``signature`` (see Media.thumbnail_url) are
+    served without authentication, so derivatives load in ``<img>`` tags.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    content_negotiation_class = FileContentNegotiation
+    
+    def get_permissions(self):
+        if 'signature' in self.request.query_params:
+            # Checked against the media ID and size in get()
+            return [permissions.AllowAny()]
+        return super().get_permissions()
+    
+    @extend_schema(
+        summary="Get image derivative",
+        description="Get a resized image variant, cached on the server and "
+                    "served with ETag/Cache-Control headers",
+        tags=["Media"],
+        parameters=[
+            {
+                'name': 'size',
+                'in': 'query',
+                'description': f"Variant size ({', '.join(DERIVATIVE_SIZES)})",
+                'required': False,
+                'schema': {'type': 'string', 'default': 'medium'}
+            },
+            {
+                'name': 'format',
+                'in': 'query',
+                'description': f"Output format ({', '.join(DERIVATIVE_FORMATS)}); "
+                               "defaults to webp when accepted by the client",
+                'required': False,
+                'schema': {'type': 'string'}
+            },
+            {
+                'name': 'signature',
+                'in': 'query',
+                'description': "Signature from a signed derivative URL; replaces authentication",
+                'required': False,
+                'schema': {'type': 'string'}
+            }
+        ],
+        responses={(200, 'image/*'): bytes}
+    )
+    def get(self, request, pk):
+        size = request.query_params.get('size', 'medium')
+        signature = request.query_params.get('signature')
+        if signature:
+            media = None
+            if check_derivative_signature(signature, pk, size):
+                media = Media.objects.filter(pk=pk).first()
+        else:
+            media = _get_media_for_request(request, pk)
+        if not media:
+            return Response(
+                {"error": "Media not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        if size not in DERIVATIVE_SIZES:
+            return Response(
+                {"error": f"Invalid size. Choose from: {', '.join(DERIVATIVE_SIZES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        requested_format = request.query_params.get('format')
+        if requested_format and requested_format not in DERIVATIVE_FORMATS:
+            return Response(
+                {"error": f"Invalid format. Choose from: {', '.join(DERIVATIVE_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            return serve_derivative(
+                request._request,
+                media,
+                size,
+                choose_format(request, requested_format),
+                vary_accept=not requested_format
+            )
+        except DerivativeError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+
+class MediaFileView(APIView):
+    """
+    Serve the original media file with HTTP Range support.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    content_negotiation_class = FileContentNegotiation
+    
+    @extend_schema(
+        summary="Download media file",
+        description="Stream the original file. Supports Range requests for video "
+                    "playback and conditional requests via ETag.",
+        tags=["Media"],
+        responses={(200, 'application/octet-stream'): bytes}
+    )
+    def get(self, request, pk):
+        media = _get_media_for_request(request, pk)
+        if not media or not media.file:
+            return Response(
+                {"error": "Media not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        return serve_media_file(request._request, media)
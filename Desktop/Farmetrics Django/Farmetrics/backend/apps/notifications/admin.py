@@ -3,7 +3,9 @@ Admin configuration for Notifications app.
 """
 
 from django.contrib import admin
-from .models import Notification, NotificationPreference
+from .models import (
+    Notification, NotificationDeadLetter, NotificationDelivery, NotificationPreference
+)
 
 
 @admin.register(Notification)
@@ -55,3 +57,47 @@ class NotificationPreferenceAdmin(admin.ModelAdmin):
     readonly_fields = ['id', 'created_at', 'updated_at']
     autocomplete_fields = ['user']
 
+
+
+@admin.register(NotificationDelivery)
+class NotificationDeliveryAdmin(admin.ModelAdmin):
+    """Admin interface for NotificationDelivery model."""
+    
+    list_display = [
+        'recipient', 'channel', 'status', 'attempts',
+        'next_attempt_at', 'sent_at', 'created_at'
+    ]
+    list_filter = ['channel', 'status', 'provider', 'created_at']
+    search_fields = ['recipient', 'notification__title']
+    readonly_fields = ['id', 'notification', 'created_at', 'updated_at', 'sent_at']
+    date_hierarchy = 'created_at'
+    
+    fieldsets = (
+        ('Delivery', {
+            'fields': ('notification', 'channel', 'recipient', 'provider')
+        }),
+        ('Status', {
+            'fields': ('status', 'attempts', 'next_attempt_at', 'sent_at', 'last_error')
+        }),
+        ('System Information', {
+            'fields': ('id', 'created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
+
+
+@admin.register(NotificationDeadLetter)
+class NotificationDeadLetterAdmin(admin.ModelAdmin):
+    """Admin interface for NotificationDeadLetter model."""
+    
+    list_display = ['recipient', 'channel', 'provider', 'attempts', 'is_resolved', 'created_at']
+    list_filter = ['channel', 'provider', 'is_resolved', 'created_at']
+    search_fields = ['recipient', 'error']
+    readonly_fields = ['id', 'delivery', 'created_at', 'updated_at', 'resolved_at']
+    actions = ['replay']
+    
+    @admin.action(description='Retry selected deliveries')
+    def replay(self, request, queryset):
+        from .delivery import replay_dead_letters
+        requeued = replay_dead_letters(queryset)
+        self.message_user(request, f'{requeued} deliveries queued for retry.')
@@ -0,0 +1,65 @@
+"""
+WebSocket consumers for notifications app.
+"""
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .realtime import user_group_name
+
+# Close code for unauthenticated connections (4000-4999 are application codes)
+CLOSE_UNAUTHORIZED = 4401
+
+
+class NotificationConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Pushes a user's new notifications and unread count changes.
+    
+    Messages sent to the client:
+        {"type": "unread_count", "unread_count": 5} on connect
+        {"type": "notification.created", "notification": {...}, "unread_count_delta": 1}
+        {"type": "unread_count.changed", "unread_count_delta": -2}
+    """
+    
+    async def connect(self):
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close(code=CLOSE_UNAUTHORIZED)
+            return
+        
+        self.group_name = user_group_name(user.pk)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        
+        # Initial count so the client does not need to poll the REST endpoint
+        await self.send_json({
+            'type': 'unread_count',
+            'unread_count': await self.get_unread_count(user),
+        })
+    
+    async def disconnect(self, code):
+        if hasattr(self, 'group_name'):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+    
+    async def receive_json(self, content, **kwargs):
+        if content.get('type') == 'ping':
+            await self.send_json({'type': 'pong'})
+    
+    async def notification_created(self, event):
+        await self.send_json({
+            'type': 'notification.created',
+            'notification': event['notification'],
+            'unread_count_delta': 1,
+        })
+    
+    async def unread_count_changed(self, event):
+        await self.send_json({
+            'type': 'unread_count.changed',
+            'unread_count_delta': event['delta'],
+        })
+    
+    @database_sync_to_async
+    def get_unread_count(self, user):
+        from .counters import get_unread_count
+        
+        return get_unread_count(user.pk)
@@ -0,0 +1,157 @@
+"""
+Cached per-user unread notification counters.
+
+The unread count is read on every poll and on every WebSocket connect, so
+it is kept in Redis instead of running COUNT(*) each time. Counters are
+adjusted after commit when notifications are created or marked read, and
+only if the key already exists: a missing key is rebuilt from the
+database on the next read, so adjustments never start from a wrong
+baseline. Counters also expire after NOTIFICATION_UNREAD_COUNT_TIMEOUT,
+which bounds the effect of any drift (e.g. notifications deleted by
+cascades).
+
+A rebuild sets a short-lived marker before it counts. An adjustment that
+finds no counter clears the marker, and the rebuilt value is only stored
+if the marker is still the reader's own, so a COUNT that raced with a
+create or mark-read is returned but never cached.
+"""
+
+import logging
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# Seconds a rebuild may take before its marker expires (the count is then not cached)
+REBUILD_MARKER_TIMEOUT = 30
+
+# INCRBY only when the counter exists; drop it if it would go negative.
+# Without a counter, invalidate any rebuild in progress.
+_ADJUST_SCRIPT = """
+if redis.call('exists', KEYS[1]) == 0 then
+    redis.call('del', KEYS[2])
+    return nil
+end
+local value = redis.call('incrby', KEYS[1], ARGV[1])
+if value < 0 then
+    redis.call('del', KEYS[1])
+end
+return value
+"""
+
+# Store a rebuilt count only if the rebuild was not invalidated meanwhile
+_STORE_SCRIPT = """
+if redis.call('get', KEYS[2]) == ARGV[1] then
+    redis.call('del', KEYS[2])
+    redis.call('set', KEYS[1], ARGV[2], 'EX', ARGV[3], 'NX')
+end
+"""
+
+
+def _key(user_id):
+    return f'notifications_unread:{user_id}'
+
+
+def _marker_key(user_id):
+    return f'notifications_unread_rebuild:{user_id}'
+
+
+def _redis_client():
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+    except (ImportError, NotImplementedError):
+        # Non-Redis cache backends (local development, tests)
+        return None
+
+
+def _count_unread(user_id):
+    from .models import Notification
+    return Notification.objects.filter(user_id=user_id, is_read=False).count()
+
+
+def get_unread_count(user_id):
+    """Unread notification count for a user (rebuilt from the database on a miss)."""
+    count = cache.get(_key(user_id))
+    if count is not None:
+        return count
+
+    token = uuid.uuid4().hex
+    client = _redis_client()
+    if client is None:
+        cache.set(_marker_key(user_id), token, timeout=REBUILD_MARKER_TIMEOUT)
+        count = _count_unread(user_id)
+        if cache.get(_marker_key(user_id)) == token:
+            cache.delete(_marker_key(user_id))
+            cache.add(_key(user_id), count, timeout=settings.NOTIFICATION_UNREAD_COUNT_TIMEOUT)
+        return count
+
+    marker_key = cache.make_key(_marker_key(user_id))
+    client.set(marker_key, token, ex=REBUILD_MARKER_TIMEOUT)
+    count = _count_unread(user_id)
+    client.register_script(_STORE_SCRIPT)(
+        keys=[cache.make_key(_key(user_id)), marker_key],
+        args=[token, count, settings.NOTIFICATION_UNREAD_COUNT_TIMEOUT],
+    )
+    return count
+
+
+def _apply(deltas):
+    client = _redis_client()
+    if client is None:
+        for user_id, delta in deltas.items():
+            try:
+                if cache.incr(_key(user_id), delta) < 0:
+                    cache.delete(_key(user_id))
+            except ValueError:
+                cache.delete(_marker_key(user_id))
+        return
+
+    script = client.register_script(_ADJUST_SCRIPT)
+    pipeline = client.pipeline(transaction=False)
+    for user_id, delta in deltas.items():
+        script(
+            keys=[cache.make_key(_key(user_id)), cache.make_key(_marker_key(user_id))],
+            args=[delta],
+            client=pipeline,
+        )
+    pipeline.execute()
+
+
+def adjust_unread_counts(deltas):
+    """
+    Adjust unread counters after the current transaction commits.
+
+    Args:
+        deltas: Dictionary mapping user ID to count change (e.g. {user_id: -3})
+    """
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    def apply():
+        try:
+            _apply(deltas)
+        except Exception as e:
+            # Stale counters expire; never fail the request over them
+            logger.warning(f"Failed to adjust unread counters: {e}")
+            for user_id in deltas:
+                cache.delete(_key(user_id))
+
+    transaction.on_commit(apply)
+
+
+def notifications_created(notifications):
+    """Count newly created notifications towards their users' unread counters."""
+    adjust_unread_counts(Counter(
+        notification.user_id for notification in notifications if not notification.is_read
+    ))
+
+
+def notifications_read(user_id, count):
+    """Subtract notifications marked as read from a user's unread counter."""
+    adjust_unread_counts({user_id: -count})
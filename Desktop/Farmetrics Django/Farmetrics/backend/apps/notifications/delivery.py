@@ -0,0 +1,343 @@
+"""
+Outbound email/SMS delivery queue.
+
+Notifications for users who enabled email or SMS are queued as
+NotificationDelivery rows in the same transaction that creates them, so
+nothing is sent for a rolled-back notification and nothing is lost if a
+worker dies. Celery workers claim due rows per channel in batches with
+SELECT ... FOR UPDATE SKIP LOCKED (several workers never send the same
+row), send each batch over one provider connection and respect the
+provider's rate limit with a shared Redis counter. Failed deliveries are
+retried with exponential backoff; after NOTIFICATION_DELIVERY_MAX_ATTEMPTS
+they are moved to the dead-letter table (NotificationDeadLetter).
+
+New deliveries, the per-minute beat and a task continuing its own work
+all go through schedule_deliveries(), which queues at most one pending
+processing task per channel, so bursts of notifications do not flood the
+broker with tasks that find nothing to claim.
+"""
+
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import NotificationDeadLetter, NotificationDelivery, NotificationPreference
+from .providers import DeliveryError, get_provider
+
+logger = logging.getLogger(__name__)
+
+# Preference flag and default (no preferences saved) per channel
+CHANNEL_PREFERENCES = {
+    'email': ('email_enabled', True),
+    'sms': ('sms_enabled', False),
+}
+
+
+def _recipients(user_ids, channels):
+    """{channel: {user_id: address}} for users who receive those channels."""
+    from apps.accounts.models import User
+
+    preferences = {
+        row['user_id']: row
+        for row in NotificationPreference.objects.filter(user_id__in=user_ids).values(
+            'user_id', 'email_enabled', 'sms_enabled'
+        )
+    }
+    users = User.objects.filter(id__in=user_ids, is_active=True).values_list(
+        'id', 'email', 'phone_number'
+    )
+
+    recipients = {channel: {} for channel in channels}
+    for user_id, email, phone_number in users:
+        addresses = {'email': email, 'sms': str(phone_number) if phone_number else ''}
+        for channel in channels:
+            field, default = CHANNEL_PREFERENCES[channel]
+            enabled = preferences[user_id][field] if user_id in preferences else default
+            if enabled and addresses[channel]:
+                recipients[channel][user_id] = addresses[channel]
+    return recipients
+
+
+def enqueue_deliveries(notifications):
+    """
+    Queue email/SMS deliveries for newly created notifications.
+
+    Only channels listed in NOTIFICATION_DELIVERY_CHANNELS are queued, for
+    users who enabled them in their preferences. Processing starts after
+    the current transaction commits.
+
+    Args:
+        notifications: Saved Notification instances
+
+    Returns:
+        Number of deliveries queued
+    """
+    channels = [
+        channel for channel in settings.NOTIFICATION_DELIVERY_CHANNELS
+        if channel in CHANNEL_PREFERENCES
+    ]
+    if not channels or not notifications:
+        return 0
+
+    recipients = _recipients({n.user_id for n in notifications}, channels)
+    now = timezone.now()
+    deliveries = [
+        NotificationDelivery(
+            notification=notification,
+            channel=channel,
+            recipient=recipients[channel][notification.user_id],
+            next_attempt_at=now,
+        )
+        for notification in notifications
+        for channel in channels
+        if notification.user_id in recipients[channel]
+    ]
+    if not deliveries:
+        return 0
+
+    NotificationDelivery.objects.bulk_create(
+        deliveries, batch_size=settings.NOTIFICATION_FANOUT_BATCH_SIZE
+    )
+
+    for channel in {delivery.channel for delivery in deliveries}:
+        transaction.on_commit(lambda channel=channel: schedule_deliveries(channel))
+    return len(deliveries)
+
+
+def _schedule_key(channel):
+    return f'notification_delivery_scheduled:{channel}'
+
+
+def schedule_deliveries(channel, countdown=0):
+    """
+    Queue a processing task for a channel unless one is already pending.
+
+    The marker is cleared when the task starts (see release_schedule), so
+    deliveries queued while a batch is being sent still get a follow-up
+    task. It also expires on its own in case the queued task is lost.
+
+    Args:
+        channel: "email" or "sms"
+        countdown: Seconds before the task runs
+
+    Returns:
+        True if a task was queued
+    """
+    from .tasks import process_notification_deliveries
+
+    timeout = countdown + settings.NOTIFICATION_DELIVERY_SCHEDULE_TIMEOUT
+    if not cache.add(_schedule_key(channel), 1, timeout=timeout):
+        return False
+    process_notification_deliveries.apply_async((channel,), countdown=countdown)
+    return True
+
+
+def release_schedule(channel):
+    """Allow the next processing task for a channel to be queued."""
+    cache.delete(_schedule_key(channel))
+
+
+def _rate_key(provider):
+    window = int(time.time() // provider.rate_limit_window)
+    return f'notification_delivery_rate:{provider.name}:{provider.channel}:{window}'
+
+
+def acquire_rate_limit(provider, count):
+    """
+    Reserve up to count sends in the provider's current rate limit window.
+
+    Uses a fixed-window counter in the shared cache so the limit holds
+    across all workers.
+
+    Returns:
+        Number of sends allowed now (0 when the window is exhausted)
+    """
+    if not provider.rate_limit:
+        return count
+
+    key = _rate_key(provider)
+    cache.add(key, 0, timeout=provider.rate_limit_window * 2)
+    try:
+        used = cache.incr(key, count)
+    except ValueError:
+        # Key evicted between add and incr
+        return 0
+
+    allowed = max(0, min(count, provider.rate_limit - (used - count)))
+    release_rate_limit(provider, count - allowed)
+    return allowed
+
+
+def release_rate_limit(provider, count):
+    """Give back reserved sends that were not used."""
+    if not provider.rate_limit or count <= 0:
+        return
+    try:
+        cache.decr(_rate_key(provider), count)
+    except ValueError:
+        pass
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt: base * 2^(attempts - 1), capped."""
+    delay = settings.NOTIFICATION_DELIVERY_RETRY_BASE_SECONDS * (2 ** max(0, attempts - 1))
+    return timedelta(seconds=min(delay, settings.NOTIFICATION_DELIVERY_RETRY_MAX_SECONDS))
+
+
+def _claim(channel, limit):
+    """Mark up to limit due deliveries as sending and return their IDs."""
+    with transaction.atomic():
+        ids = list(
+            NotificationDelivery.objects.select_for_update(skip_locked=True).filter(
+                channel=channel,
+                status='pending',
+                next_attempt_at__lte=timezone.now(),
+            ).order_by('next_attempt_at').values_list('id', flat=True)[:limit]
+        )
+        if ids:
+            NotificationDelivery.objects.filter(id__in=ids).update(
+                status='sending', updated_at=timezone.now()
+            )
+    return ids
+
+
+def _fail(delivery, error, permanent=False):
+    """Schedule a retry, or dead-letter the delivery when attempts run out."""
+    delivery.last_error = str(error)[:2000]
+    if permanent or delivery.attempts >= settings.NOTIFICATION_DELIVERY_MAX_ATTEMPTS:
+        delivery.status = 'dead'
+        delivery.next_attempt_at = None
+        with transaction.atomic():
+            delivery.save(update_fields=['status', 'attempts', 'last_error', 'provider', 'next_attempt_at', 'updated_at'])
+            NotificationDeadLetter.objects.update_or_create(
+                delivery=delivery,
+                defaults={
+                    'channel': delivery.channel,
+                    'recipient': delivery.recipient,
+                    'provider': delivery.provider,
+                    'attempts': delivery.attempts,
+                    'error': delivery.last_error,
+                    'is_resolved': False,
+                    'resolved_at': None,
+                }
+            )
+        logger.warning(f"Delivery {delivery.id} dead-lettered after {delivery.attempts} attempts: {error}")
+    else:
+        delivery.status = 'pending'
+        delivery.next_attempt_at = timezone.now() + retry_delay(delivery.attempts)
+        delivery.save(update_fields=['status', 'attempts', 'last_error', 'provider', 'next_attempt_at', 'updated_at'])
+
+
+def process_deliveries(channel, batch_size=None):
+    """
+    Send one batch of due deliveries for a channel.
+
+    Args:
+        channel: "email" or "sms"
+        batch_size: Deliveries per batch (defaults to NOTIFICATION_DELIVERY_BATCH_SIZE)
+
+    Returns:
+        Dictionary with "sent", "failed" and "remaining" (True if more
+        deliveries may be due)
+    """
+    batch_size = batch_size or settings.NOTIFICATION_DELIVERY_BATCH_SIZE
+    provider = get_provider(channel)
+
+    allowed = acquire_rate_limit(provider, batch_size)
+    if not allowed:
+        return {'sent': 0, 'failed': 0, 'remaining': True}
+
+    ids = _claim(channel, allowed)
+    release_rate_limit(provider, allowed - len(ids))
+    if not ids:
+        return {'sent': 0, 'failed': 0, 'remaining': False}
+
+    deliveries = list(
+        NotificationDelivery.objects.filter(id__in=ids).select_related('notification')
+    )
+    sent = []
+    failed = 0
+
+    try:
+        provider.open()
+    except Exception as e:
+        # Connection failure counts as an attempt for the whole batch
+        for delivery in deliveries:
+            delivery.attempts += 1
+            delivery.provider = provider.name
+            _fail(delivery, e)
+        logger.error(f"Failed to open {provider.name} connection: {e}")
+        return {'sent': 0, 'failed': len(deliveries), 'remaining': True}
+
+    try:
+        for delivery in deliveries:
+            delivery.attempts += 1
+            delivery.provider = provider.name
+            try:
+                provider.send(delivery)
+            except DeliveryError as e:
+                failed += 1
+                _fail(delivery, e, permanent=e.permanent)
+            except Exception as e:
+                failed += 1
+                _fail(delivery, e)
+            else:
+                sent.append(delivery)
+    finally:
+        provider.close()
+
+    if sent:
+        now = timezone.now()
+        for delivery in sent:
+            delivery.status = 'sent'
+            delivery.sent_at = now
+            delivery.next_attempt_at = None
+            delivery.last_error = ''
+            delivery.updated_at = now
+        NotificationDelivery.objects.bulk_update(
+            sent,
+            ['status', 'sent_at', 'attempts', 'provider', 'next_attempt_at', 'last_error', 'updated_at'],
+        )
+
+    return {'sent': len(sent), 'failed': failed, 'remaining': len(ids) == allowed}
+
+
+def requeue_stale_deliveries():
+    """
+    Return deliveries stuck in "sending" (worker died mid-batch) to the queue.
+
+    Returns:
+        Number of deliveries requeued
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.NOTIFICATION_DELIVERY_STALE_SECONDS)
+    return NotificationDelivery.objects.filter(
+        status='sending', updated_at__lt=cutoff
+    ).update(status='pending', next_attempt_at=timezone.now(), updated_at=timezone.now())
+
+
+def replay_dead_letters(queryset):
+    """
+    Queue dead-lettered deliveries for another round of attempts.
+
+    Args:
+        queryset: NotificationDeadLetter queryset
+
+    Returns:
+        Number of deliveries requeued
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        dead_letters = list(queryset.filter(is_resolved=False).select_for_update())
+        delivery_ids = [dead_letter.delivery_id for dead_letter in dead_letters]
+        requeued = NotificationDelivery.objects.filter(
+            id__in=delivery_ids, status='dead'
+        ).update(status='pending', attempts=0, next_attempt_at=now, updated_at=now)
+        NotificationDeadLetter.objects.filter(
+            id__in=[dead_letter.id for dead_letter in dead_letters]
+        ).update(is_resolved=True, resolved_at=now, updated_at=now)
+    return requeued
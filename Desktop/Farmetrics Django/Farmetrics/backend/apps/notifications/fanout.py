@@ -0,0 +1,181 @@
+"""
+Batched notification fan-out.
+
+Notifying a whole audience (specific users, everyone with a role, the
+supervisors of a region, an organization) resolves the recipients with a
+few set-based queries, loads their preferences in one query and inserts
+the notifications with bulk_create in batches. Large audiences are handed
+to a Celery task so the request that triggered them stays fast.
+
+An audience is a JSON-serializable dict so it can be passed to Celery:
+
+    {
+        "organization_id": "<uuid>",      # required for roles/regions/all_members
+        "user_ids": ["<uuid>", ...],
+        "roles": ["supervisor", ...],
+        "region_ids": ["<uuid>", ...],    # supervisors of these regions and their ancestors
+        "all_members": false,
+        "exclude_user_ids": ["<uuid>", ...],
+    }
+"""
+
+import logging
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Notification, NotificationPreference
+from .counters import notifications_created
+from .delivery import enqueue_deliveries
+from .realtime import push_notifications
+
+logger = logging.getLogger(__name__)
+
+# Notification fields that can be passed in a fan-out payload
+PAYLOAD_FIELDS = {
+    'notification_type', 'title', 'message', 'priority', 'action_url', 'action_text',
+    'related_farmer_id', 'related_farm_id', 'related_visit_id', 'related_request_id',
+    'metadata',
+}
+
+
+def resolve_audience(audience):
+    """
+    Resolve an audience dict to a set of active user IDs.
+
+    Args:
+        audience: Audience dict (see module docstring)
+
+    Returns:
+        Set of user IDs
+    """
+    from apps.accounts.models import User
+    from apps.organizations.models import OrganizationMembership
+
+    organization_id = audience.get('organization_id')
+    user_filter = Q()
+    has_filter = False
+
+    if audience.get('user_ids'):
+        user_filter |= Q(pk__in=audience['user_ids'])
+        has_filter = True
+
+    if organization_id and (audience.get('roles') or audience.get('all_members')):
+        memberships = OrganizationMembership.objects.filter(
+            organization_id=organization_id, is_active=True
+        )
+        if not audience.get('all_members'):
+            memberships = memberships.filter(role__in=audience['roles'])
+        user_filter |= Q(pk__in=memberships.values('user_id'))
+        has_filter = True
+
+    if organization_id and audience.get('region_ids'):
+        from apps.regions.models import RegionSupervisor
+        from apps.regions.tree import get_region_tree
+
+        # Supervisors of a region also oversee everything below it
+        tree = get_region_tree(organization_id)
+        region_ids = set()
+        for region_id in audience['region_ids']:
+            region_id = uuid.UUID(str(region_id))
+            region_ids.add(region_id)
+            region_ids.update(ancestor.id for ancestor in tree.ancestors(region_id))
+        now = timezone.now()
+        supervisors = RegionSupervisor.objects.filter(
+            Q(expires_at__isnull=True) | Q(expires_at__gt=now),
+            region_id__in=region_ids,
+            is_active=True
+        )
+        user_filter |= Q(pk__in=supervisors.values('supervisor_id'))
+        has_filter = True
+
+    if not has_filter:
+        return set()
+
+    users = User.objects.filter(user_filter, is_active=True)
+    if audience.get('exclude_user_ids'):
+        users = users.exclude(pk__in=audience['exclude_user_ids'])
+    return set(users.values_list('pk', flat=True))
+
+
+def filter_by_preferences(user_ids, notification_type):
+    """Drop users that disabled a notification type (one query)."""
+    disabled = {
+        user_id
+        for user_id, preferences in NotificationPreference.objects.filter(
+            user_id__in=user_ids
+        ).values_list('user_id', 'preferences')
+        if not (preferences or {}).get(notification_type, True)
+    }
+    return [user_id for user_id in user_ids if user_id not in disabled]
+
+
+def notify_users(user_ids, payload, batch_size=None):
+    """
+    Create one notification per user with bulk inserts.
+
+    Args:
+        user_ids: Iterable of recipient user IDs
+        payload: Notification fields (see PAYLOAD_FIELDS); notification_type,
+            title and message are required
+        batch_size: Rows per INSERT (defaults to NOTIFICATION_FANOUT_BATCH_SIZE)
+
+    Returns:
+        Number of notifications created
+    """
+    unknown = set(payload) - PAYLOAD_FIELDS
+    if unknown:
+        raise ValueError(f"Unsupported notification fields: {', '.join(sorted(unknown))}")
+
+    batch_size = batch_size or settings.NOTIFICATION_FANOUT_BATCH_SIZE
+    # IDs arrive as strings from Celery; preference and recipient lookups are keyed by UUID
+    user_ids = [uuid.UUID(str(user_id)) for user_id in user_ids]
+    recipients = filter_by_preferences(user_ids, payload['notification_type'])
+
+    created = 0
+    for start in range(0, len(recipients), batch_size):
+        batch = [
+            Notification(user_id=user_id, **payload)
+            for user_id in recipients[start:start + batch_size]
+        ]
+        with transaction.atomic():
+            Notification.objects.bulk_create(batch)
+            notifications_created(batch)
+            push_notifications(batch)
+            enqueue_deliveries(batch)
+        created += len(batch)
+    return created
+
+
+def notify_audience(audience, payload, run_async=None):
+    """
+    Notify everyone in an audience.
+
+    Audiences larger than NOTIFICATION_FANOUT_ASYNC_THRESHOLD are processed
+    by the fan_out_notification Celery task after the current transaction
+    commits.
+
+    Args:
+        audience: Audience dict (see module docstring)
+        payload: Notification fields (see notify_users)
+        run_async: Force (True) or prevent (False) background processing
+
+    Returns:
+        Number of notifications created, or None if queued
+    """
+    from .tasks import fan_out_notification
+
+    user_ids = resolve_audience(audience)
+    if run_async is None:
+        run_async = len(user_ids) > settings.NOTIFICATION_FANOUT_ASYNC_THRESHOLD
+
+    if run_async:
+        serialized_ids = [str(user_id) for user_id in user_ids]
+        transaction.on_commit(lambda: fan_out_notification.delay(serialized_ids, payload))
+        logger.info(f"Queued {payload['notification_type']} notification for {len(user_ids)} users")
+        return None
+
+    return notify_users(user_ids, payload)
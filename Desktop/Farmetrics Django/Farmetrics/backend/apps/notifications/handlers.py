@@ -0,0 +1,83 @@
+"""
+Domain event subscribers for notifications app.
+"""
+
+from apps.core.events import subscribe
+
+from . import utils
+
+
+def _visit(event):
+    from apps.visits.models import Visit
+    
+    return Visit.objects.select_related('farm', 'field_officer').filter(
+        pk=event['payload']['visit_id']
+    ).first()
+
+
+def _request(event):
+    from apps.requests.models import Request
+    
+    return Request.objects.select_related('requested_by', 'assigned_to').filter(
+        pk=event['payload']['request_id']
+    ).first()
+
+
+@subscribe('visit.submitted')
+def visit_submitted(event):
+    visit = _visit(event)
+    if visit:
+        utils.notify_visit_submitted(visit)
+
+
+@subscribe('visit.approved')
+def visit_approved(event):
+    visit = _visit(event)
+    if visit:
+        utils.notify_visit_approved(visit)
+
+
+@subscribe('visit.rejected', 'visit.needs_revision')
+def visit_rejected(event):
+    visit = _visit(event)
+    if visit:
+        utils.notify_visit_rejected(visit)
+
+
+@subscribe('request.created')
+def request_created(event):
+    request = _request(event)
+    if request:
+        utils.notify_request_created(request)
+
+
+@subscribe('request.approved')
+def request_approved(event):
+    request = _request(event)
+    if request:
+        utils.notify_request_approved(request)
+
+
+@subscribe('request.rejected')
+def request_rejected(event):
+    request = _request(event)
+    if request:
+        utils.notify_request_rejected(request)
+
+
+@subscribe('farmer.verified')
+def farmer_verified(event):
+    from apps.farmers.models import Farmer
+    
+    farmer = Farmer.objects.filter(pk=event['payload']['farmer_id']).first()
+    if farmer:
+        utils.notify_farmer_verified(farmer)
+
+
+@subscribe('farm.verified')
+def farm_verified(event):
+    from apps.farms.models import Farm
+    
+    farm = Farm.objects.filter(pk=event['payload']['farm_id']).first()
+    if farm:
+        utils.notify_farm_verified(farm)
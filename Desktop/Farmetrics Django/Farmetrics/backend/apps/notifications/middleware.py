@@ -0,0 +1,49 @@
+"""
+JWT authentication for WebSocket connections.
+
+Browsers cannot set an Authorization header on WebSocket handshakes, so the
+access token is read from the ``token`` query parameter (an Authorization
+header is accepted too for non-browser clients).
+"""
+
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+
+
+@database_sync_to_async
+def get_user_for_token(raw_token):
+    """Return the active user for an access token, or AnonymousUser."""
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+    authentication = JWTAuthentication()
+    try:
+        validated_token = authentication.get_validated_token(raw_token)
+        return authentication.get_user(validated_token)
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return AnonymousUser()
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """Populate scope['user'] from a simplejwt access token."""
+    
+    async def __call__(self, scope, receive, send):
+        scope = dict(scope)
+        token = None
+        
+        query = parse_qs(scope.get('query_string', b'').decode())
+        if query.get('token'):
+            token = query['token'][0]
+        else:
+            headers = dict(scope.get('headers') or [])
+            authorization = headers.get(b'authorization', b'').decode()
+            if authorization.startswith('Bearer '):
+                token = authorization[len('Bearer '):]
+        
+        if token:
+            scope['user'] = await get_user_for_token(token)
+        
+        return await super().__call__(scope, receive, send)
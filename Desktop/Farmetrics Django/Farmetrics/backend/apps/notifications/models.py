@@ -114,6 +114,14 @@ class Notification(TimeStampedModel):
             models.Index(fields=['user', 'is_read']),
             models.Index(fields=['notification_type']),
             models.Index(fields=['created_at']),
+            # Newest-first history per user (notification list)
+            models.Index(fields=['user', '-created_at'], name='notification_user_recent_idx'),
+            # Hot path: a user's unread notifications, newest first
+            models.Index(
+                fields=['user', '-created_at'],
+                name='notification_unread_idx',
+                condition=models.Q(is_read=False)
+            ),
         ]
     
     def __str__(self):
@@ -123,9 +131,17 @@ class Notification(TimeStampedModel):
         """Mark notification as read."""
         if not self.is_read:
             from django.utils import timezone
+            from .counters import notifications_read
+            from .realtime import push_unread_delta
             self.is_read = True
             self.read_at = timezone.now()
-            self.save(update_fields=['is_read', 'read_at'])
+            # Conditional update so concurrent requests decrement the counter once
+            updated = Notification.objects.filter(pk=self.pk, is_read=False).update(
+                is_read=True, read_at=self.read_at
+            )
+            if updated:
+                notifications_read(self.user_id, updated)
+                push_unread_delta(self.user_id, -updated)
 
 
 class NotificationPreference(TimeStampedModel):
@@ -159,3 +175,88 @@ class NotificationPreference(TimeStampedModel):
     def __str__(self):
         return f"Preferences for {self.user.email}"
 
+
+class NotificationDelivery(TimeStampedModel):
+    """
+    Outbound delivery of a notification over an external channel (email, SMS).
+    Processed by the delivery queue workers (see delivery.py).
+    """
+    
+    CHANNEL_CHOICES = [
+        ('email', 'Email'),
+        ('sms', 'SMS'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('dead', 'Dead Letter'),
+    ]
+    
+    notification = models.ForeignKey(
+        Notification,
+        on_delete=models.CASCADE,
+        related_name='deliveries'
+    )
+    channel = models.CharField(max_length=10, choices=CHANNEL_CHOICES)
+    recipient = models.CharField(
+        max_length=254,
+        help_text="Email address or phone number at the time of queueing"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default='pending'
+    )
+    
+    # Retry state
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    
+    provider = models.CharField(max_length=100, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = 'Notification deliveries'
+        indexes = [
+            # Queue polling: due deliveries per channel
+            models.Index(
+                fields=['channel', 'next_attempt_at'],
+                name='delivery_due_idx',
+                condition=models.Q(status='pending')
+            ),
+            models.Index(fields=['status', 'updated_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_channel_display()} to {self.recipient} ({self.status})"
+
+
+class NotificationDeadLetter(TimeStampedModel):
+    """
+    Delivery that exhausted its retries, kept for inspection and replay.
+    """
+    
+    delivery = models.OneToOneField(
+        NotificationDelivery,
+        on_delete=models.CASCADE,
+        related_name='dead_letter'
+    )
+    channel = models.CharField(max_length=10)
+    recipient = models.CharField(max_length=254)
+    provider = models.CharField(max_length=100, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    
+    # Replay state
+    is_resolved = models.BooleanField(default=False, db_index=True)
+    resolved_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Dead letter: {self.channel} to {self.recipient}"
@@ -0,0 +1,166 @@
+"""
+Pluggable delivery providers for outbound email and SMS.
+
+A provider sends a batch of NotificationDelivery rows over one connection:
+the delivery worker calls open() once, send() per delivery and close() at
+the end, so SMTP connections (and HTTP sessions for SMS gateways) are
+reused across a whole batch. Providers are configured per channel with
+NOTIFICATION_DELIVERY_PROVIDERS as dotted class paths; each provider
+declares its own rate limit (messages per window) that the worker enforces
+across all processes.
+
+ConsoleProvider and FileProvider are local stand-ins for development and
+testing; they "send" by logging or appending JSON lines to a file.
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryError(Exception):
+    """
+    Raised by a provider when a delivery fails.
+
+    Set permanent=True for failures that will never succeed on retry
+    (e.g. an invalid recipient) so the delivery is dead-lettered at once.
+    """
+
+    def __init__(self, message, permanent=False):
+        super().__init__(message)
+        self.permanent = permanent
+
+
+class DeliveryProvider:
+    """Base class for delivery providers."""
+
+    name = 'base'
+    # Messages allowed per rate_limit_window seconds (None for unlimited)
+    rate_limit = None
+    rate_limit_window = 60
+
+    def __init__(self, channel, **options):
+        self.channel = channel
+        self.options = options
+        self.rate_limit = options.get('rate_limit', self.rate_limit)
+        self.rate_limit_window = options.get('rate_limit_window', self.rate_limit_window)
+
+    def open(self):
+        """Open a connection reused for the whole batch."""
+
+    def close(self):
+        """Close the batch connection."""
+
+    def send(self, delivery):
+        """
+        Send one delivery.
+
+        Args:
+            delivery: NotificationDelivery with its notification loaded
+
+        Raises:
+            DeliveryError: If the message could not be sent
+        """
+        raise NotImplementedError
+
+    def render(self, delivery):
+        """(subject, body) for a delivery."""
+        notification = delivery.notification
+        body = notification.message
+        if notification.action_url:
+            body = f"{body}\n\n{settings.NOTIFICATION_ACTION_BASE_URL.rstrip('/')}{notification.action_url}"
+        return notification.title, body
+
+
+class EmailProvider(DeliveryProvider):
+    """Sends email through Django's EMAIL_BACKEND, one connection per batch."""
+
+    name = 'email'
+    rate_limit = 100
+
+    def open(self):
+        self.connection = get_connection(fail_silently=False)
+        self.connection.open()
+
+    def close(self):
+        try:
+            self.connection.close()
+        except Exception as e:
+            logger.warning(f"Failed to close email connection: {e}")
+
+    def send(self, delivery):
+        subject, body = self.render(delivery)
+        message = EmailMessage(
+            subject=subject,
+            body=body,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[delivery.recipient],
+            connection=self.connection,
+        )
+        try:
+            message.send()
+        except Exception as e:
+            raise DeliveryError(str(e))
+
+
+class ConsoleProvider(DeliveryProvider):
+    """Logs deliveries instead of sending them (development)."""
+
+    name = 'console'
+
+    def send(self, delivery):
+        subject, body = self.render(delivery)
+        logger.info(f"[{self.channel}] to {delivery.recipient}: {subject} - {body}")
+
+
+class FileProvider(DeliveryProvider):
+    """Appends deliveries as JSON lines to a file (development and testing)."""
+
+    name = 'file'
+    _lock = threading.Lock()
+
+    def open(self):
+        path = Path(self.options.get('path') or settings.NOTIFICATION_DELIVERY_FILE_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.handle = open(path, 'a', encoding='utf-8')
+
+    def close(self):
+        self.handle.close()
+
+    def send(self, delivery):
+        subject, body = self.render(delivery)
+        line = json.dumps({
+            'channel': self.channel,
+            'recipient': delivery.recipient,
+            'subject': subject,
+            'body': body,
+            'notification_id': str(delivery.notification_id),
+            'sent_at': timezone.now().isoformat(),
+        })
+        with self._lock:
+            self.handle.write(line + '\n')
+            self.handle.flush()
+
+
+def get_provider(channel):
+    """
+    Provider instance for a channel from NOTIFICATION_DELIVERY_PROVIDERS.
+
+    Raises:
+        ValueError: If no provider is configured for the channel
+    """
+    config = settings.NOTIFICATION_DELIVERY_PROVIDERS.get(channel)
+    if not config:
+        raise ValueError(f'No delivery provider configured for channel "{channel}"')
+    if isinstance(config, str):
+        config = {'class': config}
+    options = {key: value for key, value in config.items() if key != 'class'}
+    return import_string(config['class'])(channel, **options)
@@ -0,0 +1,73 @@
+"""
+Real-time notification delivery over Channels.
+
+Each connected user joins a per-user group (see consumers.py). New
+notifications and unread-count changes are pushed to that group through the
+configured channel layer once the surrounding transaction commits, so
+clients never see rows that were rolled back. Delivery is best effort: a
+failing channel layer is logged and never breaks the request.
+"""
+
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def user_group_name(user_id):
+    """Channel group for a user's notification sockets."""
+    return f'notifications_user_{user_id}'
+
+
+def _group_send(user_id, message):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(user_group_name(user_id), message)
+    except Exception as e:
+        logger.warning(f"Failed to push notification event to user {user_id}: {e}")
+
+
+def push_notification(notification):
+    """Push a new notification (and an unread count increment) after commit."""
+    from .serializers import NotificationListSerializer
+
+    user_id = notification.user_id
+    message = {
+        'type': 'notification.created',
+        'notification': dict(NotificationListSerializer(notification).data),
+    }
+    transaction.on_commit(lambda: _group_send(user_id, message))
+
+
+def push_notifications(notifications):
+    """Push a batch of new notifications (one per recipient) after commit."""
+    from .serializers import NotificationListSerializer
+
+    messages = [
+        (notification.user_id, {
+            'type': 'notification.created',
+            'notification': dict(data),
+        })
+        for notification, data in zip(
+            notifications, NotificationListSerializer(notifications, many=True).data
+        )
+    ]
+
+    def send():
+        for user_id, message in messages:
+            _group_send(user_id, message)
+
+    transaction.on_commit(send)
+
+
+def push_unread_delta(user_id, delta):
+    """Push an unread count change (e.g. -3 after marking three as read) after commit."""
+    if not delta:
+        return
+    message = {'type': 'unread_count.changed', 'delta': delta}
+    transaction.on_commit(lambda: _group_send(user_id, message))
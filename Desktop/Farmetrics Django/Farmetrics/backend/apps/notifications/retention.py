@@ -0,0 +1,159 @@
+"""
+Notification retention and digesting.
+
+Read notifications are deleted once they are older than
+NOTIFICATION_READ_RETENTION_DAYS. Deletion runs in small batches, each in
+its own short transaction with an optional pause in between, so the purge
+never holds locks on a large part of the table. Optionally, a user's
+unread low-priority notifications from one day are collapsed into a
+single digest notification; the collapsed notifications are marked read
+(and linked to the digest) rather than deleted, so they stay in the
+user's history until the read retention purge.
+"""
+
+import logging
+import time
+from collections import Counter
+from datetime import datetime, time as datetime_time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+from .counters import adjust_unread_counts
+from .models import Notification, NotificationDelivery
+from .realtime import push_notification, push_unread_delta
+
+logger = logging.getLogger(__name__)
+
+DIGEST_MAX_LINES = 10
+
+
+def purge_read_notifications(retention_days=None, batch_size=None, pause_seconds=None):
+    """
+    Delete read notifications older than the retention period.
+
+    Args:
+        retention_days: Defaults to NOTIFICATION_READ_RETENTION_DAYS
+        batch_size: Rows per delete transaction (NOTIFICATION_PURGE_BATCH_SIZE)
+        pause_seconds: Pause between batches (NOTIFICATION_PURGE_PAUSE_SECONDS)
+
+    Returns:
+        Number of notifications deleted
+    """
+    retention_days = retention_days or settings.NOTIFICATION_READ_RETENTION_DAYS
+    batch_size = batch_size or settings.NOTIFICATION_PURGE_BATCH_SIZE
+    if pause_seconds is None:
+        pause_seconds = settings.NOTIFICATION_PURGE_PAUSE_SECONDS
+
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    expired = Notification.objects.filter(
+        Q(read_at__lt=cutoff) | Q(read_at__isnull=True, created_at__lt=cutoff),
+        is_read=True
+    )
+
+    deleted = 0
+    while True:
+        batch_ids = list(expired.order_by().values_list('pk', flat=True)[:batch_size])
+        if not batch_ids:
+            break
+        with transaction.atomic():
+            count, _ = Notification.objects.filter(pk__in=batch_ids).delete()
+        deleted += count
+        if len(batch_ids) < batch_size:
+            break
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+    return deleted
+
+
+def _digest_message(notifications):
+    lines = [f"- {notification.title}" for notification in notifications[:DIGEST_MAX_LINES]]
+    if len(notifications) > DIGEST_MAX_LINES:
+        lines.append(f"...and {len(notifications) - DIGEST_MAX_LINES} more")
+    return '\n'.join(lines)
+
+
+def digest_low_priority_notifications(day=None, min_count=None):
+    """
+    Collapse each user's unread low-priority notifications from a day into one.
+
+    Collapsed notifications are marked read with "digested_into" in their
+    metadata. Notifications with email/SMS deliveries still in flight are
+    left out, so their deliveries are not cut short.
+
+    Args:
+        day: Date to digest (defaults to yesterday)
+        min_count: Minimum notifications per user before digesting
+            (NOTIFICATION_DIGEST_MIN_COUNT)
+
+    Returns:
+        Dictionary with the number of digests created and notifications collapsed
+    """
+    min_count = min_count or settings.NOTIFICATION_DIGEST_MIN_COUNT
+    day = day or (timezone.localdate() - timedelta(days=1))
+    start = timezone.make_aware(datetime.combine(day, datetime_time.min))
+    end = start + timedelta(days=1)
+
+    candidates = Notification.objects.filter(
+        is_read=False,
+        priority__in=settings.NOTIFICATION_DIGEST_PRIORITIES,
+        created_at__gte=start,
+        created_at__lt=end
+    ).exclude(metadata__digest=True).exclude(
+        Exists(NotificationDelivery.objects.filter(
+            notification=OuterRef('pk'), status__in=['pending', 'sending']
+        ))
+    )
+
+    user_ids = list(
+        candidates.order_by().values('user_id').annotate(count=Count('id')).filter(
+            count__gte=min_count
+        ).values_list('user_id', flat=True)
+    )
+
+    digests = 0
+    collapsed = 0
+    for user_id in user_ids:
+        # One short transaction per user
+        with transaction.atomic():
+            notifications = list(
+                candidates.filter(user_id=user_id).select_for_update(skip_locked=True).order_by('created_at')
+            )
+            if len(notifications) < min_count:
+                continue
+
+            digest = Notification.objects.create(
+                user_id=user_id,
+                notification_type='system',
+                title=f"{len(notifications)} updates on {day:%d %b %Y}",
+                message=_digest_message(notifications),
+                priority='low',
+                metadata={
+                    'digest': True,
+                    'date': day.isoformat(),
+                    'count': len(notifications),
+                    'types': dict(Counter(n.notification_type for n in notifications)),
+                }
+            )
+            now = timezone.now()
+            for notification in notifications:
+                notification.is_read = True
+                notification.read_at = now
+                notification.metadata = {**notification.metadata, 'digested_into': str(digest.pk)}
+                notification.updated_at = now
+            Notification.objects.bulk_update(
+                notifications, ['is_read', 'read_at', 'metadata', 'updated_at']
+            )
+
+            # Net change: the digest replaces the collapsed unread notifications
+            adjust_unread_counts({user_id: 1 - len(notifications)})
+            push_unread_delta(user_id, -len(notifications))
+            push_notification(digest)
+
+        digests += 1
+        collapsed += len(notifications)
+
+    return {'digests': digests, 'collapsed': collapsed}
@@ -0,0 +1,72 @@
+"""
+Celery tasks for notifications app.
+"""
+
+import logging
+
+from celery import shared_task
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def fan_out_notification(user_ids, payload):
+    """Create a notification for each user in batches (large audiences)."""
+    from .fanout import notify_users
+    
+    created = notify_users(user_ids, payload)
+    logger.info(f"Created {created} {payload.get('notification_type')} notifications")
+    return created
+
+
+@shared_task
+def purge_read_notifications():
+    """Delete read notifications past the retention period (runs daily)."""
+    from .retention import purge_read_notifications as purge
+    
+    deleted = purge()
+    logger.info(f"Purged {deleted} read notifications")
+    return deleted
+
+
+@shared_task
+def digest_low_priority_notifications():
+    """Collapse yesterday's unread low-priority notifications per user (runs daily)."""
+    from .retention import digest_low_priority_notifications as digest
+    
+    if not settings.NOTIFICATION_DIGEST_ENABLED:
+        return None
+    
+    stats = digest()
+    logger.info(f"Notification digest: {stats}")
+    return stats
+
+
+@shared_task
+def process_notification_deliveries(channel):
+    """Send a batch of queued email/SMS deliveries, re-queueing itself while more are due."""
+    from .delivery import process_deliveries, release_schedule, schedule_deliveries
+    
+    release_schedule(channel)
+    result = process_deliveries(channel)
+    if result['remaining']:
+        # Full batch: continue in a fresh task; rate limited: wait for the next window
+        rate_limited = not (result['sent'] or result['failed'])
+        countdown = settings.NOTIFICATION_DELIVERY_RATE_LIMIT_BACKOFF_SECONDS if rate_limited else 0
+        schedule_deliveries(channel, countdown=countdown)
+    return result
+
+
+@shared_task
+def dispatch_notification_deliveries():
+    """Requeue stalled deliveries and start processing every enabled channel (runs every minute)."""
+    from .delivery import requeue_stale_deliveries, schedule_deliveries
+    
+    requeued = requeue_stale_deliveries()
+    if requeued:
+        logger.warning(f"Requeued {requeued} stalled notification deliveries")
+    
+    for channel in settings.NOTIFICATION_DELIVERY_CHANNELS:
+        schedule_deliveries(channel)
+    return requeued
@@ -0,0 +1,209 @@
+"""
+Tests for notifications app.
+"""
+
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from apps.accounts.models import User
+
+from . import counters, delivery, retention
+from .models import Notification, NotificationDelivery, NotificationPreference
+from .tasks import fan_out_notification, process_notification_deliveries
+from .utils import create_notification
+
+
+@override_settings(NOTIFICATION_DELIVERY_CHANNELS=['email'])
+class FanOutTaskTests(TestCase):
+    """fan_out_notification receives user IDs as strings from Celery."""
+    
+    def setUp(self):
+        self.opted_out = User.objects.create_user(email='opted-out@example.com', password='x')
+        NotificationPreference.objects.create(
+            user=self.opted_out, preferences={'system': False}, email_enabled=True
+        )
+        self.email_user = User.objects.create_user(email='email@example.com', password='x')
+        NotificationPreference.objects.create(user=self.email_user, email_enabled=True)
+        self.payload = {
+            'notification_type': 'system',
+            'title': 'Maintenance',
+            'message': 'Scheduled maintenance tonight.',
+        }
+    
+    def test_task_respects_preferences_and_queues_email(self):
+        user_ids = [str(self.opted_out.pk), str(self.email_user.pk)]
+        
+        created = fan_out_notification.apply(args=(user_ids, self.payload)).get()
+        
+        self.assertEqual(created, 1)
+        self.assertFalse(Notification.objects.filter(user=self.opted_out).exists())
+        notification = Notification.objects.get(user=self.email_user)
+        delivery = NotificationDelivery.objects.get(notification=notification)
+        self.assertEqual(delivery.channel, 'email')
+        self.assertEqual(delivery.recipient, 'email@example.com')
+
+
+class UnreadCounterTests(TestCase):
+    """Cached unread counters stay consistent with the database."""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.user = User.objects.create_user(email='reader@example.com', password='x')
+    
+    def notify(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_notification(self.user, 'system', 'Title', 'Message')
+    
+    def assertCountMatchesDatabase(self):
+        expected = Notification.objects.filter(user=self.user, is_read=False).count()
+        self.assertEqual(counters.get_unread_count(self.user.pk), expected)
+    
+    def test_creates_and_reads_adjust_cached_counter(self):
+        self.notify()
+        self.notify()
+        self.assertEqual(counters.get_unread_count(self.user.pk), 2)
+        
+        notification = self.notify()
+        self.assertEqual(counters.get_unread_count(self.user.pk), 3)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            notification.mark_as_read()
+        self.assertEqual(counters.get_unread_count(self.user.pk), 2)
+        self.assertCountMatchesDatabase()
+    
+    def test_concurrent_mark_read_decrements_once(self):
+        notification = self.notify()
+        self.notify()
+        self.assertEqual(counters.get_unread_count(self.user.pk), 2)
+        
+        # Two requests loaded the same unread notification
+        first = Notification.objects.get(pk=notification.pk)
+        second = Notification.objects.get(pk=notification.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            first.mark_as_read()
+            second.mark_as_read()
+        
+        self.assertEqual(counters.get_unread_count(self.user.pk), 1)
+        self.assertCountMatchesDatabase()
+    
+    def test_mark_read_during_rebuild_is_not_cached_stale(self):
+        notification = self.notify()
+        self.notify()
+        real_count = counters._count_unread
+        
+        def count_then_mark_read(user_id):
+            # The rebuild counted before a concurrent mark-read committed
+            count = real_count(user_id)
+            with self.captureOnCommitCallbacks(execute=True):
+                Notification.objects.get(pk=notification.pk).mark_as_read()
+            return count
+        
+        with mock.patch.object(counters, '_count_unread', side_effect=count_then_mark_read):
+            self.assertEqual(counters.get_unread_count(self.user.pk), 2)
+        
+        self.assertEqual(counters.get_unread_count(self.user.pk), 1)
+        self.assertCountMatchesDatabase()
+    
+    def test_create_during_rebuild_is_not_cached_stale(self):
+        self.notify()
+        real_count = counters._count_unread
+        
+        def count_then_create(user_id):
+            count = real_count(user_id)
+            self.notify()
+            return count
+        
+        with mock.patch.object(counters, '_count_unread', side_effect=count_then_create):
+            self.assertEqual(counters.get_unread_count(self.user.pk), 1)
+        
+        self.assertEqual(counters.get_unread_count(self.user.pk), 2)
+        self.assertCountMatchesDatabase()
+
+
+@override_settings(
+    NOTIFICATION_DELIVERY_CHANNELS=['email'],
+    NOTIFICATION_DELIVERY_RATE_LIMIT_BACKOFF_SECONDS=10,
+)
+class DeliverySchedulingTests(TestCase):
+    """At most one processing task is queued per channel."""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        
+        cache.clear()
+        self.user = User.objects.create_user(email='deliveries@example.com', password='x')
+        NotificationPreference.objects.create(user=self.user, email_enabled=True)
+        patcher = mock.patch.object(process_notification_deliveries, 'apply_async')
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_burst_of_notifications_queues_one_task(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(5):
+                create_notification(self.user, 'system', f'Title {index}', 'Message')
+        
+        self.assertEqual(NotificationDelivery.objects.filter(channel='email').count(), 5)
+        self.apply_async.assert_called_once_with(('email',), countdown=0)
+    
+    def test_running_task_allows_the_next_one(self):
+        self.assertTrue(delivery.schedule_deliveries('email'))
+        self.assertFalse(delivery.schedule_deliveries('email'))
+        
+        result = {'sent': 0, 'failed': 0, 'remaining': True}
+        with mock.patch.object(delivery, 'process_deliveries', return_value=result):
+            process_notification_deliveries.run('email')
+        
+        # Rate limited: the task re-queued itself once, after the backoff
+        self.assertEqual(self.apply_async.call_count, 2)
+        self.apply_async.assert_called_with(('email',), countdown=10)
+        self.assertFalse(delivery.schedule_deliveries('email'))
+
+
+class DigestTests(TestCase):
+    """The daily digest archives collapsed notifications instead of deleting them."""
+    
+    def setUp(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        
+        self.user = User.objects.create_user(email='digest@example.com', password='x')
+        self.day = timezone.localdate() - timedelta(days=1)
+        self.yesterday = timezone.now() - timedelta(days=1)
+    
+    def low_priority(self, count):
+        notifications = [
+            Notification.objects.create(
+                user=self.user, notification_type='system', title=f'Update {index}',
+                message='Message', priority='low'
+            )
+            for index in range(count)
+        ]
+        Notification.objects.filter(pk__in=[n.pk for n in notifications]).update(
+            created_at=self.yesterday
+        )
+        return notifications
+    
+    def test_collapsed_notifications_are_marked_read_and_kept(self):
+        collapsed = self.low_priority(3)
+        emailed = self.low_priority(1)[0]
+        pending = NotificationDelivery.objects.create(
+            notification=emailed, channel='email', recipient=self.user.email
+        )
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            stats = retention.digest_low_priority_notifications(day=self.day, min_count=2)
+        
+        self.assertEqual(stats, {'digests': 1, 'collapsed': 3})
+        digest = Notification.objects.get(metadata__digest=True)
+        for notification in collapsed:
+            notification.refresh_from_db()
+            self.assertTrue(notification.is_read)
+            self.assertEqual(notification.metadata['digested_into'], str(digest.pk))
+        
+        # Notifications with deliveries in flight are left alone
+        emailed.refresh_from_db()
+        self.assertFalse(emailed.is_read)
+        self.assertTrue(NotificationDelivery.objects.filter(pk=pending.pk).exists())
+        self.assertEqual(counters.get_unread_count(self.user.pk), 2)
@@ -3,6 +3,9 @@ Utility functions for sending notifications.
 """
 
 from .models import Notification, NotificationPreference
+from .counters import notifications_created
+from .delivery import enqueue_deliveries
+from .realtime import push_notification
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -64,18 +67,38 @@ def create_notification(
         metadata=metadata or {}
     )
     
-    # TODO: Send via WebSocket if connected
-    # TODO: Send email if enabled
-    # TODO: Send push notification if enabled
+    # Update the unread counter and push to open WebSocket connections after commit
+    notifications_created([notification])
+    push_notification(notification)
+    
+    # Queue email/SMS delivery for users who enabled it
+    enqueue_deliveries([notification])
     
     return notification
 
 
 def notify_visit_submitted(visit):
-    """Create notification when visit is submitted."""
-    # Notify supervisor/assigned reviewer
-    # This is a placeholder - implement based on your assignment logic
-    pass
+    """Notify the supervisors of the visited farm's region when a visit is submitted."""
+    from .fanout import notify_audience
+    
+    audience = {
+        'organization_id': str(visit.organization_id),
+        'exclude_user_ids': [str(visit.field_officer_id)],
+    }
+    if visit.farm.region_id:
+        audience['region_ids'] = [str(visit.farm.region_id)]
+    else:
+        # No region to route by: all supervisors of the organization
+        audience['roles'] = ['supervisor']
+    
+    notify_audience(audience, {
+        'notification_type': 'visit_submitted',
+        'title': f"Visit {visit.visit_code} Submitted",
+        'message': f"{visit.field_officer.get_full_name()} submitted a visit to {visit.farm.name} for review.",
+        'action_url': f"/visits/{visit.id}/",
+        'action_text': "Review Visit",
+        'related_visit_id': str(visit.id),
+    })
 
 
 def notify_visit_approved(visit):
@@ -143,3 +166,32 @@ def notify_request_rejected(request):
         related_request=request
     )
 
+
+def notify_farmer_verified(farmer):
+    """Notify the farmer's registering user of the verification result."""
+    if not farmer.created_by_id or farmer.created_by_id == farmer.verified_by_id:
+        return
+    create_notification(
+        user=farmer.created_by,
+        notification_type='farmer_verified',
+        title=f"Farmer {farmer.farmer_id} {farmer.get_verification_status_display()}",
+        message=f"{farmer.get_full_name()} has been marked as {farmer.get_verification_status_display().lower()}.",
+        action_url=f"/farmers/{farmer.id}/",
+        action_text="View Farmer",
+        related_farmer=farmer
+    )
+
+
+def notify_farm_verified(farm):
+    """Notify the farm's registering user that the farm was verified."""
+    if not farm.created_by_id or farm.created_by_id == farm.verified_by_id:
+        return
+    create_notification(
+        user=farm.created_by,
+        notification_type='farm_verified',
+        title=f"Farm {farm.farm_code} Verified",
+        message=f"{farm.name} has been verified.",
+        action_url=f"/farms/{farm.id}/",
+        action_text="View Farm",
+        related_farm=farm
+    )
@@ -9,6 +9,8 @@ from django.utils import timezone
 from drf_spectacular.utils import extend_schema
 
 from .models import Notification, NotificationPreference
+from .counters import get_unread_count, notifications_read
+from .realtime import push_unread_delta
 from .serializers import (
     NotificationSerializer,
     NotificationListSerializer,
@@ -122,6 +124,10 @@ class NotificationMarkReadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Keep the cached counter and open WebSocket clients' badges in sync
+        notifications_read(request.user.pk, count)
+        push_unread_delta(request.user.pk, -count)
+        
         return Response({
             "message": f"{count} notification(s) marked as read",
             "count": count
@@ -140,12 +146,7 @@ class NotificationUnreadCountView(APIView):
         tags=["Notifications"]
     )
     def get(self, request):
-        count = Notification.objects.filter(
-            user=request.user,
-            is_read=False
-        ).count()
-        
-        return Response({"unread_count": count})
+        return Response({"unread_count": get_unread_count(request.user.pk)})
 
 
 class NotificationPreferenceView(generics.RetrieveUpdateAPIView):
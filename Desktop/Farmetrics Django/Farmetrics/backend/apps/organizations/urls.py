@@ -17,6 +17,7 @@ urlpatterns = [
     # Memberships
     path('<uuid:org_id>/members/', views.OrganizationMemberListView.as_view(), name='member_list'),
     path('<uuid:org_id>/members/add/', views.AddMemberView.as_view(), name='add_member'),
+    path('<uuid:org_id>/members/bulk/', views.BulkAddMembersView.as_view(), name='bulk_add_members'),
     path('<uuid:org_id>/members/<uuid:membership_id>/', views.MembershipDetailView.as_view(), name='membership_detail'),
 ]
 
@@ -2,11 +2,16 @@
 Views for organizations app.
 """
 
+from collections import Counter
+
+from django.db import IntegrityError
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema
 
+from apps.accounts.permissions import HasOrganizationPermission
+from apps.accounts.serializers import BulkProvisionSerializer
 from .models import Organization, OrganizationMembership
 from .serializers import (
     OrganizationSerializer,
@@ -175,13 +180,15 @@ class OrganizationMemberListView(generics.ListAPIView):
 class AddMemberView(APIView):
     """
     Add a member to an organization.
-    Only organization admins can add members.
+    Requires the user.assign permission in the organization.
     """
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, HasOrganizationPermission]
+    organization_url_kwarg = 'org_id'
+    required_permissions = ['user.assign']
     
     @extend_schema(
         summary="Add organization member",
-        description="Add a new member to the organization (admin only)",
+        description="Add a new member to the organization (requires user.assign)",
         tags=["Organizations"],
         request=AddMemberSerializer,
         responses={201: OrganizationMembershipSerializer}
@@ -195,21 +202,6 @@ class AddMemberView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Check if user is an admin of this organization
-        if not request.user.is_superuser:
-            membership = OrganizationMembership.objects.filter(
-                organization=organization,
-                user=request.user,
-                role='admin',
-                is_active=True
-            ).first()
-            
-            if not membership:
-                return Response(
-                    {"error": "You don't have permission to add members to this organization"},
-                    status=status.HTTP_403_FORBIDDEN
-                )
-        
         serializer = AddMemberSerializer(
             data=request.data,
             context={'organization': organization}
@@ -230,13 +222,75 @@ class AddMemberView(APIView):
         )
 
 
+class BulkAddMembersView(APIView):
+    """
+    Create users and add them to an organization in bulk.
+    Requires the user.assign and role.assign permissions in the organization.
+    """
+    permission_classes = [permissions.IsAuthenticated, HasOrganizationPermission]
+    organization_url_kwarg = 'org_id'
+    required_permissions = ['user.assign', 'role.assign']
+    
+    @extend_schema(
+        summary="Bulk provision members",
+        description=(
+            "Create up to USER_PROVISIONING_MAX_ROWS users with memberships and role "
+            "assignments in one transaction. Existing accounts are added to the organization "
+            "and inactive memberships reactivated. "
+            "Returns a result per row (created, added, reactivated, skipped or error)."
+        ),
+        tags=["Organizations"],
+        request=BulkProvisionSerializer
+    )
+    def post(self, request, org_id):
+        from apps.accounts.provisioning import provision_users
+        
+        try:
+            organization = Organization.objects.get(id=org_id)
+        except Organization.DoesNotExist:
+            return Response(
+                {"error": "Organization not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        serializer = BulkProvisionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        try:
+            results = provision_users(
+                organization,
+                serializer.validated_data['users'],
+                invited_by=request.user
+            )
+        except IntegrityError:
+            # A concurrent request created one of the accounts or memberships
+            return Response(
+                {"error": "Some users were created concurrently, nothing was saved. Please retry."},
+                status=status.HTTP_409_CONFLICT
+            )
+        
+        summary = Counter(result['status'] for result in results)
+        return Response({
+            'message': f"Provisioned {summary['created'] + summary['added'] + summary['reactivated']} of {len(results)} users",
+            'summary': {key: summary[key] for key in ('created', 'added', 'reactivated', 'skipped', 'error')},
+            'results': results,
+        }, status=status.HTTP_201_CREATED if summary['created'] or summary['added'] or summary['reactivated'] else status.HTTP_200_OK)
+
+
 class MembershipDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Get, update, or remove a membership.
     """
     serializer_class = OrganizationMembershipSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, HasOrganizationPermission]
     lookup_url_kwarg = 'membership_id'
+    organization_url_kwarg = 'org_id'
+    required_permissions = {
+        'GET': ['user.view'],
+        'PUT': ['user.assign'],
+        'PATCH': ['user.assign'],
+        'DELETE': ['user.deactivate'],
+    }
     
     @extend_schema(
         summary="Get membership detail",
@@ -248,7 +302,7 @@ class MembershipDetailView(generics.RetrieveUpdateDestroyAPIView):
     
     @extend_schema(
         summary="Update membership",
-        description="Update membership details (admin only)",
+        description="Update membership details (requires user.assign)",
         tags=["Organizations"]
     )
     def put(self, request, *args, **kwargs):
@@ -256,7 +310,7 @@ class MembershipDetailView(generics.RetrieveUpdateDestroyAPIView):
     
     @extend_schema(
         summary="Remove membership",
-        description="Remove a member from organization (admin only)",
+        description="Remove a member from organization (requires user.deactivate)",
         tags=["Organizations"]
     )
     def delete(self, request, *args, **kwargs):
@@ -269,21 +323,8 @@ class MembershipDetailView(generics.RetrieveUpdateDestroyAPIView):
         )
     
     def get_queryset(self):
-        org_id = self.kwargs.get('org_id')
-        user = self.request.user
-        
-        # Check if user has access to this organization
-        if not user.is_superuser:
-            # Verify user is an admin of this organization
-            if not OrganizationMembership.objects.filter(
-                organization_id=org_id,
-                user=user,
-                role='admin',
-                is_active=True
-            ).exists():
-                return OrganizationMembership.objects.none()
-        
+        # Access to the organization is checked by HasOrganizationPermission
         return OrganizationMembership.objects.filter(
-            organization_id=org_id
+            organization_id=self.kwargs.get('org_id')
         ).select_related('user', 'organization', 'invited_by')
 
@@ -3,7 +3,7 @@ Admin configuration for Regions app.
 """
 
 from django.contrib.gis import admin
-from .models import Region, RegionSupervisor
+from .models import Region, RegionFieldOfficer, RegionSupervisor
 
 
 @admin.register(Region)
@@ -72,3 +72,27 @@ class RegionSupervisorAdmin(admin.ModelAdmin):
         }),
     )
 
+
+@admin.register(RegionFieldOfficer)
+class RegionFieldOfficerAdmin(admin.ModelAdmin):
+    """Admin interface for RegionFieldOfficer model."""
+    
+    list_display = ['region', 'field_officer', 'assigned_by', 'is_active', 'assigned_at', 'expires_at']
+    list_filter = ['is_active', 'assigned_at']
+    search_fields = ['region__name', 'field_officer__email', 'field_officer__first_name', 'field_officer__last_name']
+    readonly_fields = ['id', 'assigned_at', 'created_at', 'updated_at']
+    autocomplete_fields = ['region', 'field_officer', 'assigned_by']
+    date_hierarchy = 'assigned_at'
+    
+    fieldsets = (
+        ('Assignment Details', {
+            'fields': ('region', 'field_officer', 'is_active')
+        }),
+        ('Assignment Info', {
+            'fields': ('assigned_by', 'assigned_at', 'expires_at')
+        }),
+        ('System Information', {
+            'fields': ('id', 'created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
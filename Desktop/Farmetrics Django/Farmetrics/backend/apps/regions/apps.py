@@ -5,4 +5,6 @@ class RegionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.regions'
     verbose_name = 'Regions'
-
+    
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,99 @@
+"""
+Management command to benchmark region scoping on real hierarchies.
+
+Times scope resolution for a supervisor or field officer (cold, after
+dropping the cached assignments and region tree, and warm), then the
+scoped farmer, farm, visit and media list queries (count plus first page),
+so the IN-list and path-prefix strategies can be compared on large trees
+by changing REGION_SCOPE_MAX_IN_CLAUSE.
+"""
+
+import time
+from statistics import median
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.models import User
+from apps.farmers.models import Farmer
+from apps.farms.models import Farm
+from apps.media.models import Media
+from apps.organizations.models import Organization
+from apps.regions.scoping import (
+    get_region_scope, invalidate_region_scope,
+    scope_farmers, scope_farms, scope_media, scope_visits,
+)
+from apps.regions.tree import invalidate_region_tree
+from apps.visits.models import Visit
+
+
+class Command(BaseCommand):
+    help = 'Time region scope resolution and scoped list queries for a user'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--organization', type=str, required=True, help='Organization slug')
+        parser.add_argument('--user', type=str, required=True, help='Email of the scoped user')
+        parser.add_argument('--iterations', type=int, default=20, help='Runs per measurement')
+        parser.add_argument('--page-size', type=int, default=20, help='Rows fetched per list query')
+
+    def handle(self, *args, **options):
+        try:
+            organization = Organization.objects.get(slug=options['organization'])
+        except Organization.DoesNotExist:
+            raise CommandError(f'Organization with slug "{options["organization"]}" not found')
+        try:
+            user = User.objects.get(email__iexact=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f'User "{options["user"]}" not found')
+
+        iterations = max(options['iterations'], 1)
+        page_size = options['page_size']
+
+        def resolve_cold():
+            invalidate_region_scope(organization.pk, user.pk)
+            invalidate_region_tree(organization.pk)
+            return get_region_scope(user, organization)
+
+        scope = resolve_cold()
+        if scope is None:
+            self.stdout.write(self.style.WARNING(
+                f'{user.email} is not region scoped in {organization.slug}; queries are unfiltered'
+            ))
+        else:
+            strategy = 'path prefix' if 'path__startswith' in str(scope.region_q('region')) else 'IN list'
+            self.stdout.write(
+                f'Scope: {len(scope.region_ids)} region(s), {len(scope.root_paths)} root(s), {strategy}'
+            )
+
+        self.report('resolve scope (cold)', self.measure(resolve_cold, iterations))
+        self.report('resolve scope (warm)', self.measure(
+            lambda: get_region_scope(user, organization), iterations
+        ))
+
+        lists = [
+            ('farmers', scope_farmers, Farmer.objects.filter(organization=organization)),
+            ('farms', scope_farms, Farm.objects.filter(organization=organization)),
+            ('visits', scope_visits, Visit.objects.filter(organization=organization)),
+            ('media', scope_media, Media.objects.filter(organization=organization)),
+        ]
+        for name, scope_function, queryset in lists:
+            def run(scope_function=scope_function, queryset=queryset):
+                request = SimpleNamespace(organization=organization, user=user)
+                scoped = scope_function(queryset, request).order_by('-created_at')
+                scoped.count()
+                list(scoped.values_list('pk', flat=True)[:page_size])
+
+            self.report(f'{name} list', self.measure(run, iterations))
+
+    def measure(self, func, iterations):
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def report(self, label, timings):
+        self.stdout.write(
+            f'{label:<24} median {median(timings):8.2f} ms   max {max(timings):8.2f} ms'
+        )
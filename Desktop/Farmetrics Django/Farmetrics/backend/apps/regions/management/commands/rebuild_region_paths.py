@@ -0,0 +1,44 @@
+"""
+Management command to rebuild materialized region paths and levels.
+
+Paths are maintained on save, but rows written before the path column
+existed, or changed with queryset updates, need a rebuild (see
+Region.rebuild_paths).
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.organizations.models import Organization
+from apps.regions.models import Region
+
+
+class Command(BaseCommand):
+    help = 'Rebuild materialized hierarchy paths and levels for regions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization',
+            type=str,
+            help='Organization slug (defaults to all organizations)'
+        )
+
+    def handle(self, *args, **options):
+        organizations = Organization.objects.all()
+
+        org_slug = options.get('organization')
+        if org_slug:
+            organizations = organizations.filter(slug=org_slug)
+            if not organizations.exists():
+                self.stdout.write(self.style.ERROR(f'Organization with slug "{org_slug}" not found'))
+                return
+
+        total_updated = 0
+        for organization in organizations:
+            updated, orphaned = Region.rebuild_paths(organization)
+            total_updated += updated
+            if orphaned:
+                self.stdout.write(self.style.WARNING(
+                    f'{organization.slug}: {orphaned} region(s) in a parent cycle were skipped'
+                ))
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt paths for {total_updated} region(s)'))
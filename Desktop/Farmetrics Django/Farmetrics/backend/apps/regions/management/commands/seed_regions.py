@@ -0,0 +1,83 @@
+"""
+Management command to seed a geographic hierarchy from a data file.
+
+Accepts nested JSON or GeoJSON (see apps/regions/seeding.py) and upserts
+the regions for one or more organizations with bulk inserts, so re-running
+it is safe.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.organizations.models import Organization
+from apps.regions.seeding import SeedError, load_seed_file, seed_regions
+
+
+class Command(BaseCommand):
+    help = 'Seed a region hierarchy from a JSON/GeoJSON file for one or more organizations'
+
+    # Bundled data file used by country-specific subclasses
+    seed_source = None
+
+    def add_arguments(self, parser):
+        if self.seed_source is None:
+            parser.add_argument(
+                '--file',
+                type=str,
+                required=True,
+                help='Path to a JSON/GeoJSON seed file, or a bundled data set name (e.g. ghana)'
+            )
+        parser.add_argument(
+            '--organization',
+            type=str,
+            action='append',
+            help='Organization slug to seed (repeat for several organizations)'
+        )
+        parser.add_argument(
+            '--all-organizations',
+            action='store_true',
+            help='Seed every active organization'
+        )
+
+    def handle(self, *args, **options):
+        source = self.seed_source or options['file']
+        slugs = options.get('organization') or []
+
+        if options['all_organizations']:
+            organizations = list(Organization.objects.filter(is_active=True))
+        elif slugs:
+            organizations = list(Organization.objects.filter(slug__in=slugs))
+            missing = set(slugs) - {organization.slug for organization in organizations}
+            for slug in sorted(missing):
+                self.stdout.write(self.style.ERROR(f'Organization with slug "{slug}" not found'))
+            if missing:
+                return
+        else:
+            self.stdout.write(self.style.ERROR('Pass --organization or --all-organizations'))
+            return
+
+        try:
+            nodes = load_seed_file(source)
+        except SeedError as e:
+            self.stdout.write(self.style.ERROR(str(e)))
+            return
+
+        self.stdout.write(f'Loaded {len(nodes)} regions from {source}')
+
+        for organization in organizations:
+            started = time.monotonic()
+            try:
+                stats = seed_regions(organization, nodes)
+            except SeedError as e:
+                self.stdout.write(self.style.ERROR(f'{organization.name}: {e}'))
+                continue
+
+            elapsed = time.monotonic() - started
+            created = sum(stats['created'].values())
+            updated = sum(stats['updated'].values())
+            self.stdout.write(self.style.SUCCESS(
+                f'{organization.name}: {created} created, {updated} updated in {elapsed:.1f}s'
+            ))
+            for level_type, count in sorted(stats['created'].items()):
+                self.stdout.write(f'  {level_type}: {count} created')
@@ -76,6 +76,15 @@ class Region(TimeStampedModel):
         help_text="Area in square kilometers"
     )
     
+    # Materialized path of ancestor IDs including this region
+    # ("<root hex>/<child hex>/.../<own hex>/"), maintained on save
+    path = models.CharField(
+        max_length=500,
+        blank=True,
+        editable=False,
+        help_text="Materialized hierarchy path (maintained automatically)"
+    )
+    
     # Management
     is_active = models.BooleanField(default=True, db_index=True)
     
@@ -93,18 +102,56 @@ class Region(TimeStampedModel):
             models.Index(fields=['organization', 'is_active']),
             models.Index(fields=['parent_region']),
             models.Index(fields=['level']),
+            # Prefix (LIKE 'path%') lookups for subtree queries
+            models.Index(fields=['path'], name='region_path_idx', opclasses=['varchar_pattern_ops']),
         ]
     
     def __str__(self):
         return f"{self.name} ({self.code})"
     
     def save(self, *args, **kwargs):
-        # Auto-calculate level from parent
-        if self.parent_region:
-            self.level = self.parent_region.level + 1
+        from django.db import transaction
+        
+        old_path = self.path
+        old_level = self.level
+        
+        # Auto-calculate level and path from parent
+        if self.parent_region_id:
+            parent_path, parent_level = Region.objects.filter(
+                pk=self.parent_region_id
+            ).values_list('path', 'level').get()
+            if not parent_path:
+                # Parent predates materialized paths
+                parent_path = self.parent_region.build_path()
+            if self.pk.hex in parent_path.split('/'):
+                raise ValueError("A region cannot be moved under its own descendant")
+            self.level = parent_level + 1
+            self.path = f"{parent_path}{self.pk.hex}/"
         else:
             self.level = 0
+            self.path = f"{self.pk.hex}/"
+        
+        self.compute_derived_fields()
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'parent_region' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'path', 'level'}
         
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            
+            # Region moved: rewrite the paths and levels of its subtree
+            if old_path and old_path != self.path:
+                from django.db.models import F, Value
+                from django.db.models.functions import Concat, Substr
+                
+                Region.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                    path=Concat(Value(self.path), Substr('path', len(old_path) + 1)),
+                    level=F('level') + (self.level - old_level)
+                )
+    
+    def compute_derived_fields(self):
+        """Derive area and center point from the polygon (also used by bulk seeding)."""
         # Auto-calculate area from polygon if not set
         if self.polygon and not self.area_sqkm:
             # Transform to equal-area projection for accurate area calculation
@@ -115,39 +162,153 @@ class Region(TimeStampedModel):
         # Auto-calculate center point from polygon if not set
         if self.polygon and not self.center_point:
             self.center_point = self.polygon.centroid
+    
+    @classmethod
+    def rebuild_paths(cls, organization):
+        """
+        Recompute materialized paths and levels for an organization's regions.
+        
+        Loads the tree once, walks it in memory and writes only changed rows.
+        
+        Returns:
+            (updated count, count of regions unreachable from a root, i.e. in a cycle)
+        """
+        from django.db import transaction
+        
+        regions = list(
+            cls.objects.filter(organization=organization).only(
+                'id', 'organization_id', 'parent_region_id', 'path', 'level'
+            )
+        )
+        by_id = {region.pk: region for region in regions}
+        children = {}
+        roots = []
+        for region in regions:
+            # Parents in another organization are treated as missing
+            if region.parent_region_id in by_id:
+                children.setdefault(region.parent_region_id, []).append(region)
+            else:
+                roots.append(region)
+        
+        changed = []
+        visited = 0
+        stack = [(root, '', -1) for root in roots]
+        while stack:
+            region, parent_path, parent_level = stack.pop()
+            visited += 1
+            path = f'{parent_path}{region.pk.hex}/'
+            level = parent_level + 1
+            if region.path != path or region.level != level:
+                region.path = path
+                region.level = level
+                changed.append(region)
+            stack.extend((child, path, level) for child in children.get(region.pk, []))
+        
+        with transaction.atomic():
+            cls.objects.bulk_update(changed, ['path', 'level'], batch_size=1000)
+        if changed:
+            # bulk_update sends no signals
+            from .tree import invalidate_region_tree
+            invalidate_region_tree(organization.pk)
         
-        super().save(*args, **kwargs)
+        return len(changed), len(regions) - visited
+    
+    def delete(self, *args, **kwargs):
+        from django.db import transaction
+        from django.db.models import F
+        from django.db.models.functions import Substr
+        
+        old_path = self.path
+        level_shift = self.level + 1
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            # Children are detached (SET_NULL), so their subtrees become roots
+            if old_path:
+                Region.objects.filter(path__startswith=old_path).update(
+                    path=Substr('path', len(old_path) + 1),
+                    level=F('level') - level_shift
+                )
+        return result
+    
+    def build_path(self):
+        """Compute the materialized path by walking parents (used for backfill)."""
+        ids = []
+        region = self
+        while region:
+            if region.pk.hex in ids:
+                raise ValueError("Region hierarchy contains a cycle")
+            ids.insert(0, region.pk.hex)
+            region = region.parent_region
+        return '/'.join(ids) + '/'
+    
+    @property
+    def ancestor_ids(self):
+        """IDs of ancestors from the root down to the parent, read from path."""
+        import uuid
+        return [uuid.UUID(part) for part in self.path.split('/')[:-2]]
     
     @property
     def full_path(self):
         """Get full hierarchical path (e.g., Ghana > Ashanti > Kumasi)."""
-        path = [self.name]
-        parent = self.parent_region
-        while parent:
-            path.insert(0, parent.name)
-            parent = parent.parent_region
-        return ' > '.join(path)
+        from .tree import get_region_tree
+        
+        tree = get_region_tree(self.organization_id)
+        if self.pk in tree:
+            return tree.full_path(self.pk)
+        
+        names = [ancestor.name for ancestor in reversed(self.get_all_ancestors())]
+        names.append(self.name)
+        return ' > '.join(names)
     
     @property
     def children_count(self):
         """Get count of direct child regions."""
+        from .tree import get_region_tree
+        
+        tree = get_region_tree(self.organization_id)
+        if self.pk in tree:
+            return len(tree.children(self.pk))
         return self.subregions.filter(is_active=True).count()
     
+    def get_descendants(self, include_self=False):
+        """All regions below this one (any depth) as a single-query queryset."""
+        queryset = Region.objects.filter(path__startswith=self.path)
+        if not include_self:
+            queryset = queryset.exclude(pk=self.pk)
+        return queryset
+    
     def get_all_children(self):
-        """Recursively get all descendant regions."""
-        children = list(self.subregions.filter(is_active=True))
-        for child in list(children):
-            children.extend(child.get_all_children())
+        """Get all active descendant regions reachable through active regions."""
+        if not self.path:
+            children = list(self.subregions.filter(is_active=True))
+            for child in list(children):
+                children.extend(child.get_all_children())
+            return children
+        
+        descendants = list(self.get_descendants().order_by('level', 'name'))
+        # An inactive region hides its whole subtree
+        reachable = {self.pk}
+        children = []
+        for region in descendants:
+            if region.is_active and region.parent_region_id in reachable:
+                reachable.add(region.pk)
+                children.append(region)
         return children
     
     def get_all_ancestors(self):
-        """Get all parent regions up to the root."""
-        ancestors = []
-        parent = self.parent_region
-        while parent:
-            ancestors.append(parent)
-            parent = parent.parent_region
-        return ancestors
+        """Get all parent regions up to the root (nearest parent first)."""
+        if not self.path:
+            ancestors = []
+            parent = self.parent_region
+            while parent:
+                ancestors.append(parent)
+                parent = parent.parent_region
+            return ancestors
+        
+        ancestor_ids = self.ancestor_ids
+        if not ancestor_ids:
+            return []
+        return list(Region.objects.filter(pk__in=ancestor_ids).order_by('-level'))
 
 
 class RegionSupervisor(TimeStampedModel):
@@ -191,3 +352,46 @@ class RegionSupervisor(TimeStampedModel):
     def __str__(self):
         return f"{self.supervisor.get_full_name()} supervises {self.region.name}"
 
+
+
+class RegionFieldOfficer(TimeStampedModel):
+    """
+    Assignment of field officers to regions.
+    Field officers only see records in their assigned regions and all
+    regions below them.
+    """
+    
+    region = models.ForeignKey(
+        Region,
+        on_delete=models.CASCADE,
+        related_name='field_officer_assignments'
+    )
+    field_officer = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.CASCADE,
+        related_name='assigned_regions'
+    )
+    
+    assigned_by = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='assigned_region_field_officers'
+    )
+    assigned_at = models.DateTimeField(auto_now_add=True)
+    is_active = models.BooleanField(default=True, db_index=True)
+    
+    # Optional: assignment can be temporary
+    expires_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-assigned_at']
+        unique_together = [['region', 'field_officer']]
+        indexes = [
+            models.Index(fields=['region', 'is_active']),
+            models.Index(fields=['field_officer', 'is_active']),
+        ]
+    
+    def __str__(self):
+        return f"{self.field_officer.get_full_name()} assigned to {self.region.name}"
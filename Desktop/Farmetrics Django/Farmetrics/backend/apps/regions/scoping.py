@@ -0,0 +1,178 @@
+"""
+Region-based data scoping for supervisors and field officers.
+
+Supervisors (RegionSupervisor) and field officers (RegionFieldOfficer) only
+see records in their assigned regions and everything below them. A user's
+role and assigned regions are cached per organization and invalidated when
+assignments or memberships change; the subtree expansion is a lookup in the
+cached region tree (see tree.py). The result is resolved once per request
+and applied to list and detail querysets (scope_farmers, scope_farms,
+scope_visits, scope_media) as an indexed ``region_id IN (...)`` filter, or
+as a prefix match on the materialized region path when the subtree is too
+large for an IN list. Records outside the scope are not found (404).
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from .tree import get_region_tree
+
+# Roles whose data access is limited to their assigned regions
+SCOPED_ROLES = {'supervisor', 'field_officer'}
+
+
+class RegionScope:
+    """Regions a user may see within one organization."""
+
+    def __init__(self, region_ids, root_paths):
+        self.region_ids = frozenset(region_ids)
+        # Paths of the assigned regions not already covered by another assignment
+        self.root_paths = tuple(root_paths)
+
+    def region_q(self, field):
+        """Q limiting a region foreign key (e.g. "region" or "farm__region") to the scope."""
+        if not self.region_ids:
+            return Q(pk__in=[])
+        if len(self.region_ids) <= settings.REGION_SCOPE_MAX_IN_CLAUSE or not all(self.root_paths):
+            return Q(**{f'{field}_id__in': self.region_ids})
+        q = Q()
+        for path in self.root_paths:
+            q |= Q(**{f'{field}__path__startswith': path})
+        return q
+
+
+def _cache_key(organization_id, user_id):
+    return f'region_scope:{organization_id}:{user_id}'
+
+
+def _load_assignments(user, organization):
+    """(role, assigned region IDs) for a user, or (None, ()) without membership."""
+    from apps.organizations.models import OrganizationMembership
+    from .models import RegionFieldOfficer, RegionSupervisor
+
+    role = OrganizationMembership.objects.filter(
+        user=user, organization=organization, is_active=True
+    ).values_list('role', flat=True).first()
+    if role not in SCOPED_ROLES:
+        return role, ()
+
+    now = timezone.now()
+    active = Q(is_active=True, region__organization=organization) & (
+        Q(expires_at__isnull=True) | Q(expires_at__gt=now)
+    )
+    if role == 'supervisor':
+        assignments = RegionSupervisor.objects.filter(active, supervisor=user)
+    else:
+        assignments = RegionFieldOfficer.objects.filter(active, field_officer=user)
+    return role, tuple(assignments.values_list('region_id', flat=True))
+
+
+def get_region_scope(user, organization):
+    """
+    Resolve the regions a user may access in an organization.
+
+    Args:
+        user: Authenticated user
+        organization: Organization being accessed
+
+    Returns:
+        RegionScope, or None if the user is not region scoped
+    """
+    if user.is_superuser:
+        return None
+
+    key = _cache_key(organization.pk, user.pk)
+    cached = cache.get(key)
+    if cached is None:
+        cached = _load_assignments(user, organization)
+        cache.set(key, cached, timeout=settings.REGION_SCOPE_CACHE_TIMEOUT)
+    role, assigned_ids = cached
+
+    if role not in SCOPED_ROLES:
+        return None
+    if not assigned_ids and not settings.REGION_SCOPING_STRICT:
+        # Unassigned users keep organization-wide access unless scoping is strict
+        return None
+
+    tree = get_region_tree(organization.pk)
+    region_ids = tree.descendant_ids(assigned_ids)
+    root_paths = [
+        tree.get(region_id).path
+        for region_id in assigned_ids
+        if region_id in tree and not any(
+            ancestor.id in assigned_ids for ancestor in tree.ancestors(region_id)
+        )
+    ]
+    return RegionScope(region_ids, root_paths)
+
+
+def get_request_region_scope(request):
+    """Region scope for the current request, resolved once per request."""
+    if not hasattr(request, '_region_scope'):
+        organization = getattr(request, 'organization', None)
+        user = getattr(request, 'user', None)
+        if organization and user and user.is_authenticated:
+            request._region_scope = get_region_scope(user, organization)
+        else:
+            request._region_scope = None
+    return request._region_scope
+
+
+def scope_queryset(queryset, request, *region_fields, extra_q=None):
+    """
+    Limit a queryset to the request user's regions.
+
+    Args:
+        queryset: Queryset to filter
+        request: Current request
+        *region_fields: Region foreign key paths; a row matches if any of
+            them is in scope (e.g. "related_farm__region", "related_farmer__region")
+        extra_q: Optional Q for rows that are always visible to the user
+            (e.g. their own visits)
+
+    Returns:
+        Filtered queryset (unchanged for unscoped users)
+    """
+    scope = get_request_region_scope(request)
+    if scope is None:
+        return queryset
+
+    q = Q(pk__in=[])
+    for field in region_fields:
+        q |= scope.region_q(field)
+    if extra_q is not None:
+        q |= extra_q
+    return queryset.filter(q)
+
+
+def scope_farmers(queryset, request, prefix=''):
+    """Limit farmers (or rows reached through ``prefix``, e.g. "farmer__") to the user's regions."""
+    return scope_queryset(queryset, request, f'{prefix}region')
+
+
+def scope_farms(queryset, request, prefix=''):
+    """Limit farms (or rows reached through ``prefix``, e.g. "farm__") to the user's regions."""
+    return scope_queryset(queryset, request, f'{prefix}region')
+
+
+def scope_visits(queryset, request, prefix=''):
+    """Limit visits to farms in the user's regions; their own visits stay visible."""
+    return scope_queryset(
+        queryset, request, f'{prefix}farm__region',
+        extra_q=Q(**{f'{prefix}field_officer_id': request.user.pk})
+    )
+
+
+def scope_media(queryset, request):
+    """Limit media to farms/farmers in the user's regions; their own uploads stay visible."""
+    return scope_queryset(
+        queryset, request, 'related_farm__region', 'related_farmer__region',
+        extra_q=Q(uploaded_by_id=request.user.pk)
+    )
+
+
+def invalidate_region_scope(organization_id, user_id):
+    """Drop a user's cached role and region assignments."""
+    cache.delete(_cache_key(organization_id, user_id))
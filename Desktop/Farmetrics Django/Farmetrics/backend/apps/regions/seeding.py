@@ -0,0 +1,244 @@
+"""
+Bulk seeding of region hierarchies from data files.
+
+A country tree is read from JSON (nested nodes with "children") or GeoJSON
+(a FeatureCollection whose features carry code/name/parent_code
+properties and optional boundaries). Existing regions are loaded with one
+query, so IDs, levels and materialized paths for the whole tree are known
+up front; regions are then written level by level with bulk_create,
+upserting on (organization, code). Re-running a seed updates names,
+parents and boundaries in place instead of creating duplicates.
+
+Bundled data files live in apps/regions/data/ and can be referenced by
+name (e.g. "ghana").
+"""
+
+import json
+import uuid
+from collections import Counter, namedtuple
+from pathlib import Path
+
+from django.db import transaction
+
+from .models import Region
+
+DATA_DIR = Path(__file__).resolve().parent / 'data'
+
+# Default level_type by depth when a node does not specify one
+DEPTH_LEVEL_TYPES = ['country', 'region', 'district', 'location']
+
+BASE_UPDATE_FIELDS = ['name', 'parent_region', 'level', 'level_type', 'path', 'updated_at']
+
+SeedNode = namedtuple('SeedNode', [
+    'code', 'name', 'parent_code', 'level_type', 'description', 'geometry', 'metadata',
+])
+
+
+class SeedError(Exception):
+    """Raised when seed data is invalid."""
+
+
+def _seed_node(data, parent_code):
+    code = str(data.get('code') or '').strip()
+    name = str(data.get('name') or '').strip()
+    if not code or not name:
+        raise SeedError(f"Every region needs a code and a name (got {data!r:.80})")
+    return SeedNode(
+        code=code,
+        name=name,
+        parent_code=parent_code,
+        level_type=data.get('level_type'),
+        description=data.get('description'),
+        geometry=data.get('geometry'),
+        metadata=data.get('metadata'),
+    )
+
+
+def nodes_from_nested(data):
+    """Flatten nested {"code", "name", "children": [...]} nodes (a root or a list of roots)."""
+    roots = data if isinstance(data, list) else [data]
+    nodes = []
+    stack = [(root, None) for root in reversed(roots)]
+    while stack:
+        item, parent_code = stack.pop()
+        node = _seed_node(item, parent_code)
+        nodes.append(node)
+        stack.extend((child, node.code) for child in reversed(item.get('children') or []))
+    return nodes
+
+
+def nodes_from_feature_collection(data):
+    """Seed nodes from a GeoJSON FeatureCollection (hierarchy via parent_code)."""
+    nodes = []
+    for feature in data.get('features') or []:
+        properties = dict(feature.get('properties') or {})
+        properties['geometry'] = feature.get('geometry')
+        nodes.append(_seed_node(properties, properties.get('parent_code') or None))
+    return nodes
+
+
+def load_seed_file(source):
+    """
+    Load seed nodes from a data file.
+
+    Args:
+        source: Path to a .json/.geojson file, or the name of a bundled
+            data file (e.g. "ghana")
+
+    Returns:
+        List of SeedNode
+
+    Raises:
+        SeedError: If the file is missing or invalid
+    """
+    path = Path(source)
+    if not path.exists():
+        path = DATA_DIR / f'{source}.json'
+    if not path.exists():
+        raise SeedError(f'Seed file "{source}" not found')
+
+    try:
+        with open(path, encoding='utf-8') as handle:
+            data = json.load(handle)
+    except ValueError as e:
+        raise SeedError(f'Invalid JSON in {path}: {e}')
+
+    if isinstance(data, dict) and data.get('type') == 'FeatureCollection':
+        nodes = nodes_from_feature_collection(data)
+    else:
+        nodes = nodes_from_nested(data)
+
+    duplicates = [code for code, count in Counter(node.code for node in nodes).items() if count > 1]
+    if duplicates:
+        raise SeedError(f"Duplicate region codes in {path}: {', '.join(sorted(duplicates)[:10])}")
+    return nodes
+
+
+def _polygon(geometry):
+    from django.contrib.gis.geos import GEOSGeometry, MultiPolygon
+
+    polygon = GEOSGeometry(json.dumps(geometry), srid=4326)
+    if polygon.geom_type == 'Polygon':
+        polygon = MultiPolygon(polygon, srid=4326)
+    if polygon.geom_type != 'MultiPolygon':
+        raise SeedError(f"Region boundaries must be polygons (got {polygon.geom_type})")
+    return polygon
+
+
+def _build_region(organization, node, region_id, parent, depth):
+    """Unsaved Region for a seed node, plus the fields to update on conflict."""
+    parent_id, parent_path = parent if parent else (None, '')
+    region = Region(
+        id=region_id,
+        organization=organization,
+        code=node.code,
+        name=node.name,
+        parent_region_id=parent_id,
+        level=depth,
+        level_type=node.level_type or DEPTH_LEVEL_TYPES[min(depth, len(DEPTH_LEVEL_TYPES) - 1)],
+        path=f'{parent_path}{region_id.hex}/',
+    )
+
+    update_fields = list(BASE_UPDATE_FIELDS)
+    if node.description is not None:
+        region.description = node.description
+        update_fields.append('description')
+    if node.metadata is not None:
+        region.metadata = node.metadata
+        update_fields.append('metadata')
+    if node.geometry:
+        region.polygon = _polygon(node.geometry)
+        region.compute_derived_fields()
+        update_fields.extend(['polygon', 'area_sqkm', 'center_point'])
+    return region, tuple(update_fields)
+
+
+def seed_regions(organization, nodes, batch_size=1000):
+    """
+    Upsert a region hierarchy for an organization.
+
+    Parents must appear in the seed data or already exist in the
+    organization (matched by code).
+
+    Args:
+        organization: Organization to seed
+        nodes: List of SeedNode (see load_seed_file)
+        batch_size: Rows per INSERT statement
+
+    Returns:
+        Dictionary with "created" and "updated" Counters keyed by level_type
+
+    Raises:
+        SeedError: If a parent code cannot be resolved
+    """
+    from .tree import invalidate_region_tree
+
+    seeded_codes = {node.code for node in nodes}
+    children = {}
+    for node in nodes:
+        children.setdefault(node.parent_code, []).append(node)
+
+    created = Counter()
+    updated = Counter()
+
+    with transaction.atomic():
+        existing = {
+            code: (region_id, path, level, parent_id)
+            for code, region_id, path, level, parent_id in Region.objects.filter(
+                organization=organization
+            ).values_list('code', 'id', 'path', 'level', 'parent_region_id')
+        }
+
+        # Roots of the seed: no parent, or a parent outside the seed data
+        level_nodes = []
+        for node in nodes:
+            if node.parent_code is None:
+                level_nodes.append((node, None, 0))
+            elif node.parent_code not in seeded_codes:
+                if node.parent_code not in existing:
+                    raise SeedError(f'Parent region "{node.parent_code}" of "{node.code}" not found')
+                parent_id, parent_path, parent_level, _ = existing[node.parent_code]
+                level_nodes.append((node, (parent_id, parent_path), parent_level + 1))
+
+        moved = False
+        seen = 0
+        while level_nodes:
+            groups = {}
+            next_level = []
+            for node, parent, depth in level_nodes:
+                current = existing.get(node.code)
+                region_id = current[0] if current else uuid.uuid4()
+                region, update_fields = _build_region(organization, node, region_id, parent, depth)
+                groups.setdefault(update_fields, []).append(region)
+
+                if current:
+                    updated[region.level_type] += 1
+                    # Regions outside the seed may hang below a moved region
+                    moved = moved or current[1] != region.path
+                else:
+                    created[region.level_type] += 1
+                next_level.extend(
+                    (child, (region.pk, region.path), depth + 1)
+                    for child in children.get(node.code, [])
+                )
+
+            for update_fields, regions in groups.items():
+                Region.objects.bulk_create(
+                    regions,
+                    batch_size=batch_size,
+                    update_conflicts=True,
+                    unique_fields=['organization', 'code'],
+                    update_fields=list(update_fields),
+                )
+            seen += len(level_nodes)
+            level_nodes = next_level
+
+        if seen != len(nodes):
+            raise SeedError('Seed data contains a parent cycle')
+
+        if moved:
+            Region.rebuild_paths(organization)
+
+    # bulk_create sends no signals
+    invalidate_region_tree(organization.pk)
+    return {'created': created, 'updated': updated}
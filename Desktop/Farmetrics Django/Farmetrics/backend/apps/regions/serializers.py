@@ -4,15 +4,40 @@ Serializers for regions app.
 
 from rest_framework import serializers
 from rest_framework_gis.serializers import GeoFeatureModelSerializer
-from .models import Region, RegionSupervisor
+from .models import Region, RegionFieldOfficer, RegionSupervisor
+from .tree import get_region_tree
 
 
-class RegionSerializer(GeoFeatureModelSerializer):
+class RegionTreeMixin:
+    """Resolve hierarchy fields from the cached region tree (one fetch per serialization)."""
+    
+    def region_tree(self, organization_id):
+        trees = self.context.setdefault('region_trees', {})
+        if organization_id not in trees:
+            trees[organization_id] = get_region_tree(organization_id)
+        return trees[organization_id]
+    
+    def get_full_path(self, obj):
+        tree = self.region_tree(obj.organization_id)
+        return tree.full_path(obj.pk) if obj.pk in tree else obj.full_path
+    
+    def get_parent_region_name(self, obj):
+        if not obj.parent_region_id:
+            return None
+        node = self.region_tree(obj.organization_id).get(obj.parent_region_id)
+        return node.name if node else obj.parent_region.name
+    
+    def get_children_count(self, obj):
+        tree = self.region_tree(obj.organization_id)
+        return len(tree.children(obj.pk)) if obj.pk in tree else obj.children_count
+
+
+class RegionSerializer(RegionTreeMixin, GeoFeatureModelSerializer):
     """Serializer for Region model with GeoJSON support."""
     
-    parent_region_name = serializers.CharField(source='parent_region.name', read_only=True)
-    full_path = serializers.CharField(read_only=True)
-    children_count = serializers.IntegerField(read_only=True)
+    parent_region_name = serializers.SerializerMethodField()
+    full_path = serializers.SerializerMethodField()
+    children_count = serializers.SerializerMethodField()
     level_type_display = serializers.CharField(source='get_level_type_display', read_only=True)
     
     class Meta:
@@ -28,12 +53,12 @@ class RegionSerializer(GeoFeatureModelSerializer):
         read_only_fields = ['id', 'area_sqkm', 'center_point', 'level', 'created_at', 'updated_at']
 
 
-class RegionListSerializer(serializers.ModelSerializer):
+class RegionListSerializer(RegionTreeMixin, serializers.ModelSerializer):
     """Lightweight serializer for region lists (without geometry)."""
     
-    parent_region_name = serializers.CharField(source='parent_region.name', read_only=True)
+    parent_region_name = serializers.SerializerMethodField()
     level_type_display = serializers.CharField(source='get_level_type_display', read_only=True)
-    children_count = serializers.IntegerField(read_only=True)
+    children_count = serializers.SerializerMethodField()
     
     class Meta:
         model = Region
@@ -59,8 +84,13 @@ class RegionHierarchySerializer(serializers.ModelSerializer):
     
     def get_children(self, obj):
         """Get direct children of this region."""
-        children = obj.subregions.filter(is_active=True)
-        return RegionHierarchySerializer(children, many=True).data
+        # Views pass the whole tree prefetched as {parent_id: [children]}
+        children_map = self.context.get('children_map')
+        if children_map is not None:
+            children = children_map.get(obj.pk, [])
+        else:
+            children = obj.subregions.filter(is_active=True)
+        return RegionHierarchySerializer(children, many=True, context=self.context).data
 
 
 class RegionSupervisorSerializer(serializers.ModelSerializer):
@@ -100,3 +130,40 @@ class AssignSupervisorSerializer(serializers.Serializer):
         except User.DoesNotExist:
             raise serializers.ValidationError("User not found")
 
+
+class RegionFieldOfficerSerializer(serializers.ModelSerializer):
+    """Serializer for RegionFieldOfficer model."""
+    
+    region_name = serializers.CharField(source='region.name', read_only=True)
+    field_officer_name = serializers.CharField(source='field_officer.get_full_name', read_only=True)
+    field_officer_email = serializers.EmailField(source='field_officer.email', read_only=True)
+    assigned_by_name = serializers.CharField(source='assigned_by.get_full_name', read_only=True)
+    
+    class Meta:
+        model = RegionFieldOfficer
+        fields = [
+            'id', 'region', 'region_name', 'field_officer', 'field_officer_name',
+            'field_officer_email', 'assigned_by', 'assigned_by_name',
+            'assigned_at', 'is_active', 'expires_at', 'created_at'
+        ]
+        read_only_fields = ['id', 'assigned_at', 'created_at']
+
+
+class AssignFieldOfficerSerializer(serializers.Serializer):
+    """Serializer for assigning a field officer to a region."""
+    
+    field_officer_id = serializers.UUIDField(required=True)
+    expires_at = serializers.DateTimeField(required=False, allow_null=True)
+    
+    def validate_field_officer_id(self, value):
+        from apps.accounts.models import User
+        try:
+            user = User.objects.get(id=value)
+            # Check if user has field officer role
+            if not user.organization_memberships.filter(
+                role='field_officer', is_active=True
+            ).exists():
+                raise serializers.ValidationError("User must have field officer role")
+            return user
+        except User.DoesNotExist:
+            raise serializers.ValidationError("User not found")
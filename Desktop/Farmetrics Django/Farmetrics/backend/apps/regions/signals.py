@@ -0,0 +1,44 @@
+"""
+Signal handlers for regions app.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.organizations.models import OrganizationMembership
+
+from .models import Region, RegionFieldOfficer, RegionSupervisor
+from .scoping import invalidate_region_scope
+from .tree import invalidate_region_tree
+
+
+@receiver(post_save, sender=Region)
+@receiver(post_delete, sender=Region)
+def invalidate_region_tree_on_change(sender, instance, **kwargs):
+    """Drop the organization's cached region tree once the write commits."""
+    organization_id = instance.organization_id
+    transaction.on_commit(lambda: invalidate_region_tree(organization_id))
+
+
+@receiver(post_save, sender=RegionSupervisor)
+@receiver(post_delete, sender=RegionSupervisor)
+@receiver(post_save, sender=RegionFieldOfficer)
+@receiver(post_delete, sender=RegionFieldOfficer)
+def invalidate_region_scope_on_assignment(sender, instance, **kwargs):
+    """Drop the assigned user's cached region scope."""
+    user_id = instance.supervisor_id if sender is RegionSupervisor else instance.field_officer_id
+    organization_id = Region.objects.filter(pk=instance.region_id).values_list(
+        'organization_id', flat=True
+    ).first()
+    if organization_id:
+        transaction.on_commit(lambda: invalidate_region_scope(organization_id, user_id))
+
+
+@receiver(post_save, sender=OrganizationMembership)
+@receiver(post_delete, sender=OrganizationMembership)
+def invalidate_region_scope_on_membership(sender, instance, **kwargs):
+    """Role changes switch region scoping on or off."""
+    organization_id = instance.organization_id
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_region_scope(organization_id, user_id))
@@ -0,0 +1,235 @@
+"""
+Tests for regions app.
+"""
+
+import uuid
+from datetime import timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.farmers.models import Farmer
+from apps.farms.models import Farm
+from apps.media.models import Media
+from apps.organizations.models import Organization, OrganizationMembership
+from apps.visits.models import Visit
+
+from .models import Region, RegionFieldOfficer, RegionSupervisor
+from .scoping import get_region_scope
+
+
+class AssignFieldOfficerTests(TestCase):
+    """Re-assigning a field officer renews their existing assignment row."""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Regions Org')
+        self.region = Region.objects.create(organization=self.organization, name='Ashanti', code='GH-AH')
+        self.officer = User.objects.create_user(email='officer@example.com', password='x')
+        OrganizationMembership.objects.create(
+            organization=self.organization, user=self.officer, role='field_officer'
+        )
+        self.admin = User.objects.create_user(email='admin@example.com', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.url = reverse('regions:region_field_officers', args=[self.region.pk])
+
+    def assign(self):
+        return self.client.post(self.url, {'field_officer_id': str(self.officer.pk)}, format='json')
+
+    def test_deactivated_assignment_is_reactivated(self):
+        assignment = RegionFieldOfficer.objects.create(
+            region=self.region, field_officer=self.officer, is_active=False
+        )
+
+        response = self.assign()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['id'], str(assignment.pk))
+        assignment.refresh_from_db()
+        self.assertTrue(assignment.is_active)
+        self.assertEqual(assignment.assigned_by, self.admin)
+        self.assertEqual(RegionFieldOfficer.objects.count(), 1)
+
+    def test_expired_assignment_is_renewed(self):
+        RegionFieldOfficer.objects.create(
+            region=self.region,
+            field_officer=self.officer,
+            expires_at=timezone.now() - timedelta(days=1)
+        )
+
+        response = self.assign()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNone(RegionFieldOfficer.objects.get().expires_at)
+
+    def test_active_assignment_is_rejected(self):
+        self.assertEqual(self.assign().status_code, 201)
+        self.assertEqual(self.assign().status_code, 400)
+        self.assertEqual(RegionFieldOfficer.objects.count(), 1)
+
+
+class RegionScopedDetailTests(TestCase):
+    """Scoped users get 404 for records outside their region subtree."""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Scoped Org')
+        country = Region.objects.create(organization=self.organization, name='Ghana', code='GH')
+        self.ashanti = Region.objects.create(
+            organization=self.organization, name='Ashanti', code='GH-AH', parent_region=country
+        )
+        self.kumasi = Region.objects.create(
+            organization=self.organization, name='Kumasi', code='GH-AH-KU', parent_region=self.ashanti
+        )
+        self.volta = Region.objects.create(
+            organization=self.organization, name='Volta', code='GH-TV', parent_region=country
+        )
+
+        self.admin = User.objects.create_user(email='scope-admin@example.com', password='x')
+        OrganizationMembership.objects.create(
+            organization=self.organization, user=self.admin, role='country_admin'
+        )
+        self.officer = User.objects.create_user(email='scope-officer@example.com', password='x')
+        OrganizationMembership.objects.create(
+            organization=self.organization, user=self.officer, role='field_officer'
+        )
+        RegionFieldOfficer.objects.create(region=self.ashanti, field_officer=self.officer)
+
+        self.inside = self.create_records(self.kumasi, 1)
+        self.outside = self.create_records(self.volta, 2)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.officer)
+        self.client.credentials(HTTP_X_ORGANIZATION_SLUG=self.organization.slug)
+
+    def create_records(self, region, index):
+        farmer = Farmer.objects.create(
+            organization=self.organization,
+            first_name='Kofi',
+            last_name=f'Asante{index}',
+            phone_number=f'+23320{index:07d}',
+            region=region,
+        )
+        farm = Farm.objects.create(
+            organization=self.organization, owner=farmer, name=f'Farm {index}', region=region
+        )
+        visit = Visit.objects.create(
+            organization=self.organization,
+            farm=farm,
+            farmer=farmer,
+            visit_date=timezone.now(),
+            field_officer=self.admin,
+        )
+        media = Media.objects.create(
+            organization=self.organization,
+            file=SimpleUploadedFile(f'photo{index}.txt', b'data'),
+            media_type='document',
+            file_name=f'photo{index}.txt',
+            file_size=4,
+            uploaded_by=self.admin,
+            related_farm=farm,
+        )
+        return {
+            'farmers:farmer_detail': farmer.pk,
+            'farms:farm_detail': farm.pk,
+            'visits:visit_detail': visit.pk,
+            'media:media_detail': media.pk,
+            'media:media_file': media.pk,
+        }
+
+    def test_records_in_subtree_are_visible(self):
+        for url_name, pk in self.inside.items():
+            with self.subTest(url_name):
+                self.assertEqual(self.client.get(reverse(url_name, args=[pk])).status_code, 200)
+
+    def test_records_outside_subtree_are_not_found(self):
+        for url_name, pk in self.outside.items():
+            with self.subTest(url_name):
+                self.assertEqual(self.client.get(reverse(url_name, args=[pk])).status_code, 404)
+
+    def test_own_visits_stay_visible_outside_subtree(self):
+        visit = Visit.objects.get(pk=self.outside['visits:visit_detail'])
+        visit.field_officer = self.officer
+        visit.save()
+
+        response = self.client.get(reverse('visits:visit_detail', args=[visit.pk]))
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_unscoped_roles_see_every_region(self):
+        self.client.force_authenticate(self.admin)
+
+        response = self.client.get(reverse('farmers:farmer_detail', args=[self.outside['farmers:farmer_detail']]))
+
+        self.assertEqual(response.status_code, 200)
+
+
+class LargeHierarchyScopeTests(TestCase):
+    """Scope resolution and scoped queries on a hierarchy larger than the IN-list limit."""
+
+    # 1 country, 10 regions, 10 districts each, 12 locations per district (1311 regions)
+    fanout = (10, 10, 12)
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Large Org')
+        country = Region.objects.create(organization=self.organization, name='Country', code='C')
+
+        regions = []
+        parents = [country]
+        for depth, fanout in enumerate(self.fanout, start=1):
+            level = []
+            for parent in parents:
+                for index in range(fanout):
+                    region_id = uuid.uuid4()
+                    level.append(Region(
+                        id=region_id,
+                        organization=self.organization,
+                        name=f'{parent.name}-{index}',
+                        code=f'{parent.code}-{index}',
+                        parent_region=parent,
+                        level=depth,
+                        path=f'{parent.path}{region_id.hex}/',
+                    ))
+            regions.extend(level)
+            parents = level
+        Region.objects.bulk_create(regions, batch_size=500)
+        self.root = country
+        self.leaf = parents[-1]
+
+        self.supervisor = User.objects.create_user(email='large-supervisor@example.com', password='x')
+        OrganizationMembership.objects.create(
+            organization=self.organization, user=self.supervisor, role='supervisor'
+        )
+        RegionSupervisor.objects.create(region=self.root, supervisor=self.supervisor)
+
+    def test_large_scope_uses_path_prefix(self):
+        scope = get_region_scope(self.supervisor, self.organization)
+
+        self.assertEqual(len(scope.region_ids), Region.objects.filter(organization=self.organization).count())
+        self.assertEqual(scope.root_paths, (self.root.path,))
+        self.assertIn('path__startswith', str(scope.region_q('region')))
+
+    def test_warm_resolution_runs_no_queries(self):
+        get_region_scope(self.supervisor, self.organization)
+
+        with self.assertNumQueries(0):
+            get_region_scope(self.supervisor, self.organization)
+
+    def test_scoped_detail_finds_deep_records(self):
+        farmer = Farmer.objects.create(
+            organization=self.organization,
+            first_name='Yaa',
+            last_name='Boateng',
+            phone_number='+233201234567',
+            region=self.leaf,
+        )
+        client = APIClient()
+        client.force_authenticate(self.supervisor)
+        client.credentials(HTTP_X_ORGANIZATION_SLUG=self.organization.slug)
+
+        response = client.get(reverse('farmers:farmer_detail', args=[farmer.pk]))
+
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,203 @@
+"""
+Cached per-organization region tree snapshots.
+
+Regions change rarely but are read on almost every request (full paths in
+serializers and search, dropdowns, scoping). A snapshot of an
+organization's whole tree is built with one query, stored in the shared
+cache under a version number and kept in process memory, so resolving
+names, ancestors and subtrees is a dictionary lookup. Region writes bump
+the organization's version (see signals.py), which makes every process
+rebuild or re-fetch the snapshot on its next read.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+RegionNode = namedtuple('RegionNode', [
+    'id', 'name', 'code', 'parent_id', 'path', 'depth', 'level_type',
+    'is_active', 'children',
+])
+
+_lock = threading.Lock()
+# organization id -> (version, RegionTree)
+_local = {}
+
+
+class RegionTree:
+    """Immutable snapshot of one organization's region hierarchy."""
+
+    def __init__(self, organization_id, nodes):
+        self.organization_id = organization_id
+        self.nodes = nodes
+        self.roots = tuple(
+            node.id for node in nodes.values() if node.parent_id is None
+        )
+
+    def __contains__(self, region_id):
+        return region_id in self.nodes
+
+    def get(self, region_id):
+        """Node for a region, or None if it is not in this organization."""
+        return self.nodes.get(region_id)
+
+    def ancestors(self, region_id):
+        """Ancestor nodes from the root down to the parent."""
+        node = self.nodes.get(region_id)
+        ancestors = []
+        while node and node.parent_id is not None:
+            node = self.nodes.get(node.parent_id)
+            if node:
+                ancestors.append(node)
+        ancestors.reverse()
+        return ancestors
+
+    def full_path(self, region_id, separator=' > '):
+        """Names from the root down to the region, e.g. "Ghana > Ashanti > Kumasi"."""
+        node = self.nodes.get(region_id)
+        if node is None:
+            return ''
+        return separator.join([*(a.name for a in self.ancestors(region_id)), node.name])
+
+    def children(self, region_id, active_only=True):
+        """Direct child nodes of a region."""
+        node = self.nodes.get(region_id)
+        if node is None:
+            return []
+        children = [self.nodes[child_id] for child_id in node.children]
+        if active_only:
+            children = [child for child in children if child.is_active]
+        return children
+
+    def descendant_ids(self, region_ids, include_self=True, active_only=False):
+        """
+        IDs of all regions below the given regions.
+
+        With active_only, inactive regions and everything below them are
+        left out.
+        """
+        result = set()
+        stack = [region_id for region_id in region_ids if region_id in self.nodes]
+        while stack:
+            region_id = stack.pop()
+            if region_id in result:
+                continue
+            node = self.nodes[region_id]
+            if active_only and not node.is_active:
+                continue
+            result.add(region_id)
+            stack.extend(node.children)
+        if not include_self:
+            result.difference_update(region_ids)
+        return result
+
+
+def build_region_tree(organization_id):
+    """Build a snapshot from the database with a single query."""
+    from .models import Region
+
+    rows = list(
+        Region.objects.filter(organization_id=organization_id).order_by(
+            'level', 'name'
+        ).values_list('id', 'name', 'code', 'parent_region_id', 'path', 'is_active', 'level_type')
+    )
+    region_ids = {row[0] for row in rows}
+    children = {}
+    for region_id, _, _, parent_id, *_ in rows:
+        if parent_id in region_ids:
+            children.setdefault(parent_id, []).append(region_id)
+
+    # Depth from the tree itself so rows without a backfilled path still work
+    depths = {}
+    stack = [(row[0], 0) for row in rows if row[3] not in region_ids]
+    while stack:
+        region_id, depth = stack.pop()
+        depths[region_id] = depth
+        stack.extend((child_id, depth + 1) for child_id in children.get(region_id, ()))
+
+    nodes = {}
+    for region_id, name, code, parent_id, path, is_active, level_type in rows:
+        if parent_id not in region_ids:
+            parent_id = None
+        nodes[region_id] = RegionNode(
+            id=region_id,
+            name=name,
+            code=code,
+            parent_id=parent_id,
+            path=path,
+            depth=depths.get(region_id, 0),
+            level_type=level_type,
+            is_active=is_active,
+            children=tuple(children.get(region_id, ())),
+        )
+    return RegionTree(organization_id, nodes)
+
+
+def _version_key(organization_id):
+    return f'region_tree_version:{organization_id}'
+
+
+def _tree_key(organization_id, version):
+    return f'region_tree:{organization_id}:{version}'
+
+
+def get_region_tree(organization_id):
+    """
+    Current region tree snapshot for an organization.
+
+    Args:
+        organization_id: Organization ID
+
+    Returns:
+        RegionTree (treat as read-only, it is shared between requests)
+    """
+    version = cache.get(_version_key(organization_id))
+    if version is None:
+        # Time-based start so an evicted version never reuses an old snapshot key
+        cache.add(_version_key(organization_id), time.time_ns(), timeout=None)
+        version = cache.get(_version_key(organization_id))
+
+    with _lock:
+        cached = _local.get(organization_id)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    tree = cache.get(_tree_key(organization_id, version))
+    if tree is None:
+        tree = build_region_tree(organization_id)
+        cache.set(_tree_key(organization_id, version), tree, timeout=settings.REGION_TREE_CACHE_TIMEOUT)
+
+    with _lock:
+        _local[organization_id] = (version, tree)
+    return tree
+
+
+def region_full_paths(regions):
+    """
+    Full paths for several regions, fetching each organization's tree once.
+
+    Returns:
+        Dictionary mapping region ID to its full path
+    """
+    trees = {}
+    paths = {}
+    for region in regions:
+        tree = trees.get(region.organization_id)
+        if tree is None:
+            tree = trees[region.organization_id] = get_region_tree(region.organization_id)
+        paths[region.pk] = tree.full_path(region.pk) or region.name
+    return paths
+
+
+def invalidate_region_tree(organization_id):
+    """Bump the organization's snapshot version so all processes rebuild it."""
+    try:
+        cache.incr(_version_key(organization_id))
+    except ValueError:
+        # No version yet; the next read starts one
+        pass
+    with _lock:
+        _local.pop(organization_id, None)
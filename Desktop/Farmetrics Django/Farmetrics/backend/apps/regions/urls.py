@@ -16,5 +16,8 @@ urlpatterns = [
     
     # Supervisors
     path('<uuid:region_id>/supervisors/', views.RegionSupervisorListView.as_view(), name='region_supervisors'),
+    
+    # Field officers
+    path('<uuid:region_id>/field-officers/', views.RegionFieldOfficerListView.as_view(), name='region_field_officers'),
 ]
 
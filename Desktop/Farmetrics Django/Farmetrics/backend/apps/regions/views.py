@@ -5,16 +5,19 @@ Views for regions app.
 from rest_framework import generics, status, permissions, filters
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
 
-from .models import Region, RegionSupervisor
+from .models import Region, RegionFieldOfficer, RegionSupervisor
 from .serializers import (
     RegionSerializer,
     RegionListSerializer,
     RegionHierarchySerializer,
     RegionSupervisorSerializer,
     AssignSupervisorSerializer,
+    RegionFieldOfficerSerializer,
+    AssignFieldOfficerSerializer,
 )
 
 
@@ -153,13 +156,24 @@ class RegionHierarchyView(APIView):
         tags=["Regions"]
     )
     def get(self, request):
-        queryset = Region.objects.filter(parent_region__isnull=True, is_active=True)
+        queryset = Region.objects.filter(is_active=True)
         
         # Filter by organization
         if hasattr(request, 'organization') and request.organization:
             queryset = queryset.filter(organization=request.organization)
         
-        serializer = RegionHierarchySerializer(queryset, many=True)
+        # Fetch the whole tree once and assemble it in memory
+        roots = []
+        children_map = {}
+        for region in queryset.defer('polygon', 'center_point', 'metadata'):
+            if region.parent_region_id is None:
+                roots.append(region)
+            else:
+                children_map.setdefault(region.parent_region_id, []).append(region)
+        
+        serializer = RegionHierarchySerializer(
+            roots, many=True, context={'children_map': children_map}
+        )
         return Response(serializer.data)
 
 
@@ -218,28 +232,105 @@ class RegionSupervisorListView(generics.ListCreateAPIView):
         supervisor = serializer.validated_data['supervisor_id']
         expires_at = serializer.validated_data.get('expires_at')
         
-        # Check if already assigned
-        existing = RegionSupervisor.objects.filter(
+        # One row per region and supervisor: a deactivated or expired
+        # assignment is renewed instead of adding a second row
+        assignment, created = RegionSupervisor.objects.get_or_create(
             region=region,
             supervisor=supervisor,
-            is_active=True
-        ).first()
+            defaults={'assigned_by': request.user, 'expires_at': expires_at}
+        )
+        
+        if not created:
+            now = timezone.now()
+            if assignment.is_active and (assignment.expires_at is None or assignment.expires_at > now):
+                return Response(
+                    {"error": "Supervisor already assigned to this region"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            assignment.is_active = True
+            assignment.assigned_by = request.user
+            assignment.assigned_at = now
+            assignment.expires_at = expires_at
+            assignment.save(update_fields=['is_active', 'assigned_by', 'assigned_at', 'expires_at', 'updated_at'])
         
-        if existing:
+        return Response(
+            RegionSupervisorSerializer(assignment).data,
+            status=status.HTTP_201_CREATED
+        )
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        
+        region_id = self.kwargs.get('region_id')
+        if region_id:
+            queryset = queryset.filter(region_id=region_id, is_active=True)
+        
+        return queryset.select_related('region', 'supervisor', 'assigned_by')
+
+
+class RegionFieldOfficerListView(generics.ListCreateAPIView):
+    """
+    List or assign field officers to a region.
+    """
+    queryset = RegionFieldOfficer.objects.all()
+    serializer_class = RegionFieldOfficerSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    @extend_schema(
+        summary="List region field officers",
+        description="Get field officers assigned to a region",
+        tags=["Regions"]
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+    
+    @extend_schema(
+        summary="Assign field officer",
+        description="Assign a field officer to a region; they will only see records in this region and its subregions",
+        tags=["Regions"],
+        request=AssignFieldOfficerSerializer
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = AssignFieldOfficerSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        region_id = self.kwargs.get('region_id')
+        try:
+            region = Region.objects.get(id=region_id)
+        except Region.DoesNotExist:
             return Response(
-                {"error": "Supervisor already assigned to this region"},
-                status=status.HTTP_400_BAD_REQUEST
+                {"error": "Region not found"},
+                status=status.HTTP_404_NOT_FOUND
             )
         
-        assignment = RegionSupervisor.objects.create(
+        field_officer = serializer.validated_data['field_officer_id']
+        expires_at = serializer.validated_data.get('expires_at')
+        
+        # One row per region and field officer: a deactivated or expired
+        # assignment is renewed instead of adding a second row
+        assignment, created = RegionFieldOfficer.objects.get_or_create(
             region=region,
-            supervisor=supervisor,
-            assigned_by=request.user,
-            expires_at=expires_at
+            field_officer=field_officer,
+            defaults={'assigned_by': request.user, 'expires_at': expires_at}
         )
         
+        if not created:
+            now = timezone.now()
+            if assignment.is_active and (assignment.expires_at is None or assignment.expires_at > now):
+                return Response(
+                    {"error": "Field officer already assigned to this region"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            assignment.is_active = True
+            assignment.assigned_by = request.user
+            assignment.assigned_at = now
+            assignment.expires_at = expires_at
+            assignment.save(update_fields=['is_active', 'assigned_by', 'assigned_at', 'expires_at', 'updated_at'])
+        
         return Response(
-            RegionSupervisorSerializer(assignment).data,
+            RegionFieldOfficerSerializer(assignment).data,
             status=status.HTTP_201_CREATED
         )
     
@@ -250,5 +341,4 @@ class RegionSupervisorListView(generics.ListCreateAPIView):
         if region_id:
             queryset = queryset.filter(region_id=region_id, is_active=True)
         
-        return queryset.select_related('region', 'supervisor', 'assigned_by')
-
+        return queryset.select_related('region', 'field_officer', 'assigned_by')
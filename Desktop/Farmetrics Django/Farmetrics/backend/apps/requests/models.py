@@ -169,22 +169,16 @@ class Request(SoftDeleteModel):
     
     def generate_request_code(self):
         """Generate unique request code."""
-        import random
-        import string
-        from django.utils import timezone
-        
-        # Format: REQ-YEAR-RANDOM (e.g., REQ-2025-A1B2C3)
-        year = timezone.now().year
-        random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        
-        request_code = f"REQ-{year}-{random_part}"
-        
-        # Ensure uniqueness
-        while Request.objects.filter(request_code=request_code).exists():
-            random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-            request_code = f"REQ-{year}-{random_part}"
+        from apps.core.codes import next_code
         
-        return request_code
+        # Format: REQ-YEAR-SEQUENCE (e.g., REQ-2025-000001A)
+        return next_code('REQ')
+    
+    @classmethod
+    def generate_request_codes(cls, count):
+        """Generate count unique request codes for bulk creation."""
+        from apps.core.codes import allocate_codes
+        return allocate_codes('REQ', count)
 
 
 class RequestComment(TimeStampedModel):
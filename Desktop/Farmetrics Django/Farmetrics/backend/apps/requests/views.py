@@ -9,6 +9,8 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
 from drf_spectacular.utils import extend_schema
 
+from apps.core.events import publish
+
 from .models import Request, RequestComment
 from .serializers import (
     RequestSerializer,
@@ -72,12 +74,17 @@ class RequestListView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         # Set organization and requested_by
         if hasattr(self.request, 'organization') and self.request.organization:
-            serializer.save(
+            req = serializer.save(
                 organization=self.request.organization,
                 requested_by=self.request.user
             )
         else:
-            serializer.save(requested_by=self.request.user)
+            req = serializer.save(requested_by=self.request.user)
+        
+        publish(
+            'request.created', {'request_id': req.pk},
+            actor=self.request.user, organization_id=req.organization_id, request=self.request
+        )
 
 
 class RequestDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -187,7 +194,11 @@ class RequestApproveView(APIView):
             
             req.save()
             
-            # TODO: Send notification to requester
+            # request.approved / request.rejected / request.cancelled
+            publish(
+                f'request.{req.status}', {'request_id': req.pk, 'reason': reason},
+                actor=request.user, organization_id=req.organization_id, request=request
+            )
             
             return Response(
                 RequestSerializer(req).data,
@@ -268,6 +279,11 @@ class TransferRequestCreateView(APIView):
             priority='normal'
         )
         
+        publish(
+            'request.created', {'request_id': req.pk},
+            actor=request.user, organization_id=req.organization_id, request=request
+        )
+        
         return Response(
             RequestSerializer(req).data,
             status=status.HTTP_201_CREATED
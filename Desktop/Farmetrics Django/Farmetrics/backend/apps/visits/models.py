@@ -138,6 +138,22 @@ class Visit(SoftDeleteModel):
     def __str__(self):
         return f"Visit {self.visit_code} - {self.farm.name} ({self.visit_date.date()})"
     
+    def _locked_counter_state(self):
+        """
+        Counter state of the stored row, locked until the transaction ends.
+        
+        Read under SELECT ... FOR UPDATE (not from the state the instance was
+        loaded with) so concurrent saves of the same visit apply each counter
+        change exactly once.
+        """
+        from apps.farms.counters import visit_state
+        if self._state.adding:
+            return None
+        row = Visit.all_objects.select_for_update().filter(pk=self.pk).values_list(
+            'farm_id', 'visit_date', 'deleted_at'
+        ).first()
+        return visit_state(*row) if row else None
+    
     def save(self, *args, **kwargs):
         # Auto-generate visit code if not provided
         if not self.visit_code:
@@ -157,26 +173,37 @@ class Visit(SoftDeleteModel):
             from django.utils import timezone
             self.submitted_at = timezone.now()
         
-        super().save(*args, **kwargs)
+        from django.db import transaction
+        from apps.farms.counters import apply_visit_change, visit_state
+        
+        with transaction.atomic():
+            old_state = self._locked_counter_state()
+            super().save(*args, **kwargs)
+            apply_visit_change(old_state, visit_state(self.farm_id, self.visit_date, self.deleted_at))
+    
+    def hard_delete(self):
+        """Permanently delete the visit and release its farm counters."""
+        from django.db import transaction
+        from apps.farms.counters import apply_visit_change
+        
+        with transaction.atomic():
+            old_state = self._locked_counter_state()
+            super().hard_delete()
+            # Applied after the delete so the latest visit date is recomputed without it
+            apply_visit_change(old_state, None)
     
     def generate_visit_code(self):
         """Generate unique visit code."""
-        import random
-        import string
-        from django.utils import timezone
+        from apps.core.codes import next_code
         
-        # Format: VISIT-YEAR-RANDOM (e.g., VISIT-2025-A1B2C3)
-        year = timezone.now().year
-        random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        
-        visit_code = f"VISIT-{year}-{random_part}"
-        
-        # Ensure uniqueness
-        while Visit.objects.filter(visit_code=visit_code).exists():
-            random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-            visit_code = f"VISIT-{year}-{random_part}"
-        
-        return visit_code
+        # Format: VISIT-YEAR-SEQUENCE (e.g., VISIT-2025-000001A)
+        return next_code('VISIT')
+    
+    @classmethod
+    def generate_visit_codes(cls, count):
+        """Generate count unique visit codes for bulk creation."""
+        from apps.core.codes import allocate_codes
+        return allocate_codes('VISIT', count)
     
     @property
     def duration_minutes(self):
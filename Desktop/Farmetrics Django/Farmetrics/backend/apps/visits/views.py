@@ -9,6 +9,9 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
 from drf_spectacular.utils import extend_schema
 
+from apps.core.events import publish
+from apps.regions.scoping import scope_visits
+
 from .models import Visit, VisitComment, VisitMedia
 from .serializers import (
     VisitSerializer,
@@ -68,6 +71,10 @@ class VisitListView(generics.ListCreateAPIView):
         if date_to:
             queryset = queryset.filter(visit_date__lte=date_to)
         
+        # Limit supervisors and field officers to their assigned regions
+        # (their own visits stay visible)
+        queryset = scope_visits(queryset, self.request)
+        
         return queryset.select_related('farm', 'farmer', 'field_officer', 'approved_by')
     
     def perform_create(self, serializer):
@@ -134,6 +141,9 @@ class VisitDetailView(generics.RetrieveUpdateDestroyAPIView):
         if hasattr(self.request, 'organization') and self.request.organization:
             queryset = queryset.filter(organization=self.request.organization)
         
+        # Visits outside the user's regions are not found (their own visits are)
+        queryset = scope_visits(queryset, self.request)
+        
         return queryset.select_related('farm', 'farmer', 'field_officer', 'approved_by')
 
 
@@ -150,7 +160,7 @@ class VisitSubmitView(APIView):
     )
     def post(self, request, pk):
         try:
-            visit = Visit.objects.get(pk=pk)
+            visit = scope_visits(Visit.objects.all(), request).get(pk=pk)
             
             # Check permissions
             if visit.field_officer != request.user:
@@ -169,7 +179,10 @@ class VisitSubmitView(APIView):
             visit.submitted_at = timezone.now()
             visit.save()
             
-            # TODO: Send notification to supervisor
+            publish(
+                'visit.submitted', {'visit_id': visit.pk},
+                actor=request.user, organization_id=visit.organization_id, request=request
+            )
             
             return Response(
                 VisitSerializer(visit).data,
@@ -199,7 +212,7 @@ class VisitApproveView(APIView):
         serializer.is_valid(raise_exception=True)
         
         try:
-            visit = Visit.objects.get(pk=pk)
+            visit = scope_visits(Visit.objects.all(), request).get(pk=pk)
             
             if visit.status != 'submitted':
                 return Response(
@@ -223,7 +236,11 @@ class VisitApproveView(APIView):
             
             visit.save()
             
-            # TODO: Send notification to field officer
+            # visit.approved / visit.rejected / visit.needs_revision
+            publish(
+                f'visit.{visit.status}', {'visit_id': visit.pk, 'notes': notes},
+                actor=request.user, organization_id=visit.organization_id, request=request
+            )
             
             return Response(
                 VisitSerializer(visit).data,
@@ -262,7 +279,8 @@ class VisitCommentListView(generics.ListCreateAPIView):
     
     def get_queryset(self):
         visit_id = self.kwargs.get('visit_id')
-        return VisitComment.objects.filter(visit_id=visit_id).select_related('user')
+        queryset = scope_visits(VisitComment.objects.filter(visit_id=visit_id), self.request, prefix='visit__')
+        return queryset.select_related('user')
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -294,5 +312,6 @@ class VisitMediaListView(generics.ListCreateAPIView):
     
     def get_queryset(self):
         visit_id = self.kwargs.get('visit_id')
-        return VisitMedia.objects.filter(visit_id=visit_id).select_related('media', 'visit')
+        queryset = scope_visits(VisitMedia.objects.filter(visit_id=visit_id), self.request, prefix='visit__')
+        return queryset.select_related('media', 'visit')
 
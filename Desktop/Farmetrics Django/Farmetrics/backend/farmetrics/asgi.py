@@ -19,18 +19,19 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'farmetrics.settings')
 # is populated before importing code that may import ORM models.
 django_asgi_app = get_asgi_application()
 
-# Import WebSocket routing (will be created later)
-# from apps.notifications.routing import websocket_urlpatterns
+from apps.notifications.middleware import JWTAuthMiddleware  # noqa: E402
+from apps.notifications.routing import websocket_urlpatterns  # noqa: E402
 
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
-    # WebSocket routing will be added here
-    # "websocket": AllowedHostsOriginValidator(
-    #     AuthMiddlewareStack(
-    #         URLRouter(
-    #             websocket_urlpatterns
-    #         )
-    #     )
-    # ),
+    # Session auth for the admin/browsable API, JWT for API clients
+    "websocket": AllowedHostsOriginValidator(
+        AuthMiddlewareStack(
+            JWTAuthMiddleware(
+                URLRouter(
+                    websocket_urlpatterns
+                )
+            )
+        )
+    ),
 })
-
@@ -28,6 +28,30 @@ app.conf.beat_schedule = {
         'task': 'apps.accounts.tasks.cleanup_expired_tokens',
         'schedule': crontab(hour=2, minute=0),  # Run at 2 AM daily
     },
+    'cleanup-expired-upload-sessions': {
+        'task': 'apps.media.tasks.cleanup_expired_upload_sessions',
+        'schedule': crontab(minute=15),  # Run hourly
+    },
+    'cleanup-media-derivatives': {
+        'task': 'apps.media.tasks.cleanup_media_derivatives',
+        'schedule': crontab(minute=45),  # Run hourly
+    },
+    'purge-read-notifications': {
+        'task': 'apps.notifications.tasks.purge_read_notifications',
+        'schedule': crontab(hour=3, minute=0),  # Run at 3 AM daily
+    },
+    'digest-low-priority-notifications': {
+        'task': 'apps.notifications.tasks.digest_low_priority_notifications',
+        'schedule': crontab(hour=1, minute=0),  # Run at 1 AM daily
+    },
+    'dispatch-notification-deliveries': {
+        'task': 'apps.notifications.tasks.dispatch_notification_deliveries',
+        'schedule': crontab(),  # Run every minute
+    },
+    'purge-processed-events': {
+        'task': 'apps.core.tasks.purge_processed_events',
+        'schedule': crontab(hour=4, minute=0),  # Run at 4 AM daily
+    },
     # Add more scheduled tasks here as needed
 }
 
@@ -155,6 +155,33 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Hash uploaded files while they stream in (used for media deduplication)
+FILE_UPLOAD_HANDLERS = [
+    'apps.media.upload_handlers.HashingMemoryFileUploadHandler',
+    'apps.media.upload_handlers.HashingTemporaryFileUploadHandler',
+]
+
+# Chunked media uploads
+MEDIA_UPLOAD_TEMP_DIR = config('MEDIA_UPLOAD_TEMP_DIR', default=str(BASE_DIR / 'tmp' / 'uploads'))
+MEDIA_UPLOAD_MAX_SIZE = config('MEDIA_UPLOAD_MAX_SIZE', default=2 * 1024 * 1024 * 1024, cast=int)  # 2 GB
+MEDIA_UPLOAD_MAX_CHUNK_SIZE = config('MEDIA_UPLOAD_MAX_CHUNK_SIZE', default=8 * 1024 * 1024, cast=int)  # 8 MB
+MEDIA_UPLOAD_SESSION_TTL_HOURS = config('MEDIA_UPLOAD_SESSION_TTL_HOURS', default=24, cast=int)
+MEDIA_UPLOAD_MAX_ACTIVE_SESSIONS = config('MEDIA_UPLOAD_MAX_ACTIVE_SESSIONS', default=10, cast=int)
+
+# Image derivatives (resized variants served by /api/v1/media/{id}/derivative/)
+MEDIA_DERIVATIVE_CACHE_DIR = config('MEDIA_DERIVATIVE_CACHE_DIR', default=str(BASE_DIR / 'tmp' / 'derivatives'))
+MEDIA_DERIVATIVE_QUALITY = config('MEDIA_DERIVATIVE_QUALITY', default=80, cast=int)
+MEDIA_DERIVATIVE_MAX_AGE = config('MEDIA_DERIVATIVE_MAX_AGE', default=24 * 60 * 60, cast=int)  # seconds
+# Lifetime of signed derivative URLs (Media.thumbnail_url), in seconds
+MEDIA_DERIVATIVE_URL_MAX_AGE = config('MEDIA_DERIVATIVE_URL_MAX_AGE', default=24 * 60 * 60, cast=int)
+# Size bound of the derivative cache, enforced by cleanup_media_derivatives
+# (run it on every host that serves derivatives)
+MEDIA_DERIVATIVE_CACHE_MAX_SIZE = config('MEDIA_DERIVATIVE_CACHE_MAX_SIZE', default=5 * 1024 * 1024 * 1024, cast=int)  # 5 GB
+
+# Link geotagged media to the nearest farm within this distance when the
+# location is not inside any farm boundary (0 disables nearest-farm linking)
+MEDIA_FARM_LINK_TOLERANCE_M = config('MEDIA_FARM_LINK_TOLERANCE_M', default=100, cast=float)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -345,6 +372,87 @@ LOGGING = {
 PHONENUMBER_DEFAULT_REGION = 'GH'  # Ghana as default (cocoa farming region)
 PHONENUMBER_DEFAULT_FORMAT = 'INTERNATIONAL'
 
+# Domain events (see apps/core/events.py)
+# Handled (event, subscriber) pairs are kept this long to skip redelivered events
+EVENT_PROCESSED_RETENTION_DAYS = config('EVENT_PROCESSED_RETENTION_DAYS', default=7, cast=int)
+
+# Farmer duplicate detection
+FARMER_DUPLICATE_MIN_SCORE = config('FARMER_DUPLICATE_MIN_SCORE', default=0.5, cast=float)
+FARMER_DUPLICATE_MAX_BLOCK_SIZE = config('FARMER_DUPLICATE_MAX_BLOCK_SIZE', default=200, cast=int)
+
+# Farmer/farm bulk imports
+FARMER_IMPORT_CHUNK_SIZE = config('FARMER_IMPORT_CHUNK_SIZE', default=500, cast=int)
+FARMER_IMPORT_MAX_ERRORS = config('FARMER_IMPORT_MAX_ERRORS', default=1000, cast=int)
+FARMER_IMPORT_MAX_FILE_SIZE = config('FARMER_IMPORT_MAX_FILE_SIZE', default=50 * 1024 * 1024, cast=int)  # 50 MB
+# GeoJSON is parsed in memory in one piece (CSV/XLSX are streamed)
+FARMER_IMPORT_MAX_GEOJSON_SIZE = config('FARMER_IMPORT_MAX_GEOJSON_SIZE', default=20 * 1024 * 1024, cast=int)  # 20 MB
+
+# Region tree snapshots (see apps/regions/tree.py)
+REGION_TREE_CACHE_TIMEOUT = config('REGION_TREE_CACHE_TIMEOUT', default=24 * 60 * 60, cast=int)
+
+# Cached effective organization permissions (see apps/accounts/permissions.py)
+ORGANIZATION_PERMISSION_CACHE_TIMEOUT = config('ORGANIZATION_PERMISSION_CACHE_TIMEOUT', default=5 * 60, cast=int)
+# Cached primary organization/role per user (see apps/accounts/memberships.py)
+USER_MEMBERSHIP_CACHE_TIMEOUT = config('USER_MEMBERSHIP_CACHE_TIMEOUT', default=15 * 60, cast=int)
+
+# Bulk user provisioning (see apps/accounts/provisioning.py)
+USER_PROVISIONING_MAX_ROWS = config('USER_PROVISIONING_MAX_ROWS', default=1000, cast=int)
+USER_PROVISIONING_BATCH_SIZE = config('USER_PROVISIONING_BATCH_SIZE', default=500, cast=int)
+# Password hashing runs in a per-process pool of this many workers (started on
+# first use and kept) for uploads of POOL_THRESHOLD rows or more; below 2 it stays in process
+USER_PROVISIONING_HASH_WORKERS = config('USER_PROVISIONING_HASH_WORKERS', default=min(4, os.cpu_count() or 1), cast=int)
+USER_PROVISIONING_POOL_THRESHOLD = config('USER_PROVISIONING_POOL_THRESHOLD', default=20, cast=int)
+
+# Region scoping for supervisors and field officers (see apps/regions/scoping.py)
+# Strict: users in a scoped role with no region assignments see no records
+REGION_SCOPING_STRICT = config('REGION_SCOPING_STRICT', default=False, cast=bool)
+REGION_SCOPE_CACHE_TIMEOUT = config('REGION_SCOPE_CACHE_TIMEOUT', default=5 * 60, cast=int)
+# Larger subtrees are filtered with a region path prefix join instead of IN (...)
+REGION_SCOPE_MAX_IN_CLAUSE = config('REGION_SCOPE_MAX_IN_CLAUSE', default=1000, cast=int)
+
+# Notification fan-out (see apps/notifications/fanout.py)
+NOTIFICATION_FANOUT_BATCH_SIZE = config('NOTIFICATION_FANOUT_BATCH_SIZE', default=1000, cast=int)
+# Audiences larger than this are notified from a Celery task
+NOTIFICATION_FANOUT_ASYNC_THRESHOLD = config('NOTIFICATION_FANOUT_ASYNC_THRESHOLD', default=50, cast=int)
+
+# Cached unread notification counters expire after this (bounds any drift)
+NOTIFICATION_UNREAD_COUNT_TIMEOUT = config('NOTIFICATION_UNREAD_COUNT_TIMEOUT', default=60 * 60, cast=int)
+
+# Notification retention (see apps/notifications/retention.py)
+NOTIFICATION_READ_RETENTION_DAYS = config('NOTIFICATION_READ_RETENTION_DAYS', default=90, cast=int)
+NOTIFICATION_PURGE_BATCH_SIZE = config('NOTIFICATION_PURGE_BATCH_SIZE', default=1000, cast=int)
+NOTIFICATION_PURGE_PAUSE_SECONDS = config('NOTIFICATION_PURGE_PAUSE_SECONDS', default=0.1, cast=float)
+# Daily digest of unread low-priority notifications
+NOTIFICATION_DIGEST_ENABLED = config('NOTIFICATION_DIGEST_ENABLED', default=False, cast=bool)
+NOTIFICATION_DIGEST_PRIORITIES = config('NOTIFICATION_DIGEST_PRIORITIES', default='low', cast=Csv())
+NOTIFICATION_DIGEST_MIN_COUNT = config('NOTIFICATION_DIGEST_MIN_COUNT', default=3, cast=int)
+
+# Email/SMS delivery queue (see apps/notifications/delivery.py)
+# Channels to deliver on, e.g. "email,sms" (empty disables external delivery)
+NOTIFICATION_DELIVERY_CHANNELS = config('NOTIFICATION_DELIVERY_CHANNELS', default='', cast=Csv())
+NOTIFICATION_DELIVERY_PROVIDERS = {
+    'email': {
+        'class': config('NOTIFICATION_EMAIL_PROVIDER', default='apps.notifications.providers.EmailProvider'),
+        'rate_limit': config('NOTIFICATION_EMAIL_RATE_LIMIT', default=100, cast=int),  # per minute
+    },
+    'sms': {
+        # No SMS gateway is bundled; point this at a DeliveryProvider subclass
+        'class': config('NOTIFICATION_SMS_PROVIDER', default='apps.notifications.providers.ConsoleProvider'),
+        'rate_limit': config('NOTIFICATION_SMS_RATE_LIMIT', default=30, cast=int),  # per minute
+    },
+}
+NOTIFICATION_DELIVERY_FILE_PATH = config('NOTIFICATION_DELIVERY_FILE_PATH', default=str(BASE_DIR / 'tmp' / 'deliveries.jsonl'))
+NOTIFICATION_DELIVERY_BATCH_SIZE = config('NOTIFICATION_DELIVERY_BATCH_SIZE', default=50, cast=int)
+NOTIFICATION_DELIVERY_MAX_ATTEMPTS = config('NOTIFICATION_DELIVERY_MAX_ATTEMPTS', default=5, cast=int)
+NOTIFICATION_DELIVERY_RETRY_BASE_SECONDS = config('NOTIFICATION_DELIVERY_RETRY_BASE_SECONDS', default=60, cast=int)
+NOTIFICATION_DELIVERY_RETRY_MAX_SECONDS = config('NOTIFICATION_DELIVERY_RETRY_MAX_SECONDS', default=6 * 60 * 60, cast=int)
+NOTIFICATION_DELIVERY_RATE_LIMIT_BACKOFF_SECONDS = config('NOTIFICATION_DELIVERY_RATE_LIMIT_BACKOFF_SECONDS', default=10, cast=int)
+# At most one processing task is queued per channel; the marker expires after this in case the task is lost
+NOTIFICATION_DELIVERY_SCHEDULE_TIMEOUT = config('NOTIFICATION_DELIVERY_SCHEDULE_TIMEOUT', default=2 * 60, cast=int)
+# Deliveries left in "sending" longer than this are requeued (worker died mid-batch)
+NOTIFICATION_DELIVERY_STALE_SECONDS = config('NOTIFICATION_DELIVERY_STALE_SECONDS', default=15 * 60, cast=int)
+NOTIFICATION_ACTION_BASE_URL = config('NOTIFICATION_ACTION_BASE_URL', default='')
+
 # Multi-tenancy Settings
 ORGANIZATION_MODEL = 'organizations.Organization'
 ORGANIZATION_SUBDOMAIN_ENABLED = config('ORGANIZATION_SUBDOMAIN_ENABLED', default=False, cast=bool)
@@ -0,0 +1,42 @@
+"""
+Test settings for Farmetrics project.
+Used by `python manage.py test`; needs PostgreSQL/PostGIS but no Redis.
+"""
+
+import tempfile
+
+from .base import *
+
+DEBUG = False
+
+# In-process cache and channel layer (counters, permission and region
+# caches fall back to their non-Redis code paths)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+    },
+}
+
+# Fast password hashing
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Keep uploads and derivatives out of the project directory
+MEDIA_ROOT = tempfile.mkdtemp(prefix='farmetrics-test-media-')
+MEDIA_DERIVATIVE_CACHE_DIR = tempfile.mkdtemp(prefix='farmetrics-test-derivatives-')
+MEDIA_UPLOAD_TEMP_DIR = tempfile.mkdtemp(prefix='farmetrics-test-uploads-')
+DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+# Celery tasks called with .delay() run inline
+CELERY_TASK_ALWAYS_EAGER = True
+CELERY_TASK_EAGER_PROPAGATES = True
+
+# No external delivery unless a test enables it
+NOTIFICATION_DELIVERY_CHANNELS = []